@@ -0,0 +1,83 @@
+"""
+Offline stand-in for the OpenAI SDK used by benchmarks.
+
+FakeOpenAIClient is the real OpenAIClient (rate limiter, retries, metrics,
+streaming to file) with its SDK object swapped for FakeCompletions, which
+sleeps for a configurable latency instead of calling the API.
+"""
+
+import json
+import random
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from content_generation.openai_client import OpenAIClient
+
+LOREM = ("history remembers this figure for a life of discovery persistence and quiet courage "
+         "that changed how people understood the world around them").split()
+
+
+class FakeCompletions:
+    """chat.completions.create() with simulated latency and streaming"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0,
+                 tokens_per_s: float = 0.0, seed: int = 0):
+        """
+        Args:
+            latency: Seconds before the response (or first streamed chunk)
+            jitter: Uniform +/- seconds added to latency
+            tokens_per_s: Streaming speed after the first chunk (0 = instant)
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.tokens_per_s = tokens_per_s
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _delay(self) -> float:
+        with self._lock:
+            self.calls += 1
+            return max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+
+    @staticmethod
+    def _words(count: int) -> List[str]:
+        return [LOREM[i % len(LOREM)] for i in range(count)]
+
+    @staticmethod
+    def _usage(messages: List[Dict], completion_tokens: int) -> SimpleNamespace:
+        prompt_tokens = sum(len(m["content"]) for m in messages) // 4
+        return SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                               total_tokens=prompt_tokens + completion_tokens)
+
+    def create(self, model: str, messages: List[Dict], stream: bool = False,
+               max_tokens: Optional[int] = None, response_format: Optional[Dict] = None, **kwargs):
+        time.sleep(self._delay())
+        tokens = min(max_tokens or 200, 200)
+        if stream:
+            return self._stream(messages, tokens)
+
+        content = " ".join(self._words(tokens))
+        if response_format and response_format.get("type") == "json_object":
+            content = json.dumps({key: content[:240] for key in ("youtube", "x", "facebook")})
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=self._usage(messages, tokens))
+
+    def _stream(self, messages: List[Dict], tokens: int):
+        for word in self._words(tokens):
+            if self.tokens_per_s:
+                time.sleep(1 / self.tokens_per_s)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=word + " "))], usage=None)
+        yield SimpleNamespace(choices=[], usage=self._usage(messages, tokens))
+
+
+class FakeOpenAIClient(OpenAIClient):
+    """OpenAIClient wired to FakeCompletions; every other code path is the real one"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, tokens_per_s: float = 0.0, **kwargs):
+        kwargs.setdefault("max_retries", 1)
+        super().__init__(api_key="sk-benchmark", **kwargs)
+        self.completions = FakeCompletions(latency, jitter, tokens_per_s)
+        self.client = SimpleNamespace(chat=SimpleNamespace(completions=self.completions))
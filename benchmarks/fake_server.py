@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Local HTTP stand-in for the OpenAI chat-completions and Wikipedia PDF endpoints.
+
+Serves POST /v1/chat/completions (plain and streamed),
+GET /api/rest_v1/page/pdf/<name> and the plaintext-extract query of
+GET /w/api.php with configurable latency distributions,
+429 (with Retry-After) and 500 fault rates, so load tests can exercise the
+client's rate limiting and retry behaviour without touching real services.
+The Batch API subset used by --batch is served too: POST /v1/files,
+POST /v1/batches, GET /v1/batches/<id> (completes after `batch_polls`
+polls) and GET /v1/files/<id>/content.
+GET /__stats returns what the server saw and injected.
+
+    python benchmarks/fake_server.py --port 8765 --openai-latency lognormal:0.8,0.5 --openai-429 0.05
+"""
+
+import argparse
+import email.parser
+import email.policy
+import hashlib
+import re
+import json
+import math
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fixtures import make_pdf
+
+PDF_PREFIX = "/api/rest_v1/page/pdf/"
+API_PATH = "/w/api.php"
+BATCH_PATH = re.compile(r'.*/batches/([^/]+)$')
+FILE_CONTENT_PATH = re.compile(r'.*/files/([^/]+)/content$')
+LOREM = ("history remembers this figure for a life of discovery persistence and quiet courage "
+         "that changed how people understood the world around them").split()
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Parse a latency distribution spec (seconds):
+    fixed:0.2 | uniform:0.1,0.5 | exp:0.3 (mean) | lognormal:0.5,0.4 (median, sigma)
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v]
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "exp":
+        return lambda rng: rng.expovariate(1 / values[0]) if values[0] else 0.0
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class FaultProfile(NamedTuple):
+    latency: str = "fixed:0"
+    rate_429: float = 0.0
+    rate_500: float = 0.0
+    retry_after: float = 1.0
+
+
+class FakeServer:
+    """Threaded fake OpenAI + Wikipedia server; start() returns the base URL"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 openai: FaultProfile = FaultProfile(), wikipedia: FaultProfile = FaultProfile(),
+                 tokens_per_s: float = 0.0, seed: int = 0, batch_polls: int = 2):
+        self.profiles = {"openai": openai, "wikipedia": wikipedia}
+        self.latencies = {name: parse_latency(p.latency) for name, p in self.profiles.items()}
+        self.tokens_per_s = tokens_per_s
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats: Dict[str, Counter] = defaultdict(Counter)
+        self.pdfs = self._build_pdfs(seed)
+        self.batch_polls = batch_polls
+        self.files: Dict[str, Dict] = {}
+        self.batches: Dict[str, Dict] = {}
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _build_pdfs(seed: int) -> List[bytes]:
+        """A few article sizes; each name maps to one of them deterministically"""
+        with tempfile.TemporaryDirectory() as tmp:
+            return [
+                make_pdf(Path(tmp) / f"{pages}.pdf", pages=pages, images_per_page=images, seed=seed).read_bytes()
+                for pages, images in ((4, 0), (12, 1), (30, 2))
+            ]
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fake-server", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def decide(self, endpoint: str) -> Dict:
+        """Sample this request's latency and injected fault"""
+        profile = self.profiles[endpoint]
+        with self.lock:
+            latency = max(0.0, self.latencies[endpoint](self.rng))
+            roll = self.rng.random()
+        status = 200
+        if roll < profile.rate_429:
+            status = 429
+        elif roll < profile.rate_429 + profile.rate_500:
+            status = 500
+        return {"latency": latency, "status": status, "retry_after": profile.retry_after}
+
+    def count(self, endpoint: str, key: str, amount: int = 1):
+        with self.lock:
+            self.stats[endpoint][key] += amount
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            return {endpoint: dict(counter) for endpoint, counter in self.stats.items()}
+
+    def completion_parts(self, request: Dict):
+        """(response base, words, usage) of a chat completion for `request`"""
+        tokens = min(request.get("max_tokens") or 300, 300)
+        words = [LOREM[i % len(LOREM)] for i in range(tokens)]
+        prompt_tokens = sum(len(m.get("content") or "") for m in request.get("messages", [])) // 4
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": tokens,
+                 "total_tokens": prompt_tokens + tokens}
+        base = {"id": f"chatcmpl-{uuid.uuid4().hex[:12]}", "created": int(time.time()),
+                "model": request.get("model", "gpt-4")}
+        self.count("openai", "completion_tokens", tokens)
+        return base, words, usage
+
+    def completion_body(self, request: Dict) -> Dict:
+        base, words, usage = self.completion_parts(request)
+        content = " ".join(words)
+        if (request.get("response_format") or {}).get("type") == "json_object":
+            content = json.dumps({key: content[:240] for key in ("youtube", "x", "facebook")})
+        return {
+            **base,
+            "object": "chat.completion",
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": usage,
+        }
+
+    def store_file(self, data: bytes, filename: str, purpose: str) -> Dict:
+        file = {"id": f"file-{uuid.uuid4().hex[:12]}", "object": "file", "bytes": len(data),
+                "created_at": int(time.time()), "filename": filename, "purpose": purpose, "status": "processed"}
+        with self.lock:
+            self.files[file["id"]] = {"meta": file, "data": data}
+            self.stats["batch"]["files"] += 1
+        return file
+
+    def create_batch(self, input_file_id: str, endpoint: str, completion_window: str) -> Optional[Dict]:
+        with self.lock:
+            if input_file_id not in self.files:
+                return None
+            batch = {"id": f"batch_{uuid.uuid4().hex[:12]}", "object": "batch", "endpoint": endpoint,
+                     "input_file_id": input_file_id, "completion_window": completion_window,
+                     "status": "validating", "created_at": int(time.time()),
+                     "output_file_id": None, "error_file_id": None, "polls": 0,
+                     "request_counts": {"total": 0, "completed": 0, "failed": 0}}
+            self.batches[batch["id"]] = batch
+            self.stats["batch"]["batches"] += 1
+            return dict(batch)
+
+    def retrieve_batch(self, batch_id: str) -> Optional[Dict]:
+        """Advance the batch one poll; it is run and completed on poll number `batch_polls`"""
+        with self.lock:
+            batch = self.batches.get(batch_id)
+            if batch is None:
+                return None
+            batch["polls"] += 1
+            self.stats["batch"]["polls"] += 1
+            if batch["status"] != "validating" and batch["status"] != "in_progress":
+                return dict(batch)
+            if batch["polls"] < self.batch_polls:
+                batch["status"] = "in_progress"
+                return dict(batch)
+            batch["status"] = "finalizing"
+            data = self.files[batch["input_file_id"]]["data"]
+        self._run_batch(batch, data)
+        with self.lock:
+            return dict(batch)
+
+    def _run_batch(self, batch: Dict, data: bytes):
+        """Answer every request line; injected 429/500s go to the error file, like the real API"""
+        outputs, errors = [], []
+        for line in data.decode().splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            status = self.decide("openai")["status"]
+            self.count("openai", "requests")
+            self.count("openai", f"status_{status}")
+            if status == 200:
+                response = {"status_code": 200, "request_id": uuid.uuid4().hex, "body": self.completion_body(item["body"])}
+                outputs.append({"id": f"batch_req_{uuid.uuid4().hex[:12]}", "custom_id": item["custom_id"],
+                                "response": response, "error": None})
+            else:
+                response = {"status_code": status, "request_id": uuid.uuid4().hex,
+                            "body": {"error": {"message": f"Injected {status}", "type": "server_error"}}}
+                errors.append({"id": f"batch_req_{uuid.uuid4().hex[:12]}", "custom_id": item["custom_id"],
+                               "response": response, "error": None})
+
+        def jsonl(items: List[Dict]) -> bytes:
+            return "".join(json.dumps(item) + "\n" for item in items).encode()
+
+        output_file = self.store_file(jsonl(outputs), "batch_output.jsonl", "batch_output") if outputs else None
+        error_file = self.store_file(jsonl(errors), "batch_errors.jsonl", "batch_output") if errors else None
+        with self.lock:
+            batch.update({
+                "status": "completed",
+                "completed_at": int(time.time()),
+                "output_file_id": output_file and output_file["id"],
+                "error_file_id": error_file and error_file["id"],
+                "request_counts": {"total": len(outputs) + len(errors), "completed": len(outputs), "failed": len(errors)},
+            })
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real endpoints
+
+    def log_message(self, format, *args):
+        pass  # One line per request would drown the load-test output
+
+    @property
+    def fake(self) -> FakeServer:
+        return self.server.fake
+
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+        self._send_bytes(status, json.dumps(payload).encode(), "application/json", headers)
+
+    def _send_bytes(self, status: int, body: bytes, content_type: str, headers: Optional[Dict] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _inject(self, endpoint: str) -> bool:
+        """Sleep for the sampled latency; send the injected error if any (returns True if sent)"""
+        decision = self.fake.decide(endpoint)
+        self.fake.count(endpoint, "requests")
+        time.sleep(decision["latency"])
+        status = decision["status"]
+        self.fake.count(endpoint, f"status_{status}")
+        if status == 429:
+            self._send_json(429, {"error": {"message": "Rate limit reached (injected)", "type": "requests",
+                                            "code": "rate_limit_exceeded"}},
+                            {"Retry-After": str(decision["retry_after"])})
+            return True
+        if status == 500:
+            self._send_json(500, {"error": {"message": "Internal server error (injected)", "type": "server_error"}})
+            return True
+        return False
+
+    def do_GET(self):
+        if self.path == "/__stats":
+            self._send_json(200, self.fake.snapshot())
+            return
+        url = urlsplit(self.path)
+        if url.path == API_PATH:
+            if not self._inject("wikipedia"):
+                self._send_extract(parse_qs(url.query).get("titles", [""])[0])
+            return
+        match = BATCH_PATH.match(url.path)
+        if match:
+            batch = self.fake.retrieve_batch(match.group(1))
+            if batch is None:
+                self._send_json(404, {"error": {"message": "No such batch"}})
+            else:
+                self._send_json(200, {key: value for key, value in batch.items() if key != "polls"})
+            return
+        match = FILE_CONTENT_PATH.match(url.path)
+        if match:
+            file = self.fake.files.get(match.group(1))
+            if file is None:
+                self._send_json(404, {"error": {"message": "No such file"}})
+            else:
+                self._send_bytes(200, file["data"], "application/octet-stream")
+            return
+        if not self.path.startswith(PDF_PREFIX):
+            self._send_json(404, {"error": "not found"})
+            return
+        if self._inject("wikipedia"):
+            return
+
+        name = unquote(self.path[len(PDF_PREFIX):])
+        pdf = self.fake.pdfs[zlib.crc32(name.encode()) % len(self.fake.pdfs)]
+        etag = f'"{hashlib.sha1(pdf).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.fake.count("wikipedia", "not_modified")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.fake.count("wikipedia", "bytes", len(pdf))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(pdf)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(pdf)
+
+    def _send_extract(self, title: str):
+        """prop=extracts response: a few thousand words of plain text per title"""
+        rng = random.Random(zlib.crc32(title.encode()))
+        paragraphs = [
+            " ".join(" ".join(rng.sample(LOREM, 12)).capitalize() + "." for _ in range(8))
+            for _ in range(40)
+        ]
+        extract = f"{title}\n\n" + "\n\n".join(paragraphs)
+        self.fake.count("wikipedia", "bytes", len(extract))
+        self._send_json(200, {"batchcomplete": True,
+                              "query": {"pages": [{"pageid": zlib.crc32(title.encode()), "ns": 0,
+                                                   "title": title, "extract": extract}]}})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        path = urlsplit(self.path).path.rstrip("/")
+        if path.endswith("/files"):
+            self._upload_file(body)
+            return
+        if path.endswith("/batches"):
+            request = json.loads(body or b"{}")
+            batch = self.fake.create_batch(request.get("input_file_id"), request.get("endpoint"),
+                                           request.get("completion_window"))
+            if batch is None:
+                self._send_json(400, {"error": {"message": "Unknown input_file_id"}})
+            else:
+                self._send_json(200, {key: value for key, value in batch.items() if key != "polls"})
+            return
+        if not path.endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+        if self._inject("openai"):
+            return
+
+        request = json.loads(body or b"{}")
+        if request.get("stream"):
+            base, words, usage = self.fake.completion_parts(request)
+            self._stream(base, words, usage, (request.get("stream_options") or {}).get("include_usage"))
+            return
+        self._send_json(200, self.fake.completion_body(request))
+
+    def _upload_file(self, body: bytes):
+        """multipart/form-data upload with "purpose" and "file" fields"""
+        header = f"Content-Type: {self.headers.get('Content-Type', '')}\r\n\r\n".encode()
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(header + body)
+        fields = {}
+        for part in message.iter_parts():
+            fields[part.get_param("name", header="content-disposition")] = part
+        if "file" not in fields:
+            self._send_json(400, {"error": {"message": "Missing file"}})
+            return
+        purpose = fields["purpose"].get_content().strip() if "purpose" in fields else "batch"
+        data = fields["file"].get_payload(decode=True)
+        self._send_json(200, self.fake.store_file(data, fields["file"].get_filename() or "upload", purpose))
+
+    def _stream(self, base: Dict, words: List[str], usage: Dict, include_usage: bool):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")  # Body ends when the connection closes
+        self.end_headers()
+        self.close_connection = True
+
+        def event(payload: Dict):
+            self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode())
+            self.wfile.flush()
+
+        for i, word in enumerate(words):
+            if self.fake.tokens_per_s:
+                time.sleep(1 / self.fake.tokens_per_s)
+            event({**base, "object": "chat.completion.chunk",
+                   "choices": [{"index": 0, "finish_reason": "stop" if i == len(words) - 1 else None,
+                                "delta": {"content": word + " "}}]})
+        if include_usage:
+            event({**base, "object": "chat.completion.chunk", "choices": [], "usage": usage})
+        self.wfile.write(b"data: [DONE]\n\n")
+
+
+def add_server_args(parser: argparse.ArgumentParser):
+    """Fault-injection options shared by this script and the load-test driver"""
+    parser.add_argument("--openai-latency", default="lognormal:0.5,0.5",
+                        help="Chat-completion latency distribution (fixed:S, uniform:A,B, exp:MEAN, lognormal:MEDIAN,SIGMA)")
+    parser.add_argument("--openai-429", type=float, default=0.0, help="Fraction of completions answered with 429")
+    parser.add_argument("--openai-500", type=float, default=0.0, help="Fraction of completions answered with 500")
+    parser.add_argument("--wiki-latency", default="uniform:0.05,0.3", help="PDF download latency distribution")
+    parser.add_argument("--wiki-429", type=float, default=0.0, help="Fraction of PDF downloads answered with 429")
+    parser.add_argument("--wiki-500", type=float, default=0.0, help="Fraction of PDF downloads answered with 500")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--tokens-per-s", type=float, default=0.0, help="Streaming speed (0 = send at once)")
+    parser.add_argument("--batch-polls", type=int, default=2, help="Polls before a submitted batch completes")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def server_from_args(args: argparse.Namespace, host: str = "127.0.0.1", port: int = 0) -> FakeServer:
+    return FakeServer(
+        host=host,
+        port=port,
+        openai=FaultProfile(args.openai_latency, args.openai_429, args.openai_500, args.retry_after),
+        wikipedia=FaultProfile(args.wiki_latency, args.wiki_429, args.wiki_500, args.retry_after),
+        tokens_per_s=args.tokens_per_s,
+        seed=args.seed,
+        batch_polls=args.batch_polls,
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Fake OpenAI/Wikipedia server with fault injection")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_server_args(parser)
+    args = parser.parse_args(argv)
+
+    server = server_from_args(args, args.host, args.port)
+    print(f"🧪 Fake server on {server.url}")
+    print(f"   openai_base_url:   {server.url}/v1")
+    print(f"   wikipedia_pdf_url: {server.url}{PDF_PREFIX}")
+    print(f"   source.wikipedia_api_url: {server.url}{API_PATH}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(json.dumps(server.snapshot(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
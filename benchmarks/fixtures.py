@@ -0,0 +1,110 @@
+"""
+Synthetic Wikipedia-like PDFs for benchmarks and load tests.
+
+Written by hand (no PDF library needed) so fixtures can be generated on
+any box; drop real PDFs into benchmarks/fixtures/ to benchmark them too.
+"""
+
+import random
+import zlib
+from pathlib import Path
+from typing import List
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+WORDS = (
+    "the was born in and of to a scientist research university discovered published "
+    "theory experiment award prize physics chemistry mathematics history war empire "
+    "king queen revolution philosophy painter composer novel poem city village family "
+    "married studied taught laboratory expedition invention patent society academy"
+).split()
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 18))]
+    if rng.random() < 0.3:
+        words.insert(rng.randint(0, len(words)), str(rng.randint(1500, 2020)))
+    return " ".join(words).capitalize() + "."
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(path: Path, pages: int = 10, lines_per_page: int = 50, images_per_page: int = 0,
+             image_size: int = 64, shared_images: bool = True, seed: int = 0) -> Path:
+    """
+    Write a text PDF with a running header, page numbers and optional
+    FlateDecode RGB images (shared_images reuses one image XObject on every
+    page, like a logo; otherwise each page gets distinct images).
+    """
+    rng = random.Random(seed)
+    objects: List[bytes] = []
+
+    def add(obj: bytes) -> int:
+        objects.append(obj)
+        return len(objects)
+
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = add(b"")  # Filled in once every page id is known
+
+    def make_image() -> int:
+        data = zlib.compress(bytes(rng.getrandbits(8) for _ in range(image_size * image_size * 3)))
+        header = (f"<< /Type /XObject /Subtype /Image /Width {image_size} /Height {image_size} "
+                  f"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /FlateDecode /Length {len(data)} >>")
+        return add(header.encode() + b"\nstream\n" + data + b"\nendstream")
+
+    shared = [make_image() for _ in range(images_per_page)] if shared_images else []
+
+    page_ids = []
+    for page_number in range(1, pages + 1):
+        image_ids = shared or [make_image() for _ in range(images_per_page)]
+        lines = ["BT /F1 9 Tf 40 800 Td (Synthetic Figure - Wikipedia) Tj ET"]
+        y = 780
+        for _ in range(lines_per_page):
+            lines.append(f"BT /F1 9 Tf 40 {y} Td ({_escape(_sentence(rng))}) Tj ET")
+            y -= 14
+        lines.append(f"BT /F1 9 Tf 300 20 Td ({page_number}) Tj ET")
+        for i in range(len(image_ids)):
+            lines.append(f"q 80 0 0 80 {40 + i * 90} 60 cm /Im{i} Do Q")
+        content = "\n".join(lines).encode("latin-1")
+        content_id = add(f"<< /Length {len(content)} >>".encode() + b"\nstream\n" + content + b"\nendstream")
+        xobjects = " ".join(f"/Im{i} {obj_id} 0 R" for i, obj_id in enumerate(image_ids))
+        page_ids.append(add(
+            f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 595 842] "
+            f"/Contents {content_id} 0 R /Resources << /Font << /F1 {font_id} 0 R >> "
+            f"/XObject << {xobjects} >> >> >>".encode()
+        ))
+
+    kids = " ".join(f"{i} 0 R" for i in page_ids)
+    objects[pages_id - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode()
+    catalog_id = add(f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode())
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref_offset = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += (f"trailer\n<< /Size {len(objects) + 1} /Root {catalog_id} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n").encode()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(bytes(out))
+    return path
+
+
+def standard_fixtures(work_dir: Path) -> List[Path]:
+    """Synthetic PDFs of varied size and image density, plus any real fixtures"""
+    fixtures = [
+        make_pdf(work_dir / "small_text.pdf", pages=3),
+        make_pdf(work_dir / "large_text.pdf", pages=60),
+        make_pdf(work_dir / "image_heavy_shared.pdf", pages=20, images_per_page=3, shared_images=True),
+        make_pdf(work_dir / "image_heavy_distinct.pdf", pages=20, images_per_page=3, shared_images=False),
+    ]
+    if FIXTURE_DIR.exists():
+        fixtures.extend(sorted(FIXTURE_DIR.glob("*.pdf")))
+    return fixtures
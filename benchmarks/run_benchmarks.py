@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Offline microbenchmarks for the generator's pipeline stages.
+
+Runs each stage (PDF extraction, validation, folder creation, source
+digest, prompt building) and a full FigureProcessor.process_figure()
+against synthetic PDFs and a fake OpenAI client, then reports mean time,
+throughput and peak Python memory. Results can be saved as a baseline and
+later runs compared against it:
+
+    python benchmarks/run_benchmarks.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import count
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple
+from unittest import mock
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+import pypdf
+
+from config.config_manager import DEFAULT_CONFIG, ConfigManager
+from content_generation.short_form_generator import ShortFormBatchGenerator
+from data_processing.file_manager import create_folder_structure
+from data_processing.pdf_processor import PDFProcessor
+from data_processing import source_backends as source_backends_module
+from processing.figure_processor import FigureProcessor
+from utils.content_validator import ContentValidator
+from utils.metrics import RunMetrics
+from utils.source_digest import build_digest, normalize_text
+
+from fake_client import FakeOpenAIClient
+from fixtures import standard_fixtures
+
+
+class Benchmark(NamedTuple):
+    name: str
+    run: Callable[[], object]
+    units: float = 1       # Work items per call, for throughput
+    unit: str = "ops"
+
+
+def _page_count(pdf_path: Path) -> int:
+    return len(pypdf.PdfReader(str(pdf_path)).pages)
+
+
+def stage_benchmarks(work_dir: Path, fixtures: List[Path]) -> List[Benchmark]:
+    """One benchmark per stage and fixture"""
+    processor = PDFProcessor()
+    cached = FigureProcessor(ConfigManager({**DEFAULT_CONFIG, "output_dir": str(work_dir / "cached")}))
+    benchmarks = []
+    for pdf_path in fixtures:
+        pages = _page_count(pdf_path)
+        out_dir = work_dir / "extract" / pdf_path.stem
+        out_dir.mkdir(parents=True, exist_ok=True)
+        cached_dir = work_dir / "cached" / pdf_path.stem
+        cached_dir.mkdir(parents=True, exist_ok=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            cached.extract_figure(pdf_path, cached_dir)  # Fills the extraction cache
+        benchmarks += [
+            Benchmark(f"extract_figure_cached[{pdf_path.stem}]",
+                      lambda p=pdf_path, d=cached_dir: cached.extract_figure(p, d)),
+            Benchmark(f"extract_content[{pdf_path.stem}]",
+                      lambda p=pdf_path, o=out_dir: processor.extract_content(p, o), pages, "pages"),
+            Benchmark(f"extract_text_budget[{pdf_path.stem}]",
+                      lambda p=pdf_path: processor.extract_text(p, max_chars=20000, max_words=1000)),
+            Benchmark(f"extract_images[{pdf_path.stem}]",
+                      lambda p=pdf_path, o=out_dir: processor.extract_images(p, o), pages, "pages"),
+        ]
+
+    large = next(p for p in fixtures if p.stem == "large_text")
+    text, _ = processor.extract_text(large)
+    words = len(text.split())
+    normalized = normalize_text(text[:20000])
+    digest = build_digest(normalized)
+
+    folders = count()
+    platforms = DEFAULT_CONFIG["platforms"]
+    benchmarks += [
+        Benchmark("validate_content", lambda: ContentValidator.validate_content(text), words, "words"),
+        Benchmark("create_folder_structure",
+                  lambda: create_folder_structure(work_dir / "folders", f"Figure {next(folders)}", platforms)),
+        Benchmark("normalize_text", lambda: normalize_text(text[:20000]), 20000, "chars"),
+        Benchmark("build_digest", lambda: build_digest(normalized), len(normalized), "chars"),
+    ]
+
+    client = FakeOpenAIClient()
+    generators = {}
+    for label, _, generator, _, _ in FigureProcessor(ConfigManager()).generation_specs(work_dir, client):
+        generators[label] = generator
+        benchmarks.append(Benchmark(f"build_prompt[{type(generator).__name__}]",
+                                    lambda g=generator: g.build_prompt("Synthetic Figure", digest)))
+    batchable = ShortFormBatchGenerator.batchable_labels(generators)
+    short_form = ShortFormBatchGenerator(client, {label: generators[label] for label in batchable})
+    benchmarks.append(Benchmark("build_prompt[ShortFormBatchGenerator]",
+                                lambda: short_form.build_prompt("Synthetic Figure", digest)))
+    return benchmarks
+
+
+def text_fixtures(work_dir: Path, fixtures: List[Path]) -> List[Path]:
+    """Plain-text copies of the PDF fixtures' text, served by the local source backend"""
+    paths = []
+    for pdf_path in fixtures:
+        text_dir = work_dir / "sources" / pdf_path.stem
+        text_dir.mkdir(parents=True, exist_ok=True)
+        text_path = text_dir / "Synthetic_Figure.txt"
+        if not text_path.exists():
+            text_path.write_text("\n".join(page.extract_text() or "" for page in pypdf.PdfReader(str(pdf_path)).pages))
+        paths.append(text_path)
+    return paths
+
+
+def process_figure_benchmarks(work_dir: Path, fixtures: List[Path], latency: float) -> List[Benchmark]:
+    """
+    Full process_figure() runs with downloads served from the fixtures, and
+    the same figures from the text backend (no PDF parsing) for comparison
+    """
+    benchmarks = []
+    sources = [(pdf_path, {}) for pdf_path in fixtures]
+    sources += [(text_path, {"backend": "local", "local_dir": str(text_path.parent)})
+                for text_path in text_fixtures(work_dir, fixtures)]
+    for source_path, source in sources:
+        name = source_path.stem if not source else f"{source_path.parent.name}.txt"
+        for concurrency in (1, 4):
+            config_manager = ConfigManager({
+                **DEFAULT_CONFIG,
+                "output_dir": str(work_dir / "outputs" / f"{name}-{concurrency}"),
+                "force": True,
+                "max_concurrent_requests": concurrency,
+                "response_cache": {"enabled": False},
+                "source": {**DEFAULT_CONFIG["source"], **source},
+            })
+            processor = FigureProcessor(config_manager, metrics=RunMetrics())
+            client = FakeOpenAIClient(latency=latency, metrics=processor.metrics)
+
+            def run(processor=processor, client=client, fixture=source_path):
+                def download(figure_name: str, save_path: Path, timeout: int = 30, base_url: str = "") -> Path:
+                    output_path = save_path / f"{figure_name.replace(' ', '_')}.pdf"
+                    shutil.copyfile(fixture, output_path)
+                    return output_path
+
+                with mock.patch.object(source_backends_module, "download_wikipedia_pdf", download):
+                    return processor.process_figure("Synthetic Figure", client)
+
+            benchmarks.append(Benchmark(f"process_figure[{name},concurrency={concurrency}]",
+                                        run, 1, "figures"))
+    return benchmarks
+
+
+def _format_time(seconds: float) -> str:
+    if seconds >= 0.1:
+        return f"{seconds:.3f}s"
+    if seconds >= 1e-4:
+        return f"{seconds * 1000:.2f}ms"
+    return f"{seconds * 1e6:.2f}µs"
+
+
+def measure(benchmark: Benchmark, repeat: int, warmup: int, min_sample_time: float = 0.02) -> Dict:
+    """
+    Time `repeat` samples after `warmup` calls, then measure peak memory in
+    one extra call. Fast benchmarks loop inside each sample (like timeit's
+    autorange) so a sample lasts at least min_sample_time.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        loops = 1
+        for _ in range(warmup):
+            started = time.perf_counter()
+            benchmark.run()
+            elapsed = time.perf_counter() - started
+            if elapsed < min_sample_time:
+                loops = max(loops, min(100000, int(min_sample_time / max(elapsed, 1e-7)) + 1))
+
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(loops):
+                benchmark.run()
+            timings.append((time.perf_counter() - started) / loops)
+
+        # Separate pass: tracemalloc slows allocation-heavy code down
+        tracemalloc.start()
+        try:
+            benchmark.run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    mean = statistics.mean(timings)
+    return {
+        "mean_s": mean,
+        "min_s": min(timings),
+        "stdev_s": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "loops": loops,
+        "throughput": benchmark.units / mean if mean else 0.0,
+        "unit": f"{benchmark.unit}/s",
+        "peak_mem_kib": peak / 1024,
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """Names of benchmarks whose mean time regressed by more than `threshold`"""
+    regressions = []
+    print(f"\n{'benchmark'.ljust(58)} {'baseline'.rjust(10)} {'now'.rjust(10)} {'change'.rjust(8)}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, now = baseline[name]["mean_s"], result["mean_s"]
+        change = (now - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            flag = " ⚠️ regression"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = " 🚀 faster"
+        print(f"{name.ljust(58)} {_format_time(before).rjust(10)} {_format_time(now).rjust(10)} {change:+8.1%}{flag}")
+    return regressions
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline pipeline microbenchmarks")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed calls per benchmark")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed calls before timing")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="Simulated OpenAI latency in seconds for process_figure runs")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--work-dir", type=Path, help="Where fixtures and outputs go (default: a temp dir)")
+    parser.add_argument("--save-baseline", type=Path, help="Write results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="Compare against a saved baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative slowdown reported as a regression (default 0.10)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    work_dir = args.work_dir or Path(tempfile.mkdtemp(prefix="smg-bench-"))
+    try:
+        fixtures = standard_fixtures(work_dir / "fixtures")
+        benchmarks = stage_benchmarks(work_dir, fixtures)
+        benchmarks += process_figure_benchmarks(work_dir, fixtures, args.latency)
+        benchmarks = [b for b in benchmarks if args.filter in b.name]
+
+        print(f"⏱️ Running {len(benchmarks)} benchmarks ({args.repeat} timed calls each)\n")
+        print(f"{'benchmark'.ljust(58)} {'mean'.rjust(10)} {'throughput'.rjust(18)} {'peak mem'.rjust(11)}")
+        results = {}
+        for benchmark in benchmarks:
+            result = measure(benchmark, args.repeat, args.warmup)
+            results[benchmark.name] = result
+            throughput = f"{result['throughput']:,.1f} {result['unit']}"
+            print(f"{benchmark.name.ljust(58)} {_format_time(result['mean_s']).rjust(10)} "
+                  f"{throughput.rjust(18)} {result['peak_mem_kib']:8.0f}KiB")
+
+        if args.save_baseline:
+            args.save_baseline.write_text(json.dumps(results, indent=2))
+            print(f"\n💾 Baseline saved to {args.save_baseline}")
+        if args.compare:
+            regressions = compare(results, json.loads(args.compare.read_text()), args.threshold)
+            if regressions:
+                print(f"\n❌ {len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+                return 1
+            print("\n✅ No regressions")
+        return 0
+    finally:
+        if args.work_dir is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test: run main.py against the fault-injecting fake server.
+
+Starts benchmarks/fake_server.py in-process (or uses --server-url), writes
+an input sheet of N synthetic names and a config pointing OpenAI and
+Wikipedia at the fake server, runs `src/main.py --config ...` and reports
+throughput, tail latency and success rate from the run's metrics:
+
+    python benchmarks/run_load_test.py --figures 50 --openai-429 0.05 --openai-500 0.02 --pipeline
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+BENCH_DIR = Path(__file__).resolve().parent
+MAIN = BENCH_DIR.parent / "src" / "main.py"
+sys.path.insert(0, str(BENCH_DIR))
+
+from fake_server import API_PATH, PDF_PREFIX, add_server_args, server_from_args
+
+OUTPUT_FILES = ("YouTube/post.txt", "YouTube/story.txt", "X/content.txt", "Facebook/content.txt",
+                "LinkedIn/content.txt", "Patreon/content.txt", "Medium/content.txt",
+                "Ko-fi/content.txt", "Blog/content.txt")
+FIGURE_NAME = "Load Test Figure {}"
+
+
+def figure_names(figures: int):
+    return [FIGURE_NAME.format(i) for i in range(1, figures + 1)]
+
+
+def write_inputs(work_dir: Path, figures: int, server_url: str, args: argparse.Namespace) -> Path:
+    """Write the names sheet and the config file main.py is run with"""
+    work_dir.mkdir(parents=True, exist_ok=True)
+    names_path = work_dir / "names.xlsx"
+    pd.DataFrame({"Name": figure_names(figures)}).to_excel(names_path, index=False)
+
+    config = {
+        "input_file": str(names_path),
+        "output_dir": str(work_dir / "outputs"),
+        "openai_key": "sk-loadtest",
+        "openai_base_url": f"{server_url}/v1",
+        "wikipedia_pdf_url": f"{server_url}{PDF_PREFIX}",
+        "source": {"backend": args.source, "wikipedia_api_url": f"{server_url}{API_PATH}"},
+        "max_figures": figures,
+        "force": True,
+        "max_concurrent_requests": args.concurrency,
+        "response_cache": {"enabled": False},
+        "pipeline": {"enabled": args.pipeline},
+        "retry": {"max_retries": args.max_retries, "base_delay": args.retry_base_delay, "max_delay": 30},
+        "batch": {"work_dir": str(work_dir / "batch")},
+    }
+    if args.config:
+        config.update(json.loads(Path(args.config).read_text()))
+    config_path = work_dir / "config.json"
+    config_path.write_text(json.dumps(config, indent=2))
+    return config_path
+
+
+def fetch_server_stats(server_url: str) -> Dict:
+    try:
+        with urllib.request.urlopen(f"{server_url}/__stats", timeout=5) as response:
+            return json.loads(response.read())
+    except OSError:
+        return {}
+
+
+def build_report(work_dir: Path, figures: int, started_at: float, elapsed: float, exit_code: int,
+                 log: str, server_stats: Dict) -> Dict:
+    """Outputs count only for this run's figures and only if written after `started_at` (epoch seconds)"""
+    output_dir = work_dir / "outputs"
+    metrics_path = output_dir / "run_metrics.json"
+    metrics = json.loads(metrics_path.read_text()) if metrics_path.exists() else {}
+
+    match = re.search(r"Successful: (\d+)/(\d+)", log)
+    succeeded = int(match.group(1)) if match else 0
+    written = 0
+    for name in figure_names(figures):
+        figure_dir = output_dir / name.replace(" ", "_")
+        for output in OUTPUT_FILES:
+            path = figure_dir / output
+            if path.exists() and path.stat().st_mtime >= int(started_at):  # Whole seconds: coarse mtimes
+                written += 1
+    calls = metrics.get("calls", {}).get("total", {})
+    stages = metrics.get("stages", {})
+    return {
+        "figures": figures,
+        "exit_code": exit_code,
+        "wall_time_s": round(elapsed, 2),
+        "figures_succeeded": succeeded,
+        "figure_success_rate": round(succeeded / figures, 4) if figures else 0.0,
+        "outputs_written": written,
+        "output_success_rate": round(written / (figures * len(OUTPUT_FILES)), 4) if figures else 0.0,
+        "throughput_figures_per_min": round(succeeded / elapsed * 60, 2) if elapsed else 0.0,
+        "throughput_calls_per_s": round(calls.get("calls", 0) / elapsed, 2) if elapsed else 0.0,
+        "api_calls": {key: calls.get(key) for key in (
+            "calls", "failures", "retries", "latency_p50_s", "latency_p90_s", "latency_p95_s", "latency_p99_s")},
+        "stages": {stage: stages[stage] for stage in ("download", "extraction", "figure_total") if stage in stages},
+        "server": server_stats,
+    }
+
+
+def print_report(report: Dict):
+    calls = report["api_calls"]
+    print("\n" + "=" * 50)
+    print("📊 Load Test Report")
+    print(f"   Figures:     {report['figures_succeeded']}/{report['figures']} succeeded "
+          f"({report['figure_success_rate']:.1%}), outputs {report['output_success_rate']:.1%}")
+    print(f"   Wall time:   {report['wall_time_s']}s")
+    print(f"   Throughput:  {report['throughput_figures_per_min']} figures/min, "
+          f"{report['throughput_calls_per_s']} API calls/s")
+    print(f"   API calls:   {calls['calls']} calls, {calls['failures']} failed, {calls['retries']} retries")
+    print(f"   API latency: p50 {calls['latency_p50_s']}s, p95 {calls['latency_p95_s']}s, p99 {calls['latency_p99_s']}s")
+    for stage, stats in report["stages"].items():
+        print(f"   {stage.ljust(12)} p50 {stats['p50_s']}s, p95 {stats['p95_s']}s, p99 {stats['p99_s']}s")
+    for endpoint, stats in report["server"].items():
+        print(f"   Server {endpoint}: {stats.get('requests', 0)} requests, "
+              f"{stats.get('status_429', 0)} injected 429s, {stats.get('status_500', 0)} injected 500s")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load-test main.py against a fake OpenAI/Wikipedia server")
+    parser.add_argument("--figures", type=int, default=20, help="Number of synthetic names")
+    parser.add_argument("--server-url", help="Use an already running fake server instead of starting one")
+    parser.add_argument("--pipeline", action="store_true", help="Run main.py in cross-figure pipeline mode")
+    parser.add_argument("--source", choices=("pdf", "wikipedia_text"), default="pdf",
+                        help="Source backend: rendered PDFs or plaintext article extracts")
+    parser.add_argument("--concurrency", type=int, default=4, help="max_concurrent_requests per figure")
+    parser.add_argument("--max-retries", type=int, default=5)
+    parser.add_argument("--retry-base-delay", type=float, default=0.5)
+    parser.add_argument("--config", help="Extra JSON config overrides for main.py")
+    parser.add_argument("--work-dir", type=Path, help="Where inputs, outputs and the log go (default: a temp dir)")
+    parser.add_argument("--report", type=Path, help="Write the report JSON here (default: <work-dir>/load_test_report.json)")
+    add_server_args(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    work_dir = args.work_dir or Path(tempfile.mkdtemp(prefix="smg-load-"))
+
+    server = None
+    server_url: Optional[str] = args.server_url
+    if server_url is None:
+        server = server_from_args(args)
+        server_url = server.start()
+        print(f"🧪 Fake server on {server_url}")
+
+    try:
+        config_path = write_inputs(work_dir, args.figures, server_url, args)
+        log_path = work_dir / "main.log"
+        print(f"🚀 Running main.py with {args.figures} figures (log: {log_path})")
+        started_at = time.time()
+        started = time.perf_counter()
+        with open(log_path, "w") as log:
+            exit_code = subprocess.run([sys.executable, str(MAIN), "--config", str(config_path)],
+                                       stdout=log, stderr=subprocess.STDOUT).returncode
+        elapsed = time.perf_counter() - started
+        report = build_report(work_dir, args.figures, started_at, elapsed, exit_code,
+                              log_path.read_text(), fetch_server_stats(server_url))
+    finally:
+        if server is not None:
+            server.stop()
+
+    print_report(report)
+    report_path = args.report or work_dir / "load_test_report.json"
+    report_path.write_text(json.dumps(report, indent=2))
+    print(f"📝 Report: {report_path}")
+    return 0 if report["figure_success_rate"] == 1.0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,13 @@
+import json
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 DEFAULT_CONFIG = {
     "input_file": "/content/social-media-generator/input/Names.xlsx",
     "output_dir": "outputs",
     "platforms": ["YouTube", "X", "Facebook", "LinkedIn", "Patreon", "Medium", "Ko-fi", "Blog"],
     "openai_key": "YOUR-OPENAI-API-KEY",
+    "openai_base_url": None,     # None = api.openai.com
     "model": "gpt-4",
     "max_figures": 5,
     "min_text_length": 500,
@@ -16,17 +18,123 @@ DEFAULT_CONFIG = {
         "Blog": 700,
         "LinkedIn": 600
     },
+    "generator_overrides": {},    # Output label -> {"model", "max_tokens", "temperature", "source_tokens"}
+    "output_validation": {
+        "enabled": True,
+        "repair_prompt": True,       # Send outputs local repairs cannot fix back with a short fix-up prompt
+        "fail_unrepaired": False     # Count outputs that still break a rule as failed
+    },
     "timeout": 30,
-    "x_char_limit": 280
+    "wikipedia_pdf_url": "https://en.wikipedia.org/api/rest_v1/page/pdf/",
+    "source": {
+        "backend": "pdf",            # "pdf", "wikipedia_text" (plaintext extract, no PDF parsing) or "local"
+        "wikipedia_api_url": "https://en.wikipedia.org/w/api.php",
+        "local_dir": "input/sources" # <Name>.txt/.md/.html/.pdf files for the local backend
+    },
+    "x_char_limit": 280,
+    "max_concurrent_requests": 4,
+    "force": False,
+    "streaming": True,           # Stream long-form outputs (Blog, Medium, story) to disk
+    "batch_short_form": False,   # One JSON completion for YouTube description, X and Facebook
+    "metrics_report": True,      # Write run_metrics.json / run_metrics.prom to output_dir
+    "pdf_extraction": {
+        "lazy_text": True,       # Stop reading pages once the text budget is met
+        "max_chars": 3000,       # Largest excerpt any generator uses (story: 3000)
+        "extract_images": True,
+        "min_image_bytes": 2048, # Skip icons and spacer images
+        "parallel": False,
+        "workers": None,
+        "min_parallel_pages": 8,
+        "cache": True            # Reuse <pdf>.extract.json while the PDF and extractor are unchanged
+    },
+    "source_digest": {
+        "enabled": True,
+        "input_chars": 20000,    # How much article text the digest ranks sentences from
+        "tiers": [1200, 1800]    # Cumulative digest sizes in chars (~300/450 prompt tokens)
+    },
+    "pipeline": {
+        "enabled": False,
+        "download_workers": 2,
+        "extract_workers": 2,
+        "generation_workers": 8,
+        "queue_size": 16
+    },
+    "response_cache": {
+        "enabled": True,
+        "path": "outputs/.cache/responses.sqlite3",
+        "max_size_mb": 200
+    },
+    "batch": {
+        "work_dir": "outputs/.batch",
+        "poll_interval": 60,
+        "completion_window": "24h"
+    },
+    "rate_limits": {
+        "default": {"rpm": 500, "tpm": 30000},
+        "gpt-4": {"rpm": 500, "tpm": 10000},
+        "gpt-4o-mini-2024-07-18": {"rpm": 500, "tpm": 200000}
+    },
+    "token_budget": {
+        "max_run_cost_usd": None,    # Abort before starting if the estimate is higher
+        "max_run_tokens": None,
+        "prices_per_million": {      # USD per 1M tokens
+            "gpt-4": {"input": 30.0, "output": 60.0},
+            "gpt-4o-mini-2024-07-18": {"input": 0.15, "output": 0.6},
+            "default": {"input": 30.0, "output": 60.0}
+        }
+    },
+    "retry": {
+        "max_retries": 5,
+        "base_delay": 1.0,
+        "max_delay": 60
+    },
+    "deadlines": {                   # Seconds per API call, retries included, by output label (None = no limit)
+        "default": 120,
+        "YouTube Story": 240,
+        "Medium": 300,
+        "Blog": 300
+    },
+    "hedging": {
+        "enabled": False,            # Send a duplicate of calls slower than the recent percentile
+        "percentile": 95,            # Per model/platform, over successful first attempts
+        "min_samples": 20,           # Observed calls needed before hedging that model/platform
+        "min_delay": 1.0,            # Never hedge sooner than this (seconds)
+        "max_extra_percent": 5       # Hedges may add at most this % to the request volume
+    },
+    "result_store": {
+        "enabled": True,
+        "path": None,                # None = <output_dir>/results.sqlite3
+        "batch_size": 100,           # Rows per write transaction
+        "flush_seconds": 5,
+        "store_content": True        # Copy each output's text into the database
+    },
+    "job_queue": {
+        "path": "outputs/.queue/jobs.sqlite3",
+        "lease_seconds": 120,        # A job is reclaimed if its worker stops heartbeating this long
+        "heartbeat_seconds": 20,
+        "max_attempts": 3,
+        "journal_mode": "WAL",       # "DELETE" when workers on several hosts share the file
+        "poll_interval": 2
+    }
 }
 
 class ConfigManager:
     def __init__(self, config: Dict = None):
         self.config = config or DEFAULT_CONFIG
     
+    @classmethod
+    def from_file(cls, path: str) -> "ConfigManager":
+        """Load a JSON file of overrides on top of DEFAULT_CONFIG"""
+        with open(path) as f:
+            return cls({**DEFAULT_CONFIG, **json.load(f)})
+    
     def get_platform_requirement(self, platform: str) -> int:
         return self.config["platform_requirements"].get(platform, self.config["min_text_length"])
     
+    def get_max_platform_requirement(self) -> int:
+        """Largest word count any platform check needs"""
+        return max([self.config["min_text_length"], *self.config["platform_requirements"].values()])
+    
     def get_platforms(self) -> List[str]:
         return self.config["platforms"]
     
@@ -39,14 +147,102 @@ class ConfigManager:
     def get_max_figures(self) -> int:
         return self.config["max_figures"]
     
+    def get_generator_overrides(self) -> Dict[str, Dict]:
+        """Per-output model/max_tokens/temperature replacing the generator's defaults"""
+        return self.config.get("generator_overrides", {})
+    
     def get_openai_key(self) -> str:
         return self.config["openai_key"]
     
+    def get_openai_base_url(self):
+        return self.config.get("openai_base_url")
+    
     def get_timeout(self) -> int:
         return self.config["timeout"]
     
+    def get_wikipedia_pdf_url(self) -> str:
+        return self.config.get("wikipedia_pdf_url", DEFAULT_CONFIG["wikipedia_pdf_url"])
+    
+    def get_source_settings(self) -> Dict:
+        """Where figure source documents come from"""
+        return {**DEFAULT_CONFIG["source"], **self.config.get("source", {})}
+    
     def get_model(self) -> str:
         return self.config["model"]
     
     def get_x_char_limit(self) -> int:
         return self.config["x_char_limit"]
+    
+    def get_output_validation_settings(self) -> Dict:
+        """Post-generation checks of each output and how failures are repaired"""
+        return {**DEFAULT_CONFIG["output_validation"], **self.config.get("output_validation", {})}
+    
+    def get_max_concurrent_requests(self) -> int:
+        """Maximum generation requests in flight per figure (1 = serial)"""
+        return max(1, int(self.config.get("max_concurrent_requests", 1)))
+    
+    def is_pipeline_enabled(self) -> bool:
+        return self.config.get("pipeline", {}).get("enabled", False)
+    
+    def get_pipeline_settings(self) -> Dict:
+        """Worker counts and queue size for the cross-figure pipeline"""
+        return {**DEFAULT_CONFIG["pipeline"], **self.config.get("pipeline", {})}
+    
+    def get_response_cache_settings(self) -> Dict:
+        """On-disk completion cache location and size bound"""
+        return {**DEFAULT_CONFIG["response_cache"], **self.config.get("response_cache", {})}
+    
+    def get_rate_limits(self) -> Dict[str, Dict[str, int]]:
+        """Per-model requests/tokens per minute ("default" applies to unlisted models)"""
+        return self.config.get("rate_limits", DEFAULT_CONFIG["rate_limits"])
+    
+    def get_token_budget_settings(self) -> Dict:
+        """Run spend limits and per-model prices for the pre-run estimate"""
+        return {**DEFAULT_CONFIG["token_budget"], **self.config.get("token_budget", {})}
+    
+    def get_retry_settings(self) -> Dict:
+        return {**DEFAULT_CONFIG["retry"], **self.config.get("retry", {})}
+    
+    def get_deadlines(self) -> Dict[str, Optional[float]]:
+        """Per-call deadline in seconds by output label; "default" covers the rest"""
+        return {**DEFAULT_CONFIG["deadlines"], **self.config.get("deadlines", {})}
+    
+    def get_hedging_settings(self) -> Dict:
+        """When duplicate requests are sent for slow calls, and how many"""
+        return {**DEFAULT_CONFIG["hedging"], **self.config.get("hedging", {})}
+    
+    def get_result_store_settings(self) -> Dict:
+        """Queryable SQLite copy of the outputs and its write batching"""
+        settings = {**DEFAULT_CONFIG["result_store"], **self.config.get("result_store", {})}
+        if settings["path"] is None:
+            settings["path"] = str(self.get_output_dir() / "results.sqlite3")
+        return settings
+    
+    def get_job_queue_settings(self) -> Dict:
+        """Location, lease timing and retry limit of the multi-process job queue"""
+        return {**DEFAULT_CONFIG["job_queue"], **self.config.get("job_queue", {})}
+    
+    def get_force_regenerate(self) -> bool:
+        """Regenerate every output even if the run manifest says it is up to date"""
+        return self.config.get("force", False)
+    
+    def get_pdf_extraction_settings(self) -> Dict:
+        """Text budget, image pass and process-pool options (workers=None uses the CPU count)"""
+        return {**DEFAULT_CONFIG["pdf_extraction"], **self.config.get("pdf_extraction", {})}
+    
+    def get_source_digest_settings(self) -> Dict:
+        """Shared per-figure digest that replaces the raw text slice in prompts"""
+        return {**DEFAULT_CONFIG["source_digest"], **self.config.get("source_digest", {})}
+    
+    def is_short_form_batching_enabled(self) -> bool:
+        return self.config.get("batch_short_form", False)
+    
+    def get_batch_settings(self) -> Dict:
+        """Work directory and polling for Batch API runs"""
+        return {**DEFAULT_CONFIG["batch"], **self.config.get("batch", {})}
+    
+    def is_streaming_enabled(self) -> bool:
+        return self.config.get("streaming", True)
+    
+    def is_metrics_report_enabled(self) -> bool:
+        return self.config.get("metrics_report", True)
@@ -1,17 +1,20 @@
 from pathlib import Path
 from typing import Optional
 from .openai_client import OpenAIClient
+from .token_budget import completion_budget, fit_to_tokens
 
 class LegacyBlogGenerator:
+    TEMPLATE_VERSION = 1  # Bump when the prompt template changes
+    MODEL = "gpt-4"
+    TARGET_WORDS = 1200  # Longest output the prompt asks for
+    SOURCE_TOKENS = 500  # Source excerpt budget in the prompt
+    MAX_TOKENS = completion_budget(TARGET_WORDS)
+
     def __init__(self, client: OpenAIClient):
         self.client = client
 
-    def generate_post(self, figure_name: str, source_text: str, output_path: Path) -> bool:
-        """
-        Generate a long-form blog article (using generate_post name for consistency)
-        while maintaining article-style content quality.
-        """
-        prompt = f"""Create a comprehensive blog article about {figure_name} with these sections:
+    def build_prompt(self, figure_name: str, source_text: str) -> str:
+        return f"""Create a comprehensive blog article about {figure_name} with these sections:
         
 1. TITLE: SEO-optimized and intriguing (Max 80 characters)
 2. INTRODUCTION: Hook with a surprising fact or question
@@ -24,18 +27,26 @@ class LegacyBlogGenerator:
 9. TAGS: {figure_name.replace(' ','')}, history, biography, education
 
 SOURCE MATERIAL:
-{source_text[:2000]}"""
+{fit_to_tokens(source_text, self.SOURCE_TOKENS, self.MODEL)}"""
+
+    def format_content(self, figure_name: str, response: str) -> str:
+        return f"✍️ Blog Article: {figure_name}\n\n{response}"
 
-        response = self.client.generate_content(
+    def generate_post(self, figure_name: str, source_text: str, output_path: Path) -> bool:
+        """
+        Generate a long-form blog article (using generate_post name for consistency)
+        while maintaining article-style content quality.
+        """
+        prompt = self.build_prompt(figure_name, source_text)
+
+        # Long-form output is streamed to disk as it is generated
+        return self.client.stream_to_file(
             prompt=prompt,
-            model="gpt-4",
-            max_tokens=1500  # Longer for detailed articles
+            output_path=output_path,
+            format_content=lambda response: self.format_content(figure_name, response),
+            model=self.MODEL,
+            max_tokens=self.MAX_TOKENS  # Longer for detailed articles
         )
 
-        if response:
-            content = f"✍️ Blog Article: {figure_name}\n\n{response}"
-            return self.client.save_to_file(content, output_path)
-        return False
-
     # Alias for backward compatibility
     generate_article = generate_post
@@ -1,13 +1,20 @@
 from pathlib import Path
 from typing import Optional
 from .openai_client import OpenAIClient
+from .token_budget import completion_budget, fit_to_tokens
 
 class KofiPostGenerator:
+    TEMPLATE_VERSION = 1  # Bump when the prompt template changes
+    MODEL = "gpt-4"
+    TARGET_WORDS = 350  # Longest output the prompt asks for
+    SOURCE_TOKENS = 500  # Source excerpt budget in the prompt
+    MAX_TOKENS = completion_budget(TARGET_WORDS)
+
     def __init__(self, client: OpenAIClient):
         self.client = client
 
-    def generate_post(self, figure_name: str, source_text: str, output_path: Path) -> bool:
-        prompt = f"""Create a Ko-fi post about {figure_name} with:
+    def build_prompt(self, figure_name: str, source_text: str) -> str:
+        return f"""Create a Ko-fi post about {figure_name} with:
 1. TITLE: Whimsical yet intriguing (Max 80 chars)
 2. INTRODUCTION: Personal thank-you to supporters
 3. EXCLUSIVE CONTENT: 2-3 paragraphs of patron-only insights
@@ -18,15 +25,21 @@ class KofiPostGenerator:
 8. CTA: Clear support request with "Buy Me a Coffee" alternative
 
 SOURCE MATERIAL:
-{source_text[:2000]}"""
+{fit_to_tokens(source_text, self.SOURCE_TOKENS, self.MODEL)}"""
+
+    def format_content(self, figure_name: str, response: str) -> str:
+        return f"☕ Ko-fi Post: {figure_name}\n\n{response}"
+
+    def generate_post(self, figure_name: str, source_text: str, output_path: Path) -> bool:
+        prompt = self.build_prompt(figure_name, source_text)
 
         response = self.client.generate_content(
             prompt=prompt,
-            model="gpt-4",
-            max_tokens=500  # Shorter but more personal
+            model=self.MODEL,
+            max_tokens=self.MAX_TOKENS  # Shorter but more personal
         )
 
         if response:
-            content = f"☕ Ko-fi Post: {figure_name}\n\n{response}"
+            content = self.format_content(figure_name, response)
             return self.client.save_to_file(content, output_path)
         return False
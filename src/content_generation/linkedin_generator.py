@@ -1,13 +1,20 @@
 from pathlib import Path
 from typing import Optional
 from .openai_client import OpenAIClient
+from .token_budget import completion_budget, fit_to_tokens
 
 class LinkedInPostGenerator:
+    TEMPLATE_VERSION = 1  # Bump when the prompt template changes
+    MODEL = "gpt-4"
+    TARGET_WORDS = 220  # Longest output the prompt asks for
+    SOURCE_TOKENS = 500  # Source excerpt budget in the prompt
+    MAX_TOKENS = completion_budget(TARGET_WORDS)
+
     def __init__(self, client: OpenAIClient):
         self.client = client
 
-    def generate_post(self, figure_name: str, source_text: str, output_path: Path) -> bool:
-        prompt = f"""Create a professional LinkedIn post about {figure_name} with:
+    def build_prompt(self, figure_name: str, source_text: str) -> str:
+        return f"""Create a professional LinkedIn post about {figure_name} with:
 1. HEADLINE: Attention-grabbing professional title (Max 120 characters)
 2. INTRODUCTION: 1-2 sentences establishing relevance to business/leadership
 3. KEY INSIGHTS: 3-5 bullet points of career lessons/achievements
@@ -17,15 +24,21 @@ class LinkedInPostGenerator:
 7. HASHTAGS: #{figure_name.replace(' ','')} #Leadership #CareerGrowth #IndustryTrends
 
 SOURCE MATERIAL:
-{source_text[:2000]}"""
+{fit_to_tokens(source_text, self.SOURCE_TOKENS, self.MODEL)}"""
+
+    def format_content(self, figure_name: str, response: str) -> str:
+        return f"💼 LinkedIn Post: {figure_name}\n\n{response}"
+
+    def generate_post(self, figure_name: str, source_text: str, output_path: Path) -> bool:
+        prompt = self.build_prompt(figure_name, source_text)
 
         response = self.client.generate_content(
             prompt=prompt,
-            model="gpt-4",
-            max_tokens=350  # Longer than Twitter, shorter than blog
+            model=self.MODEL,
+            max_tokens=self.MAX_TOKENS  # Longer than Twitter, shorter than blog
         )
 
         if response:
-            content = f"💼 LinkedIn Post: {figure_name}\n\n{response}"
+            content = self.format_content(figure_name, response)
             return self.client.save_to_file(content, output_path)
         return False
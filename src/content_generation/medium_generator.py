@@ -1,14 +1,20 @@
 from pathlib import Path
 from typing import Optional
 from .openai_client import OpenAIClient
+from .token_budget import completion_budget, fit_to_tokens
 
 class MediumPostGenerator:
+    TEMPLATE_VERSION = 1  # Bump when the prompt template changes
+    MODEL = "gpt-4"
+    TARGET_WORDS = 900  # Longest output the prompt asks for
+    SOURCE_TOKENS = 500  # Source excerpt budget in the prompt
+    MAX_TOKENS = completion_budget(TARGET_WORDS)
+
     def __init__(self, client: OpenAIClient):
         self.client = client
 
-    def generate_post(self, figure_name: str, source_text: str, output_path: Path) -> bool:
-        """Generate a Medium article (using generate_post for consistency)"""
-        prompt = f"""Create a Medium article about {figure_name} with:
+    def build_prompt(self, figure_name: str, source_text: str) -> str:
+        return f"""Create a Medium article about {figure_name} with:
 1. HEADLINE: Catchy but sophisticated title (Max 100 chars)
 2. SUBHEADER: Engaging preview text
 3. INTRODUCTION: Personal anecdote or thought-provoking question
@@ -19,15 +25,20 @@ class MediumPostGenerator:
 8. TAGS: {figure_name.replace(' ','')}, history, biography, education
 
 SOURCE MATERIAL:
-{source_text[:2000]}"""
+{fit_to_tokens(source_text, self.SOURCE_TOKENS, self.MODEL)}"""
+
+    def format_content(self, figure_name: str, response: str) -> str:
+        return f"📝 Medium Article: {figure_name}\n\n{response}"
 
-        response = self.client.generate_content(
+    def generate_post(self, figure_name: str, source_text: str, output_path: Path) -> bool:
+        """Generate a Medium article (using generate_post for consistency)"""
+        prompt = self.build_prompt(figure_name, source_text)
+
+        # Long-form output is streamed to disk as it is generated
+        return self.client.stream_to_file(
             prompt=prompt,
-            model="gpt-4",
-            max_tokens=1200
+            output_path=output_path,
+            format_content=lambda response: self.format_content(figure_name, response),
+            model=self.MODEL,
+            max_tokens=self.MAX_TOKENS
         )
-
-        if response:
-            content = f"📝 Medium Article: {figure_name}\n\n{response}"
-            return self.client.save_to_file(content, output_path)
-        return False
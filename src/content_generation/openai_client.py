@@ -1,37 +1,489 @@
-from openai import OpenAI
+from openai import (
+    OpenAI, AuthenticationError, BadRequestError, NotFoundError, PermissionDeniedError, RateLimitError
+)
+from concurrent.futures import FIRST_COMPLETED, Future, wait
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import atexit
+import contextvars
+import os
+import random
+import tempfile
+import threading
 import time
 
+from .rate_limiter import RateLimiter, estimate_tokens
+from .response_cache import ResponseCache
+from .token_budget import fit_max_tokens
+from utils.metrics import RunMetrics, current_figure, current_platform
+
+# Errors that will fail the same way on every attempt
+FATAL_ERRORS = (AuthenticationError, PermissionDeniedError, BadRequestError, NotFoundError)
+
+# Placeholder used to split a generator's format_content() into header and footer
+_RESPONSE_MARKER = "\x00RESPONSE\x00"
+
+class DeadlineExceeded(Exception):
+    """A call ran past its platform's deadline; it is not retried"""
+
+class RequestCancelled(Exception):
+    """The other copy of a hedged call finished first"""
+
+class CallControl:
+    """
+    Deadline and cancellation for one in-flight request.
+    A hedge shares its primary's finish line: the first copy to claim() it
+    may write its output, and the loser stops at its next streamed chunk.
+    """
+
+    def __init__(self, deadline: Optional[float] = None, race: Optional["CallControl"] = None):
+        self.deadline = deadline  # time.monotonic() value, or None for no limit
+        self.cancelled = threading.Event()
+        self._finish = race._finish if race is not None else {"lock": threading.Lock(), "winner": None}
+
+    def request_options(self) -> Dict:
+        """SDK per-request timeout for the time left before the deadline"""
+        if self.deadline is None:
+            return {}
+        return {"timeout": max(self.deadline - time.monotonic(), 0.001)}
+
+    def check(self):
+        if self.cancelled.is_set():
+            raise RequestCancelled("a hedged copy of this request finished first")
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise DeadlineExceeded("deadline exceeded")
+
+    def claim(self) -> bool:
+        with self._finish["lock"]:
+            if self._finish["winner"] is None:
+                self._finish["winner"] = self
+            return self._finish["winner"] is self
+
 class OpenAIClient:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None, max_retries: int = 3,
+                 retry_delay: float = 2, max_retry_delay: float = 60,
+                 base_url: Optional[str] = None, streaming: bool = True,
+                 metrics: Optional[RunMetrics] = None, deadlines: Optional[Dict[str, Optional[float]]] = None,
+                 hedging: Optional[Dict] = None):
         """
         Initialize the OpenAI client.
         Note: Model is specified in generate_content() calls, not during init
+        An optional ResponseCache short-circuits identical requests across runs.
+        An optional RateLimiter (shared across threads) keeps calls within quota.
+        base_url points the SDK at an OpenAI-compatible server (e.g. a local stand-in).
+        streaming enables stream_to_file() for generators that opt in.
+        metrics (a RunMetrics) records latency, retries and token usage per call.
+        deadlines caps each call (retries included) in seconds by output label,
+        with a "default" entry for the rest.
+        hedging (see ConfigManager.get_hedging_settings) sends a duplicate of
+        calls slower than the recent latency percentile; it needs metrics.
         """
         if not api_key.startswith('sk-'):
             raise ValueError("Invalid OpenAI API key format")
-        self.client = OpenAI(api_key=api_key)
-        self.max_retries = 3
-        self.retry_delay = 2
+        self.client = OpenAI(api_key=api_key, base_url=base_url, max_retries=0)  # Retries are handled here
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.streaming = streaming
+        self.metrics = metrics
+        self.stream_stats: List[Dict] = []
+        self._stats_lock = threading.Lock()
+        self.deadlines = deadlines or {}
+        self.hedging = hedging or {}
+        self._requests_sent = 0
+        self._hedges_sent = 0
+        self._hedge_lock = threading.Lock()
+        # Hedged copies run on their own threads; close() cancels them and removes their temp files
+        self._inflight: Dict[threading.Thread, CallControl] = {}
+        self._partial_files: Set[Path] = set()
+        self._inflight_lock = threading.Lock()
+
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        """Read the server-requested delay from Retry-After headers, if any"""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        try:
+            if headers.get("retry-after-ms"):
+                return float(headers["retry-after-ms"]) / 1000
+            if headers.get("retry-after"):
+                return float(headers["retry-after"])
+        except (TypeError, ValueError):
+            pass
+        return None
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter: half fixed, half random"""
+        delay = min(self.max_retry_delay, self.retry_delay * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    @staticmethod
+    def _fit_request(model: str, messages: List[Dict], kwargs: Dict) -> Optional[Dict]:
+        """
+        Clamp max_tokens to the model's context window
+        Returns None (after reporting) when the prompt alone is too long,
+        since every retry would be rejected the same way.
+        """
+        try:
+            max_tokens = fit_max_tokens(model, messages, kwargs.get("max_tokens"))
+        except ValueError as e:
+            print(f"❌ {str(e)}")
+            return None
+        if max_tokens is not None and max_tokens != kwargs.get("max_tokens"):
+            kwargs = {**kwargs, "max_tokens": max_tokens}
+        return kwargs
+
+    def generate_content(self, prompt: str, model: str = "gpt-4o-mini-2024-07-18",
+                         use_cache: bool = True, **kwargs) -> Optional[str]:
+        """
+        Generate content with automatic retries
+        Pass use_cache=False to force a fresh completion (e.g. creative regenerations)
+        """
+        messages = [{"role": "user", "content": prompt}]
+        kwargs = self._fit_request(model, messages, kwargs)
+        if kwargs is None:
+            return None
+        cache_key = None
+        if self.cache is not None and use_cache:
+            cache_key = self.cache.make_key(model, messages, **kwargs)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._record_cache_hit()
+                return cached
+
+        def complete(control: CallControl) -> Tuple[Optional[str], Any]:
+            response = self.client.chat.completions.create(
+                model=model,  # Model specified here
+                messages=messages,
+                **kwargs,
+                **control.request_options()
+            )
+            return response.choices[0].message.content, getattr(response, "usage", None)
 
-    def generate_content(self, prompt: str, model: str = "gpt-4o-mini-2024-07-18", **kwargs) -> Optional[str]:
-        """Generate content with automatic retries"""
+        content = self._with_retries(model, messages, kwargs.get("max_tokens"), complete)
+        if cache_key is not None and content:
+            self.cache.put(cache_key, content)
+        return content
+
+    def _with_retries(self, model: str, messages: List[Dict], max_tokens: Optional[int],
+                      request: Callable[[CallControl], Tuple[Optional[str], Any]],
+                      streamed: bool = False) -> Optional[str]:
+        """
+        Run `request` under the rate limiter, retrying transient failures with backoff
+        `request` takes a CallControl and returns (content, usage); the call is
+        recorded in self.metrics. Retries stop at the platform's deadline, which
+        is paused while the call waits for the rate limiter.
+        """
+        started = time.perf_counter()
+        platform = current_platform.get()
+        seconds = self.deadlines.get(platform, self.deadlines.get("default"))
+        deadline = None
+        tokens = estimate_tokens(messages, max_tokens)
+        backoff = 0.0
+        attempt = 0
         for attempt in range(self.max_retries):
+            queued = self._acquire(model, tokens)
+            if seconds:
+                # A Retry-After pause served in the limiter is backoff, not queueing
+                deadline = (time.monotonic() + seconds if deadline is None
+                            else deadline + max(queued - backoff, 0.0))
+            backoff = 0.0
             try:
-                response = self.client.chat.completions.create(
-                    model=model,  # Model specified here
-                    messages=[{"role": "user", "content": prompt}],
-                    **kwargs
-                )
-                return response.choices[0].message.content
+                content, usage = self._attempt(model, tokens, request, deadline)
+                self._record_call(model, started, attempt, bool(content), usage, streamed)
+                return content
+            except FATAL_ERRORS as e:
+                print(f"Attempt {attempt + 1} failed (not retryable): {str(e)}")
+                break
             except Exception as e:
+                if isinstance(e, DeadlineExceeded) or (deadline is not None and time.monotonic() >= deadline):
+                    print(f"⏰ {platform or model} call cancelled after its {seconds}s deadline")
+                    self._record_deadline_exceeded()
+                    break
                 print(f"Attempt {attempt + 1} failed: {str(e)}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
-                continue
+                if attempt >= self.max_retries - 1:
+                    break
+                retry_after = self._retry_after(e)
+                delay = retry_after if retry_after is not None else self._backoff_delay(attempt)
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    print(f"⏰ No time left for a retry before the {seconds}s deadline of this {platform or model} call")
+                    self._record_deadline_exceeded()
+                    break
+                if isinstance(e, RateLimitError) and self.rate_limiter is not None:
+                    # Hold back every thread using this model, not just this one
+                    self.rate_limiter.pause(model, delay)
+                    backoff = delay
+                    continue
+                time.sleep(delay)
+        self._record_call(model, started, attempt, False, None, streamed)
         return None
 
+    def _acquire(self, model: str, tokens: int) -> float:
+        """Wait for the rate limiter (if any); returns the seconds spent queued"""
+        if self.rate_limiter is None:
+            return 0.0
+        started = time.monotonic()
+        self.rate_limiter.acquire(model, tokens)
+        return time.monotonic() - started
+
+    def _attempt(self, model: str, tokens: int, request: Callable[[CallControl], Tuple[Optional[str], Any]],
+                 deadline: Optional[float]) -> Tuple[Optional[str], Any]:
+        """
+        One attempt of `request`, hedged when enabled: if it is still running
+        after the recent latency percentile of its model/platform, a duplicate
+        is sent and the first copy to return content wins. Hedges are capped at
+        hedging.max_extra_percent of the requests sent by this client.
+        """
+        control = CallControl(deadline)
+        control.check()
+        hedge_after = self._hedge_delay(model)
+        if hedge_after is None or (deadline is not None and time.monotonic() + hedge_after >= deadline):
+            return request(control)
+
+        primary = self._spawn(request, control)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done or not self._reserve_hedge():
+            return primary.result()
+        queued = self._acquire(model, tokens)  # Hedges count against the quota like any request
+        if primary.done():
+            self._release_hedge()
+            return primary.result()
+
+        print(f"🏁 Hedging {current_platform.get() or model} call still running after {hedge_after:.1f}s")
+        self._record_hedge_sent()
+        # Like the primary, the hedge's clock does not run while it waits for the limiter
+        hedge_control = CallControl(deadline + queued if deadline is not None else None, race=control)
+        hedge = self._spawn(request, hedge_control)
+        pending = {primary: control, hedge: hedge_control}
+        result, error = (None, None), None
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.pop(future)
+                try:
+                    result = future.result()
+                except RequestCancelled:
+                    continue
+                except Exception as e:
+                    error = error or e
+                    continue
+                if result[0]:
+                    # Non-streamed losers are abandoned; their SDK timeout ends at the deadline
+                    for other in pending.values():
+                        other.cancelled.set()
+                    if future is hedge:
+                        self._record_hedge_win()
+                    return result
+        if error is not None and not result[0]:
+            raise error
+        return result
+
+    def _spawn(self, request: Callable[[CallControl], Tuple[Optional[str], Any]], control: CallControl) -> Future:
+        """Run request(control) on a tracked thread, keeping the figure/platform context"""
+        future = Future()
+        context = contextvars.copy_context()
+
+        def run():
+            try:
+                if not future.set_running_or_notify_cancel():
+                    return
+                try:
+                    future.set_result(context.run(request, control))
+                except BaseException as e:
+                    future.set_exception(e)
+            finally:
+                with self._inflight_lock:
+                    self._inflight.pop(thread, None)
+
+        thread = threading.Thread(target=run, name="openai-request", daemon=True)
+        with self._inflight_lock:
+            self._inflight[thread] = control
+        thread.start()
+        return future
+
+    def close(self, timeout: float = 5.0):
+        """
+        Cancel requests still running on hedge threads, wait up to `timeout`
+        seconds for them, then delete any streaming temp files left behind
+        (a copy still waiting for its first chunk cannot see the cancellation)
+        """
+        with self._inflight_lock:
+            inflight = dict(self._inflight)
+        for control in inflight.values():
+            control.cancelled.set()
+        until = time.monotonic() + timeout
+        for thread in inflight:
+            thread.join(max(0.0, until - time.monotonic()))
+        with self._inflight_lock:
+            leftovers = list(self._partial_files)
+            self._partial_files.clear()
+        for path in leftovers:
+            path.unlink(missing_ok=True)
+
+    def _track_partial(self, path: Path, active: bool):
+        with self._inflight_lock:
+            if active:
+                self._partial_files.add(path)
+            else:
+                self._partial_files.discard(path)
+
+    def _hedge_delay(self, model: str) -> Optional[float]:
+        """Seconds to wait before hedging a call, or None when it must not be hedged"""
+        if not self.hedging.get("enabled") or self.metrics is None:
+            return None
+        with self._hedge_lock:
+            self._requests_sent += 1
+        observed = self.metrics.recent_latency(
+            model, current_platform.get(), self.hedging["percentile"], self.hedging["min_samples"]
+        )
+        if observed is None:
+            return None
+        return max(observed, self.hedging["min_delay"])
+
+    def _reserve_hedge(self) -> bool:
+        with self._hedge_lock:
+            if (self._hedges_sent + 1) * 100 > self.hedging["max_extra_percent"] * self._requests_sent:
+                return False
+            self._hedges_sent += 1
+            return True
+
+    def _release_hedge(self):
+        with self._hedge_lock:
+            self._hedges_sent -= 1
+
+    def _record_hedge_sent(self):
+        if self.metrics is not None:
+            self.metrics.record_hedge_sent()
+
+    def _record_hedge_win(self):
+        if self.metrics is not None:
+            self.metrics.record_hedge_win()
+
+    def _record_deadline_exceeded(self):
+        if self.metrics is not None:
+            self.metrics.record_deadline_exceeded()
+
+    def _record_call(self, model: str, started: float, retries: int, success: bool, usage, streamed: bool):
+        if self.metrics is None:
+            return
+        self.metrics.record_call(
+            model=model,
+            latency=time.perf_counter() - started,
+            retries=retries,
+            success=success,
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+            streamed=streamed,
+            figure=current_figure.get(),
+            platform=current_platform.get()
+        )
+
+    def _record_cache_hit(self):
+        if self.metrics is not None:
+            self.metrics.record_cache_hit()
+
+    def stream_to_file(self, prompt: str, output_path: Path, format_content: Callable[[str], str],
+                       model: str = "gpt-4o-mini-2024-07-18", use_cache: bool = True, **kwargs) -> bool:
+        """
+        Stream a completion straight into output_path
+        format_content wraps the response in the generator's header/footer; the
+        text before the response is written first and chunks are appended as
+        they arrive to a temp file that is renamed into place on completion.
+        Falls back to generate_content + save_to_file when streaming is off.
+        """
+        if not self.streaming:
+            response = self.generate_content(prompt, model=model, use_cache=use_cache, **kwargs)
+            return bool(response) and self.save_to_file(format_content(response), output_path)
+
+        messages = [{"role": "user", "content": prompt}]
+        kwargs = self._fit_request(model, messages, kwargs)
+        if kwargs is None:
+            return False
+
+        cache_key = None
+        if self.cache is not None and use_cache:
+            cache_key = self.cache.make_key(model, messages, **kwargs)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._record_cache_hit()
+                return self.save_to_file(format_content(cached), output_path)
+
+        prefix, suffix = format_content(_RESPONSE_MARKER).split(_RESPONSE_MARKER, 1)
+
+        def stream(control: CallControl) -> Tuple[Optional[str], Any]:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=output_path.parent, prefix=f".{output_path.name}.", suffix=".part")
+            self._track_partial(Path(tmp_name), True)
+            started = time.perf_counter()
+            first_token_at = None
+            usage = None
+            parts = []
+            chunks = None
+            try:
+                with os.fdopen(fd, "w") as f:
+                    f.write(prefix)
+                    chunks = self.client.chat.completions.create(
+                        model=model, messages=messages, stream=True,
+                        stream_options={"include_usage": True}, **kwargs, **control.request_options())
+                    for chunk in chunks:
+                        control.check()  # The read timeout is per chunk, so the deadline is enforced here
+                        if getattr(chunk, "usage", None) is not None:
+                            usage = chunk.usage  # Final chunk when include_usage is set
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta.content
+                        if delta:
+                            if first_token_at is None:
+                                first_token_at = time.perf_counter()
+                            parts.append(delta)
+                            f.write(delta)
+                            f.flush()
+                    f.write(suffix)
+                if not parts:
+                    raise ValueError("Empty streamed response")
+                if not control.claim():
+                    raise RequestCancelled("a hedged copy of this request finished first")
+                os.replace(tmp_name, output_path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+            finally:
+                self._track_partial(Path(tmp_name), False)
+                close = getattr(chunks, "close", None)
+                if close is not None:
+                    close()  # Drops the connection of a cancelled or failed stream
+
+            finished = time.perf_counter()
+            ttft = (first_token_at or finished) - started
+            generation_time = max(finished - (first_token_at or finished), 1e-9)
+            # Each streamed chunk carries about one token when usage is unavailable
+            tokens = getattr(usage, "completion_tokens", None) or len(parts)
+            self._record_stream_stats({
+                "model": model,
+                "file": str(output_path),
+                "time_to_first_token_s": round(ttft, 3),
+                "tokens": tokens,
+                "tokens_per_s": round(tokens / generation_time, 1),
+                "duration_s": round(finished - started, 3),
+            })
+            return "".join(parts), usage
+
+        content = self._with_retries(model, messages, kwargs.get("max_tokens"), stream, streamed=True)
+        if content is None:
+            return False
+        if cache_key is not None:
+            self.cache.put(cache_key, content)
+        return True
+
+    def _record_stream_stats(self, stats: Dict):
+        with self._stats_lock:
+            self.stream_stats.append(stats)
+        print(f"📡 Streamed {Path(stats['file']).name}: first token after {stats['time_to_first_token_s']}s, "
+              f"{stats['tokens_per_s']} tokens/s")
+
     def save_to_file(self, content: str, output_path: Path) -> bool:
         """Save content to file with directory creation"""
         try:
@@ -41,3 +493,39 @@ class OpenAIClient:
         except Exception as e:
             print(f"Failed to save file: {str(e)}")
             return False
+
+
+def create_client(config_manager, metrics: Optional[RunMetrics] = None,
+                  rate_limit_share: float = 1.0) -> OpenAIClient:
+    """
+    Build the run's client from config: response cache, rate limiter and retries
+    rate_limit_share scales the configured limits when several worker
+    processes on one host split the same account quota.
+    """
+    cache = None
+    cache_settings = config_manager.get_response_cache_settings()
+    if cache_settings["enabled"]:
+        cache = ResponseCache(
+            path=Path(cache_settings["path"]),
+            max_bytes=int(cache_settings["max_size_mb"] * 1024 * 1024)
+        )
+    limits = {
+        model: {name: value * rate_limit_share for name, value in limit.items()}
+        for model, limit in config_manager.get_rate_limits().items()
+    }
+    retry = config_manager.get_retry_settings()
+    client = OpenAIClient(
+        api_key=config_manager.get_openai_key(),
+        cache=cache,
+        rate_limiter=RateLimiter(limits),
+        max_retries=retry["max_retries"],
+        retry_delay=retry["base_delay"],
+        max_retry_delay=retry["max_delay"],
+        base_url=config_manager.get_openai_base_url(),
+        streaming=config_manager.is_streaming_enabled(),
+        metrics=metrics,
+        deadlines=config_manager.get_deadlines(),
+        hedging=config_manager.get_hedging_settings()
+    )
+    atexit.register(client.close)  # Also on errors and Ctrl-C, so no hedge leaves a .part file
+    return client
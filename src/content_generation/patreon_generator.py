@@ -1,13 +1,20 @@
 from pathlib import Path
 from typing import Optional
 from .openai_client import OpenAIClient
+from .token_budget import completion_budget, fit_to_tokens
 
 class PatreonPostGenerator:
+    TEMPLATE_VERSION = 1  # Bump when the prompt template changes
+    MODEL = "gpt-4"
+    TARGET_WORDS = 450  # Longest output the prompt asks for
+    SOURCE_TOKENS = 500  # Source excerpt budget in the prompt
+    MAX_TOKENS = completion_budget(TARGET_WORDS)
+
     def __init__(self, client: OpenAIClient):
         self.client = client
 
-    def generate_post(self, figure_name: str, source_text: str, output_path: Path) -> bool:
-        prompt = f"""Create an exclusive Patreon post about {figure_name} with:
+    def build_prompt(self, figure_name: str, source_text: str) -> str:
+        return f"""Create an exclusive Patreon post about {figure_name} with:
 1. TITLE: Catchy and intriguing (max 100 characters)
 2. INTRODUCTION: Personal note to patrons (1 paragraph)
 3. EXCLUSIVE CONTENT: 3-4 detailed paragraphs with insights not available publicly
@@ -17,15 +24,21 @@ class PatreonPostGenerator:
 7. TIER MENTION: [For $5+ patrons] tag for special content
 
 SOURCE MATERIAL:
-{source_text[:2000]}"""
+{fit_to_tokens(source_text, self.SOURCE_TOKENS, self.MODEL)}"""
+
+    def format_content(self, figure_name: str, response: str) -> str:
+        return f"🎭 Patreon Exclusive: {figure_name}\n\n{response}"
+
+    def generate_post(self, figure_name: str, source_text: str, output_path: Path) -> bool:
+        prompt = self.build_prompt(figure_name, source_text)
 
         response = self.client.generate_content(
             prompt=prompt,
-            model="gpt-4",
-            max_tokens=600  # Longer for Patreon's detailed format
+            model=self.MODEL,
+            max_tokens=self.MAX_TOKENS  # Longer for Patreon's detailed format
         )
 
         if response:
-            content = f"🎭 Patreon Exclusive: {figure_name}\n\n{response}"
+            content = self.format_content(figure_name, response)
             return self.client.save_to_file(content, output_path)
         return False
@@ -1,28 +1,41 @@
 from pathlib import Path
 from typing import Optional
 from .openai_client import OpenAIClient
+from .token_budget import SHORT_POST_HEADROOM, completion_budget, fit_to_tokens
 
 class LegacyPostGenerator:
+    TEMPLATE_VERSION = 1  # Bump when the prompt template changes
+    MODEL = "gpt-4o-mini-2024-07-18"
+    TARGET_WORDS = 150  # Longest output the prompt asks for
+    SOURCE_TOKENS = 500  # Source excerpt budget in the prompt
+    MAX_TOKENS = completion_budget(TARGET_WORDS, SHORT_POST_HEADROOM)
+
     def __init__(self, client: OpenAIClient):
         self.client = client
 
-    def generate_post(self, figure_name: str, source_text: str, output_path: Path) -> bool:
-        prompt = f"""Create a Facebook post about {figure_name} with:
+    def build_prompt(self, figure_name: str, source_text: str) -> str:
+        return f"""Create a Facebook post about {figure_name} with:
 1. HOOK: Start with a question
 2. BODY: 2 short paragraphs (40-60 words each)
 3. STYLE: Conversational, use emojis
 4. HASHTAGS: #{figure_name.replace(' ','')} #History #Legacy
 
 SOURCE MATERIAL:
-{source_text[:2000]}"""
+{fit_to_tokens(source_text, self.SOURCE_TOKENS, self.MODEL)}"""
+
+    def format_content(self, figure_name: str, response: str) -> str:
+        return f"👍 {figure_name} Facebook Post\n\n{response}"
+
+    def generate_post(self, figure_name: str, source_text: str, output_path: Path) -> bool:
+        prompt = self.build_prompt(figure_name, source_text)
 
         response = self.client.generate_content(
             prompt=prompt,
-            model="gpt-4o-mini-2024-07-18",
-            max_tokens=300
+            model=self.MODEL,
+            max_tokens=self.MAX_TOKENS
         )
 
         if response:
-            content = f"👍 {figure_name} Facebook Post\n\n{response}"
+            content = self.format_content(figure_name, response)
             return self.client.save_to_file(content, output_path)
         return False
@@ -0,0 +1,83 @@
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+def estimate_tokens(messages: List[Dict], max_tokens: Optional[int] = None) -> int:
+    """Rough request cost: ~4 characters per prompt token plus the completion budget"""
+    prompt_tokens = sum(len(str(m.get("content", ""))) // 4 + 4 for m in messages)
+    return prompt_tokens + (max_tokens or 0)
+
+
+class TokenBucket:
+    """Continuously refilling bucket holding up to `capacity` units per minute"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` units are available (0 if available now)"""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """
+    Thread-safe per-model requests-per-minute and tokens-per-minute limiter.
+
+    One instance is shared by every generation thread, so concurrent calls
+    never exceed the account quota. A 429 with Retry-After pauses the
+    whole model via `pause()`, not just the thread that received it.
+    """
+
+    def __init__(self, limits: Dict[str, Dict[str, int]]):
+        self.limits = limits
+        self._buckets: Dict[str, Dict[str, TokenBucket]] = {}
+        self._paused_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _buckets_for(self, model: str) -> Dict[str, TokenBucket]:
+        if model not in self._buckets:
+            limit = self.limits.get(model, self.limits.get("default", {}))
+            self._buckets[model] = {
+                name: TokenBucket(limit[name]) for name in ("rpm", "tpm") if limit.get(name)
+            }
+        return self._buckets[model]
+
+    def acquire(self, model: str, tokens: int):
+        """Block until one request of `tokens` estimated tokens fits the model's budget"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                buckets = self._buckets_for(model)
+                wait = self._paused_until.get(model, 0.0) - now
+                if "rpm" in buckets:
+                    wait = max(wait, buckets["rpm"].wait_time(1, now))
+                if "tpm" in buckets:
+                    wait = max(wait, buckets["tpm"].wait_time(tokens, now))
+                if wait <= 0:
+                    if "rpm" in buckets:
+                        buckets["rpm"].consume(1)
+                    if "tpm" in buckets:
+                        buckets["tpm"].consume(tokens)
+                    return
+            time.sleep(wait)
+
+    def pause(self, model: str, seconds: float):
+        """Hold back all requests for `model` for `seconds` (e.g. from Retry-After)"""
+        with self._lock:
+            until = time.monotonic() + seconds
+            self._paused_until[model] = max(self._paused_until.get(model, 0.0), until)
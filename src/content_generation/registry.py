@@ -0,0 +1,92 @@
+import importlib
+import threading
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+
+class PlatformOutput(NamedTuple):
+    label: str        # Result/manifest label
+    platform: str     # Name used in the config's platform list
+    module: str       # content_generation module holding the generator
+    class_name: str
+    method_name: str  # Generator method called with (figure_name, source_text, output_path)
+    filename: str     # Output path relative to the figure directory
+
+
+# Every output the generator can produce; the template, model, token limit
+# and header live on the generator class (TEMPLATE_VERSION, MODEL,
+# MAX_TOKENS, build_prompt, format_content)
+PLATFORM_OUTPUTS: Tuple[PlatformOutput, ...] = (
+    PlatformOutput("YouTube Post", "YouTube", "youtube_generator", "YouTubePostGenerator",
+                   "generate_post", "YouTube/post.txt"),
+    PlatformOutput("YouTube Story", "YouTube", "story_generator", "LegacyStoryGenerator",
+                   "generate_story", "YouTube/story.txt"),
+    PlatformOutput("X", "X", "x_generator", "XPostGenerator", "generate_post", "X/content.txt"),
+    PlatformOutput("Facebook", "Facebook", "post_generator", "LegacyPostGenerator",
+                   "generate_post", "Facebook/content.txt"),
+    PlatformOutput("LinkedIn", "LinkedIn", "linkedin_generator", "LinkedInPostGenerator",
+                   "generate_post", "LinkedIn/content.txt"),
+    PlatformOutput("Patreon", "Patreon", "patreon_generator", "PatreonPostGenerator",
+                   "generate_post", "Patreon/content.txt"),
+    PlatformOutput("Medium", "Medium", "medium_generator", "MediumPostGenerator",
+                   "generate_post", "Medium/content.txt"),
+    PlatformOutput("Ko-fi", "Ko-fi", "kofi_generator", "KofiPostGenerator",
+                   "generate_post", "Ko-fi/content.txt"),
+    PlatformOutput("Blog", "Blog", "blog_generator", "LegacyBlogGenerator",
+                   "generate_article", "Blog/content.txt"),
+)
+
+
+# Generator attributes a config override may replace
+OVERRIDABLE = {"model": "MODEL", "max_tokens": "MAX_TOKENS", "temperature": "TEMPERATURE",
+               "source_tokens": "SOURCE_TOKENS"}
+
+
+def outputs_for(platforms: Sequence[str]) -> List[PlatformOutput]:
+    """The outputs of the given platforms, in platform order"""
+    outputs = []
+    for platform in platforms:
+        matches = [output for output in PLATFORM_OUTPUTS if output.platform == platform]
+        if not matches:
+            print(f"⚠️ No generator registered for platform '{platform}', skipping")
+        outputs.extend(matches)
+    return outputs
+
+
+class GeneratorRegistry:
+    """
+    Generators for the enabled platforms, bound to one client.
+
+    Generator modules are imported and instantiated on first use and then
+    reused for every figure of the run, so disabled platforms cost nothing.
+    Per-label overrides (e.g. {"Blog": {"model": "gpt-4o", "max_tokens": 2000}})
+    replace the class's MODEL / MAX_TOKENS / TEMPERATURE on the instance.
+    """
+
+    def __init__(self, client, platforms: Sequence[str], overrides: Optional[Dict[str, Dict]] = None):
+        self.client = client
+        self.outputs = outputs_for(platforms)
+        self.overrides = overrides or {}
+        self._generators: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def generator(self, output: PlatformOutput):
+        with self._lock:
+            generator = self._generators.get(output.label)
+            if generator is None:
+                module = importlib.import_module(f".{output.module}", __package__)
+                generator = getattr(module, output.class_name)(self.client)
+                for key, value in self.overrides.get(output.label, {}).items():
+                    if key in OVERRIDABLE:
+                        setattr(generator, OVERRIDABLE[key], value)
+                    else:
+                        print(f"⚠️ Ignoring unknown generator override '{key}' for {output.label}")
+                self._generators[output.label] = generator
+            return generator
+
+    def specs(self, figure_dir: Path) -> List[Tuple[str, str, object, str, Path]]:
+        """(label, platform, generator, method_name, output_path) for every enabled output"""
+        return [
+            (output.label, output.platform, self.generator(output), output.method_name, figure_dir / output.filename)
+            for output in self.outputs
+        ]
@@ -0,0 +1,131 @@
+import json
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set
+from .openai_client import OpenAIClient
+from .token_budget import completion_budget, fit_to_tokens
+
+# Output label -> JSON key the model must return
+SHORT_FORM_KEYS = {
+    "YouTube Post": "youtube",
+    "X": "x",
+    "Facebook": "facebook",
+}
+
+
+class ShortFormBatchGenerator:
+    """
+    Generate several short-form posts with one completion returning JSON
+    The posts are written by the model their platform generators use, so
+    only generators sharing one model can be batched together.
+    """
+    TEMPLATE_VERSION = 1  # Bump when the prompt template changes
+    TARGET_WORDS = 400  # Longest output the prompt asks for
+    SOURCE_TOKENS = 500  # Source excerpt budget in the prompt
+    MAX_TOKENS = completion_budget(TARGET_WORDS, headroom=1.7)  # Short posts plus JSON keys and escaping
+
+    def __init__(self, client: OpenAIClient, generators: Dict[str, object]):
+        """
+        Args:
+            client: Shared OpenAI client
+            generators: Output label -> platform generator whose instructions
+                and header are reused for that part of the batch
+        """
+        self.client = client
+        self.generators = {label: gen for label, gen in generators.items() if label in SHORT_FORM_KEYS}
+        models = {generator.MODEL for generator in self.generators.values()}
+        if len(models) != 1:
+            raise ValueError(f"Short-form batches need generators sharing one model, got {sorted(models)}")
+        self.MODEL = models.pop()
+
+    @staticmethod
+    def batchable_labels(generators: Dict[str, object]) -> Set[str]:
+        """Short-form labels whose generator shares its model with another short-form generator"""
+        models = Counter(gen.MODEL for label, gen in generators.items() if label in SHORT_FORM_KEYS)
+        return {label for label, gen in generators.items() if label in SHORT_FORM_KEYS and models[gen.MODEL] >= 2}
+
+    def build_prompt(self, figure_name: str, source_text: str) -> str:
+        sections = []
+        for label, generator in self.generators.items():
+            # Reuse each platform's own instructions, minus its source excerpt
+            instructions = generator.build_prompt(figure_name, "").split("SOURCE MATERIAL:")[0].strip()
+            sections.append(f'"{SHORT_FORM_KEYS[label]}":\n{instructions}')
+        keys = ", ".join(f'"{SHORT_FORM_KEYS[label]}"' for label in self.generators)
+        return f"""Write several social media posts about {figure_name}.
+Respond with a single JSON object with the keys {keys}.
+Each value is the finished post text for that platform, following its instructions:
+
+{chr(10).join(sections)}
+
+SOURCE MATERIAL:
+{fit_to_tokens(source_text, self.SOURCE_TOKENS, self.MODEL)}"""
+
+    @staticmethod
+    def parse_response(response: str) -> Optional[Dict[str, str]]:
+        """Parse the JSON object, tolerating a surrounding Markdown code fence"""
+        text = re.sub(r'^```(?:json)?\s*|\s*```$', '', response.strip())
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        return {key: value for key, value in data.items() if isinstance(value, str) and value.strip()}
+
+    def generate_posts(self, figure_name: str, source_text: str,
+                       output_paths: Dict[str, Path]) -> Optional[Dict[str, bool]]:
+        """
+        Generate and save every short-form post in one call
+        Returns label -> success for each post written, or None if the
+        response could not be parsed (callers fall back to per-platform calls)
+        """
+        response = self.client.generate_content(
+            prompt=self.build_prompt(figure_name, source_text),
+            model=self.MODEL,
+            max_tokens=self.MAX_TOKENS,
+            response_format={"type": "json_object"}
+        )
+        if not response:
+            return None
+        posts = self.parse_response(response)
+        if posts is None:
+            print(f"⚠️ Short-form batch for {figure_name} was not valid JSON")
+            return None
+
+        results = {}
+        for label, generator in self.generators.items():
+            post = posts.get(SHORT_FORM_KEYS[label])
+            if post is not None and label in output_paths:
+                content = generator.format_content(figure_name, post)
+                results[label] = self.client.save_to_file(content, output_paths[label])
+        return results
+
+
+class ShortFormBatch:
+    """
+    Runs one ShortFormBatchGenerator call on first use and hands each
+    platform job its share; missing or unparsable parts use the fallback
+    per-platform job instead.
+    """
+
+    def __init__(self, generator: ShortFormBatchGenerator, figure_name: str,
+                 source_text: str, output_paths: Dict[str, Path]):
+        self.generator = generator
+        self.figure_name = figure_name
+        self.source_text = source_text
+        self.output_paths = output_paths
+        self._lock = threading.Lock()
+        self._results: Optional[Dict[str, bool]] = None
+
+    def result(self, label: str, fallback: Callable[[], bool]) -> bool:
+        with self._lock:
+            if self._results is None:
+                self._results = self.generator.generate_posts(
+                    self.figure_name, self.source_text, self.output_paths
+                ) or {}
+        if label in self._results:
+            return self._results[label]
+        print(f"↩️ {label}: falling back to a dedicated request")
+        return fallback()
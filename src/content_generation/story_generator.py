@@ -1,13 +1,21 @@
 from pathlib import Path
 from typing import Optional
 from .openai_client import OpenAIClient
+from .token_budget import completion_budget, fit_to_tokens
 
 class LegacyStoryGenerator:
+    TEMPLATE_VERSION = 1  # Bump when the prompt template changes
+    MODEL = "gpt-4o-mini-2024-07-18"
+    TARGET_WORDS = 900  # Longest output the prompt asks for
+    SOURCE_TOKENS = 750  # Source excerpt budget in the prompt
+    MAX_TOKENS = completion_budget(TARGET_WORDS)
+    TEMPERATURE = 0.7
+
     def __init__(self, client: OpenAIClient):
         self.client = client
 
-    def generate_story(self, figure_name: str, source_text: str, output_path: Path) -> bool:
-        prompt = f"""Write a compelling historical narrative about {figure_name} structured as follows:
+    def build_prompt(self, figure_name: str, source_text: str) -> str:
+        return f"""Write a compelling historical narrative about {figure_name} structured as follows:
 
 1. THE HOOK (1 paragraph):
 Begin with a dramatic moment that captures {figure_name}'s essence
@@ -32,21 +40,25 @@ Maintain these stylistic elements:
 - Theme of perseverance
 
 Source Material:
-{source_text[:3000]}"""
-
-        response = self.client.generate_content(
-            prompt=prompt,
-            model="gpt-4o-mini-2024-07-18",
-            max_tokens=1200,
-            temperature=0.7
-        )
+{fit_to_tokens(source_text, self.SOURCE_TOKENS, self.MODEL)}"""
 
-        if response:
-            structured_content = f"""HISTORICAL NARRATIVE: {figure_name}
+    def format_content(self, figure_name: str, response: str) -> str:
+        return f"""HISTORICAL NARRATIVE: {figure_name}
             
 {response}
 
 ---            
 This story was generated from verified historical sources."""
-            return self.client.save_to_file(structured_content, output_path)
-        return False
+
+    def generate_story(self, figure_name: str, source_text: str, output_path: Path) -> bool:
+        prompt = self.build_prompt(figure_name, source_text)
+
+        # Long-form output is streamed to disk as it is generated
+        return self.client.stream_to_file(
+            prompt=prompt,
+            output_path=output_path,
+            format_content=lambda response: self.format_content(figure_name, response),
+            model=self.MODEL,
+            max_tokens=self.MAX_TOKENS,
+            temperature=self.TEMPERATURE
+        )
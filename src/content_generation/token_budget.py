@@ -0,0 +1,133 @@
+import math
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+# Heuristic used when tiktoken is not installed (English prose averages ~4 chars/token)
+CHARS_PER_TOKEN = 4
+TOKENS_PER_WORD = 1.35
+COMPLETION_HEADROOM = 1.2   # Room above the target length so outputs are not cut off
+# Emoji and hashtags take several tokens each, so short social posts get more room
+SHORT_POST_HEADROOM = 1.6
+MESSAGE_OVERHEAD = 4        # Chat framing tokens per message
+REPLY_PRIMING = 3           # Tokens that prime the assistant reply
+
+CONTEXT_WINDOWS = {
+    "gpt-4": 8192,
+    "gpt-4o": 128000,
+    "gpt-4o-mini-2024-07-18": 128000,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+SENTENCE_END = re.compile(r'[.!?]["”’)\]]?(?=\s)')
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    """tiktoken encoding for the model, or None to use the character heuristic"""
+    try:
+        import tiktoken  # Optional: exact counts when installed
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def tokenizer_name(model: str) -> str:
+    encoding = _encoding(model)
+    return f"tiktoken:{encoding.name}" if encoding is not None else "heuristic"
+
+
+def count_tokens(text: str, model: str) -> int:
+    encoding = _encoding(model)
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def message_tokens(messages: List[Dict], model: str) -> int:
+    """Prompt tokens of a chat request, including per-message framing"""
+    return sum(count_tokens(str(m.get("content", "")), model) + MESSAGE_OVERHEAD for m in messages) + REPLY_PRIMING
+
+
+def fit_to_tokens(text: str, max_tokens: int, model: str) -> str:
+    """
+    Longest prefix of `text` within `max_tokens`, cut back to the last
+    sentence end (or word) so excerpts do not stop mid-sentence
+    """
+    if len(text) <= max_tokens:
+        return text  # A token is never shorter than one character
+    encoding = _encoding(model)
+    if encoding is None:
+        if len(text) <= max_tokens * CHARS_PER_TOKEN:
+            return text
+        cut = text[:max_tokens * CHARS_PER_TOKEN]
+    else:
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        cut = encoding.decode(tokens[:max_tokens])
+
+    sentence_ends = [m.end() for m in SENTENCE_END.finditer(cut)]
+    if sentence_ends and sentence_ends[-1] > len(cut) // 2:
+        return cut[:sentence_ends[-1]]
+    space = cut.rfind(" ")
+    return cut[:space] if space > len(cut) // 2 else cut
+
+
+def completion_budget(target_words: int, headroom: float = COMPLETION_HEADROOM) -> int:
+    """max_tokens for an output whose target length is `target_words` words"""
+    return math.ceil(target_words * TOKENS_PER_WORD * headroom)
+
+
+def fit_max_tokens(model: str, messages: List[Dict], max_tokens: Optional[int]) -> Optional[int]:
+    """
+    Clamp max_tokens so prompt + completion fit the model's context window
+    Raises ValueError if the prompt alone does not fit (retrying cannot help).
+    """
+    available = CONTEXT_WINDOWS.get(model, DEFAULT_CONTEXT_WINDOW) - message_tokens(messages, model)
+    if available <= 0:
+        raise ValueError(f"Prompt exceeds the {model} context window by {-available} tokens")
+    if max_tokens is None:
+        return None
+    return min(max_tokens, available)
+
+
+def estimate_spend(generators: Iterable, figure_count: int, prices: Dict[str, Dict[str, float]],
+                   repair_prompt: Optional[str] = None) -> Dict:
+    """
+    Upper-bound token spend for a run: every output of every figure with a
+    full source excerpt and a completion of max_tokens
+    repair_prompt (the fix-up prompt without its draft) adds one repair call
+    per output, sending a max_tokens draft and getting one back.
+    Returns per-model and total prompt/completion tokens and cost in USD
+    """
+    models: Dict[str, Dict] = {}
+    for generator in generators:
+        prompt = generator.build_prompt("Figure Name", "")
+        prompt_tokens = message_tokens([{"role": "user", "content": prompt}], generator.MODEL)
+        prompt_tokens += getattr(generator, "SOURCE_TOKENS", 0)
+        calls, completion_tokens = 1, generator.MAX_TOKENS
+        if repair_prompt is not None:
+            calls += 1
+            prompt_tokens += message_tokens([{"role": "user", "content": repair_prompt}], generator.MODEL)
+            prompt_tokens += generator.MAX_TOKENS
+            completion_tokens += generator.MAX_TOKENS
+        usage = models.setdefault(generator.MODEL, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0})
+        usage["calls"] += calls * figure_count
+        usage["prompt_tokens"] += prompt_tokens * figure_count
+        usage["completion_tokens"] += completion_tokens * figure_count
+
+    total = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+    for model, usage in models.items():
+        price = prices.get(model, prices.get("default", {}))
+        usage["cost_usd"] = round(
+            usage["prompt_tokens"] / 1e6 * price.get("input", 0.0)
+            + usage["completion_tokens"] / 1e6 * price.get("output", 0.0), 4
+        )
+        for key in total:
+            total[key] += usage[key]
+    total["cost_usd"] = round(total["cost_usd"], 4)
+    return {"models": models, "total": total}
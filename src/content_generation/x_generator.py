@@ -1,13 +1,20 @@
 from pathlib import Path
 from typing import Optional
 from .openai_client import OpenAIClient
+from .token_budget import completion_budget, fit_to_tokens
 
 class XPostGenerator:
+    TEMPLATE_VERSION = 1  # Bump when the prompt template changes
+    MODEL = "gpt-4"
+    TARGET_WORDS = 60  # Longest output the prompt asks for
+    SOURCE_TOKENS = 500  # Source excerpt budget in the prompt
+    MAX_TOKENS = completion_budget(TARGET_WORDS, headroom=2.0)  # Hashtags and emoji are much of a post this short
+
     def __init__(self, client: OpenAIClient):
         self.client = client
 
-    def generate_post(self, figure_name: str, source_text: str, output_path: Path) -> bool:
-        prompt = f"""Create an X (Twitter) post about {figure_name} with:
+    def build_prompt(self, figure_name: str, source_text: str) -> str:
+        return f"""Create an X (Twitter) post about {figure_name} with:
 1. CONTENT: 1-2 concise paragraphs (240-280 characters total)
 2. HOOK: Start with an attention-grabbing statement
 3. STYLE: Conversational, use 1-2 relevant emojis
@@ -15,15 +22,21 @@ class XPostGenerator:
 5. MENTION: Include @HistoryFacts if relevant
 
 SOURCE MATERIAL:
-{source_text[:2000]}"""
+{fit_to_tokens(source_text, self.SOURCE_TOKENS, self.MODEL)}"""
+
+    def format_content(self, figure_name: str, response: str) -> str:
+        return f"🐦 X Post: {figure_name}\n\n{response}"
+
+    def generate_post(self, figure_name: str, source_text: str, output_path: Path) -> bool:
+        prompt = self.build_prompt(figure_name, source_text)
 
         response = self.client.generate_content(
             prompt=prompt,
-            model="gpt-4",
-            max_tokens=150  # Shorter for Twitter's character limit
+            model=self.MODEL,
+            max_tokens=self.MAX_TOKENS  # Shorter for Twitter's character limit
         )
 
         if response:
-            content = f"🐦 X Post: {figure_name}\n\n{response}"
+            content = self.format_content(figure_name, response)
             return self.client.save_to_file(content, output_path)
         return False
@@ -1,13 +1,20 @@
 from pathlib import Path
 from typing import Optional
 from .openai_client import OpenAIClient  # Keeping your original import
+from .token_budget import SHORT_POST_HEADROOM, completion_budget, fit_to_tokens
 
 class YouTubePostGenerator:  # Only changed the class name
+    TEMPLATE_VERSION = 1  # Bump when the prompt template changes
+    MODEL = "gpt-4o-mini-2024-07-18"
+    TARGET_WORDS = 150  # Longest output the prompt asks for
+    SOURCE_TOKENS = 500  # Source excerpt budget in the prompt
+    MAX_TOKENS = completion_budget(TARGET_WORDS, SHORT_POST_HEADROOM)
+
     def __init__(self, client: OpenAIClient):
         self.client = client  # No changes here
 
-    def generate_post(self, figure_name: str, source_text: str, output_path: Path) -> bool:
-        prompt = f"""Create a YouTube video description about {figure_name} with:
+    def build_prompt(self, figure_name: str, source_text: str) -> str:
+        return f"""Create a YouTube video description about {figure_name} with:
 1. HOOK: First line makes viewers curious (question or bold statement)
 2. DESCRIPTION: 2 short paragraphs (40-60 words each) about their impact
 3. CALL-TO-ACTION: "Like 👍 | Subscribe 🔔 | Comment below 💬"
@@ -15,15 +22,21 @@ class YouTubePostGenerator:  # Only changed the class name
 5. HASHTAGS: #{figure_name.replace(' ','')} #History #Biography
 
 SOURCE MATERIAL:
-{source_text[:2000]}"""  # Only modified the prompt instructions
+{fit_to_tokens(source_text, self.SOURCE_TOKENS, self.MODEL)}"""  # Only modified the prompt instructions
+
+    def format_content(self, figure_name: str, response: str) -> str:
+        return f"▶️ {figure_name} YouTube Description\n\n{response}"  # Changed icon only
+
+    def generate_post(self, figure_name: str, source_text: str, output_path: Path) -> bool:
+        prompt = self.build_prompt(figure_name, source_text)
 
         response = self.client.generate_content(
             prompt=prompt,
-            model="gpt-4o-mini-2024-07-18",  # Kept your original model
-            max_tokens=300  # Kept your original token limit
+            model=self.MODEL,  # Kept your original model
+            max_tokens=self.MAX_TOKENS  # Kept your original token limit
         )
 
         if response:
-            content = f"▶️ {figure_name} YouTube Description\n\n{response}"  # Changed icon only
+            content = self.format_content(figure_name, response)
             return self.client.save_to_file(content, output_path)
         return False
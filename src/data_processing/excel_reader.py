@@ -1,8 +1,8 @@
 # src/data_processing/excel_reader.py
-import pandas as pd
-from typing import List
+from typing import List, Optional
 
-def get_names_from_excel(file_path: str, column: str = "Name") -> List[str]:
-    """Read names from specified Excel column"""
-    df = pd.read_excel(file_path)
-    return df[column].dropna().tolist()
+from .input_reader import read_figures
+
+def get_names_from_excel(file_path: str, column: str = "Name", limit: Optional[int] = None) -> List[str]:
+    """Read names from specified Excel column (streamed; see input_reader.read_figures)"""
+    return [entry.name for entry in read_figures(file_path, limit=limit, column=column)]
@@ -0,0 +1,47 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CACHE_SUFFIX = ".extract.json"
+
+
+def cache_path(figure_dir: Path, pdf_path: Path) -> Path:
+    """Sidecar in the figure directory (also for local sources, which are never written to)"""
+    return figure_dir / f"{pdf_path.name}{CACHE_SUFFIX}"
+
+
+def load_extraction(figure_dir: Path, pdf_path: Path, key: Dict) -> Optional[Dict]:
+    """
+    Cached extraction of pdf_path, or None if missing or made from a
+    different PDF hash, extractor version or budget (key mismatch), or if
+    one of its extracted images has been deleted since
+    """
+    path = cache_path(figure_dir, pdf_path)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if data.get("key") != key or not isinstance(data.get("text"), str):
+        return None
+    if not all((figure_dir / image).exists() for image in data.get("images", [])):
+        return None
+    return data
+
+
+def save_extraction(figure_dir: Path, pdf_path: Path, key: Dict, text: str, page_count: int,
+                    images: List[Path], word_count: int):
+    """Write the extraction sidecar atomically"""
+    path = cache_path(figure_dir, pdf_path)
+    images = [str(Path(image).relative_to(figure_dir)) if Path(image).is_relative_to(figure_dir) else str(image)
+              for image in images]
+    data = {"key": key, "page_count": page_count, "word_count": word_count, "images": images, "text": text}
+    fd, tmp_name = tempfile.mkstemp(dir=figure_dir, prefix=f".{path.name}.", suffix=".part")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
@@ -0,0 +1,163 @@
+import csv
+import heapq
+import re
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+# Spreadsheet formats openpyxl can stream; anything else Excel-like goes through pandas
+OPENPYXL_SUFFIXES = {".xlsx", ".xlsm", ".xltx", ".xltm"}
+TEXT_SUFFIXES = {".txt", ".lst", ""}
+
+
+class FigureEntry(NamedTuple):
+    name: str
+    priority: Optional[float] = None       # Lower runs first (1 = highest); None sorts last
+    platforms: Optional[List[str]] = None  # Per-figure override of the configured platforms
+
+
+def normalize_name(value) -> Optional[str]:
+    """Trim, collapse whitespace and NFC-normalize a cell; None for blank cells"""
+    if value is None or (isinstance(value, float) and value != value):  # NaN from pandas
+        return None
+    name = re.sub(r'\s+', ' ', unicodedata.normalize("NFC", str(value))).strip()
+    return name or None
+
+
+def _parse_priority(value) -> Optional[float]:
+    try:
+        return None if value in (None, "") else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_platforms(value) -> Optional[List[str]]:
+    text = normalize_name(value)
+    if text is None:
+        return None
+    platforms = [p.strip() for p in re.split(r'[,;|]', text) if p.strip()]
+    return platforms or None
+
+
+def _header_keys(header) -> List[str]:
+    return [str(cell).strip().lower() if cell is not None else "" for cell in header]
+
+
+def _iter_xlsx(path: Path) -> Iterator[Dict]:
+    from openpyxl import load_workbook  # Only needed for spreadsheet input
+
+    # read_only streams rows from the XML instead of building the whole sheet
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        keys = _header_keys(header)
+        for row in rows:
+            yield dict(zip(keys, row))
+    finally:
+        workbook.close()
+
+
+def _iter_csv(path: Path, delimiter: str = ",") -> Iterator[Dict]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        keys = _header_keys(header)
+        for row in reader:
+            yield dict(zip(keys, row))
+
+
+def _iter_text(path: Path, column: str) -> Iterator[Dict]:
+    """One name per line; blank lines and # comments are skipped"""
+    with open(path, encoding="utf-8-sig") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield {column: line}
+
+
+def _iter_pandas(path: Path, column: str) -> Iterator[Dict]:
+    import pandas as pd  # Fallback for .xls/.ods; imported only when needed
+
+    wanted = {column, "priority", "platforms"}
+    frame = pd.read_excel(path, usecols=lambda c: str(c).strip().lower() in wanted)
+    frame.columns = _header_keys(frame.columns)
+    yield from frame.to_dict("records")
+
+
+def iter_rows(file_path: str, column: str = "Name") -> Iterator[Dict]:
+    """Stream input rows as dicts keyed by lower-cased header"""
+    path = Path(file_path)
+    suffix = path.suffix.lower()
+    if suffix in OPENPYXL_SUFFIXES:
+        return _iter_xlsx(path)
+    if suffix in (".csv", ".tsv"):
+        return _iter_csv(path, "\t" if suffix == ".tsv" else ",")
+    if suffix in TEXT_SUFFIXES:
+        return _iter_text(path, column.lower())
+    return _iter_pandas(path, column.lower())
+
+
+def read_figures(file_path: str, limit: Optional[int] = None, column: str = "Name") -> List[FigureEntry]:
+    """
+    Read up to `limit` unique figures from an XLSX, CSV/TSV or text file
+    Names are normalized and deduplicated case-insensitively (first row wins).
+    Without a priority column reading stops as soon as `limit` names are
+    found; with one, the whole file is streamed through a bounded heap and
+    the `limit` highest-priority rows are returned in priority order.
+    """
+    column = column.lower()
+    limit = None if limit is None or limit <= 0 else limit
+    rows = iter_rows(file_path, column)
+    try:
+        entries = _select_entries(rows, limit, column)
+    finally:
+        rows.close()  # Releases the workbook/file when reading stops early
+    return entries
+
+
+def _select_entries(rows: Iterator[Dict], limit: Optional[int], column: str) -> List[FigureEntry]:
+    seen = set()
+    heap: List = []  # ((-priority, -index), entry): the worst kept row is on top
+    entries: List[FigureEntry] = []
+    prioritized = False
+
+    for index, row in enumerate(rows):
+        name = normalize_name(row.get(column))
+        if name is None:
+            continue
+        key = name.casefold()
+        entry = FigureEntry(name, _parse_priority(row.get("priority")), _parse_platforms(row.get("platforms")))
+
+        if not prioritized and "priority" in row:
+            prioritized = True
+        if not prioritized:
+            if key in seen:
+                continue
+            seen.add(key)
+            entries.append(entry)
+            if limit is not None and len(entries) >= limit:
+                break
+            continue
+
+        # Priority mode: keep only the best `limit` rows seen so far, so
+        # `seen` holds just the kept names
+        if key in seen:
+            continue
+        rank = (-(entry.priority if entry.priority is not None else float("inf")), -index)
+        if limit is None or len(heap) < limit:
+            heapq.heappush(heap, (rank, entry))
+        elif rank > heap[0][0]:
+            _, evicted = heapq.heapreplace(heap, (rank, entry))
+            seen.discard(evicted.name.casefold())
+        else:
+            continue
+        seen.add(key)
+
+    if prioritized:
+        entries = [entry for _, entry in sorted(heap, reverse=True)]
+    return entries
@@ -1,32 +1,97 @@
 from pathlib import Path
+import json
+import os
+import tempfile
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import quote
 
-def download_wikipedia_pdf(figure_name: str, save_path: Path, timeout: int = 30) -> Path:
+CHUNK_SIZE = 64 * 1024
+WIKIPEDIA_PDF_URL = "https://en.wikipedia.org/api/rest_v1/page/pdf/"
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Shared pooled session so connections to Wikipedia are kept alive across figures"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def _metadata_path(pdf_path: Path) -> Path:
+    return pdf_path.with_name(pdf_path.name + ".meta.json")
+
+
+def _load_metadata(pdf_path: Path) -> dict:
+    meta_path = _metadata_path(pdf_path)
+    if not (pdf_path.exists() and meta_path.exists()):
+        return {}
+    try:
+        return json.loads(meta_path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def download_wikipedia_pdf(figure_name: str, save_path: Path, timeout: int = 30,
+                           base_url: str = WIKIPEDIA_PDF_URL) -> Path:
     """
     Downloads Wikipedia page as PDF
     Args:
         figure_name: Name of historical figure
         save_path: Directory where PDF should be saved
         timeout: Download timeout in seconds
+        base_url: PDF endpoint prefix (override to point at a mirror or local stand-in)
     Returns:
         Path to downloaded PDF file
+
+    The body is streamed to a temp file and renamed into place, and the
+    ETag/Last-Modified headers are kept next to the PDF so later runs send
+    a conditional request and reuse the file on 304 Not Modified.
     """
-    base_url = "https://en.wikipedia.org/api/rest_v1/page/pdf/"
     encoded_name = quote(figure_name)
     pdf_url = f"{base_url}{encoded_name}"
-    
+
     output_path = save_path / f"{figure_name.replace(' ', '_')}.pdf"
-    
+    metadata = _load_metadata(output_path)
+    headers = {}
+    if metadata.get("etag"):
+        headers["If-None-Match"] = metadata["etag"]
+    if metadata.get("last_modified"):
+        headers["If-Modified-Since"] = metadata["last_modified"]
+
     try:
-        response = requests.get(pdf_url, timeout=timeout)
-        response.raise_for_status()
-        
-        with open(output_path, 'wb') as f:
-            f.write(response.content)
-            
+        with get_session().get(pdf_url, headers=headers, timeout=timeout, stream=True) as response:
+            if response.status_code == 304:
+                print(f"♻️ PDF unchanged, reusing {output_path.name}")
+                return output_path
+            response.raise_for_status()
+
+            fd, tmp_name = tempfile.mkstemp(dir=save_path, prefix=f".{output_path.name}.", suffix=".part")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        f.write(chunk)
+                os.replace(tmp_name, output_path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+
+            _metadata_path(output_path).write_text(json.dumps({
+                "url": pdf_url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }))
+
         return output_path
-        
+
     except Exception as e:
         print(f"⚠️ Failed to download PDF for {figure_name}: {str(e)}")
         raise
@@ -1,20 +1,259 @@
 import pypdf
+import hashlib
+import json
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Dict, Iterator, Optional, Tuple, List
 import logging
 
+logger = logging.getLogger(__name__)
+
+# Bump when a change alters extracted text or images, so cached extractions are redone
+EXTRACTOR_VERSION = 1
+
+
+def extractor_version() -> str:
+    """Our extraction code version plus pypdf's, whose text output can change between releases"""
+    return f"{EXTRACTOR_VERSION}/pypdf-{pypdf.__version__}"
+
+
+# Streams with these filters are complete image files and are written as-is
+PASSTHROUGH_FILTERS = {'/DCTDecode': '.jpg', '/JPXDecode': '.jp2'}
+
+
+def _image_filters(image) -> List[str]:
+    filters = image.get('/Filter')
+    if filters is None:
+        return []
+    if isinstance(filters, list):
+        return [str(f) for f in filters]
+    return [str(filters)]
+
+
+def _raw_stream_bytes(image) -> bytes:
+    """
+    Bytes to size-check and hash an image by: the still-encoded stream when
+    pypdf exposes it, which skips decoding, else the public get_data()
+    """
+    if isinstance(image, pypdf.generic.EncodedStreamObject):
+        # pypdf has no public accessor for encoded data; `_data` is private and may change
+        raw = getattr(image, '_data', None)
+        if isinstance(raw, bytes):
+            return raw
+    return image.get_data()
+
+
+def _page_text(page, index: int) -> str:
+    """Extract the text of the page at zero-based `index`"""
+    return page.extract_text() or f"<Page {index+1} contains no extractable text>"
+
+
+def _extract_page_range(pdf_path: Path, start: int, end: int) -> List[str]:
+    """Process-pool worker: each worker opens its own reader and handles pages [start, end)"""
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = pypdf.PdfReader(file)
+        return [_page_text(pdf_reader.pages[i], i) for i in range(start, end)]
+
+
 class PDFProcessor:
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
+    def __init__(self, parallel: bool = False, max_workers: Optional[int] = None,
+                 min_parallel_pages: int = 8, min_image_bytes: int = 2048):
+        """
+        Args:
+            parallel: Distribute pages across a process pool
+            max_workers: Pool size (defaults to the CPU count)
+            min_parallel_pages: PDFs with fewer pages are processed serially,
+                where pool overhead would dominate
+            min_image_bytes: Skip images whose encoded stream is smaller than this
+        """
+        self.logger = logger
+        self.min_image_bytes = min_image_bytes
+        # sha256 of raw image stream -> stored file, shared across every PDF in the run
+        self._stored_images: Dict[str, Path] = {}
+        self._images_lock = threading.Lock()
+        self.parallel = parallel
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_parallel_pages = min_parallel_pages
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Create the process pool once and reuse it for every PDF in the run"""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def _extract_parallel(self, pdf_path: Path, page_count: int) -> List[str]:
+        """Split pages into contiguous ranges and reassemble text in page order"""
+        pool = self._get_pool()
+        chunk = max(1, -(-page_count // (self.max_workers * 2)))
+        futures = [
+            pool.submit(_extract_page_range, pdf_path, start, min(start + chunk, page_count))
+            for start in range(0, page_count, chunk)
+        ]
+        pages = []
+        for future in futures:
+            pages.extend(future.result())
+        return pages
+
+    def _iter_parallel(self, pdf_path: Path, page_count: int) -> Iterator[str]:
+        """Page text in order, with at most max_workers page ranges read ahead in the pool"""
+        pool = self._get_pool()
+        chunk = max(1, -(-page_count // (self.max_workers * 2)))
+        starts = iter(range(0, page_count, chunk))
+        pending = deque()
+
+        def submit_next():
+            start = next(starts, None)
+            if start is not None:
+                pending.append(pool.submit(_extract_page_range, pdf_path, start, min(start + chunk, page_count)))
+
+        for _ in range(self.max_workers):
+            submit_next()
+        try:
+            while pending:
+                pages = pending.popleft().result()
+                submit_next()
+                yield from pages
+        finally:
+            for future in pending:
+                future.cancel()  # The consumer stopped early: skip ranges not yet started
+
+    def iter_page_text(self, pdf_path: Path) -> Iterator[str]:
+        """
+        Lazily yield page text in order; stop iterating to skip the remaining pages
+        With parallel set, PDFs of min_parallel_pages or more are read ahead by
+        the process pool, so budgeted extraction is parallel too.
+        """
+        with open(pdf_path, 'rb') as file:
+            pdf_reader = pypdf.PdfReader(file)
+            page_count = len(pdf_reader.pages)
+            if not (self.parallel and page_count >= self.min_parallel_pages):
+                for i, page in enumerate(pdf_reader.pages):
+                    yield _page_text(page, i)
+                return
+        yield from self._iter_parallel(pdf_path, page_count)
+
+    def extract_text(self, pdf_path: Path, max_chars: Optional[int] = None,
+                     max_words: Optional[int] = None) -> Tuple[Optional[str], int]:
+        """
+        Extract text only, stopping once both budgets are met
+
+        Args:
+            pdf_path: Path to the PDF file
+            max_chars: Stop after collecting at least this many characters
+            max_words: ...and at least this many words (None = no limit)
+
+        Returns:
+            Tuple containing (extracted_text, pages_read)
+            Returns (None, pages_read) if extraction fails
+        """
+        text_parts = []
+        char_count = word_count = pages_read = 0
+        try:
+            for page_text in self.iter_page_text(pdf_path):
+                text_parts.append(page_text)
+                pages_read += 1
+                char_count += len(page_text) + 1
+                word_count += len(page_text.split())
+                if (max_chars is not None or max_words is not None) \
+                        and char_count >= (max_chars or 0) and word_count >= (max_words or 0):
+                    break
+            self.logger.info(f"Read {pages_read} pages of {pdf_path.name} ({char_count} chars)")
+            return "\n".join(text_parts), pages_read
+        except pypdf.PdfException as e:
+            self.logger.error(f"PDF processing error for {pdf_path.name}: {e}")
+        except Exception as e:
+            self.logger.error(f"Unexpected error processing {pdf_path.name}: {e}")
+        return None, pages_read
+
+    def _store_image(self, image, name: str, page, pdf_stem: str, pics_dir: Path) -> Tuple[Optional[Path], bool]:
+        """
+        Store one image XObject, deduplicated by the hash of its raw stream
+        Returns (stored_path, newly_written); stored_path is None for skipped images
+        """
+        raw = _raw_stream_bytes(image)
+        if len(raw) < self.min_image_bytes:
+            return None, False
+
+        digest = hashlib.sha256(raw).hexdigest()
+        with self._images_lock:
+            existing = self._stored_images.get(digest)
+        if existing is not None and existing.exists():
+            return existing, False
+
+        filters = _image_filters(image)
+        if len(filters) == 1 and filters[0] in PASSTHROUGH_FILTERS:
+            # JPEG/JPEG 2000 streams are already image files: no decode needed
+            ext, data = PASSTHROUGH_FILTERS[filters[0]], raw
+        else:
+            # Everything else is decoded and re-encoded (PNG for FlateDecode) by pypdf
+            image_file = page.images[name]
+            ext, data = Path(image_file.name).suffix or '.img', image_file.data
+
+        image_path = pics_dir / f"{pdf_stem}_{digest[:16]}{ext}"
+        with open(image_path, 'wb') as img_file:
+            img_file.write(data)
+        with self._images_lock:
+            self._stored_images[digest] = image_path
+        self.logger.info(f"Saved image: {image_path}")
+        return image_path, True
+
+    def extract_images(self, pdf_path: Path, output_dir: Path) -> List[Path]:
+        """
+        Separate image pass: save each distinct image once to output_dir/extracted_pics
+        and write image_index.json mapping page number -> stored image paths.
+        Returns the images newly written for this PDF.
+        """
+        saved_images = []
+        index: Dict[str, List[str]] = {}
+        try:
+            pics_dir = output_dir / "extracted_pics"
+            pics_dir.mkdir(exist_ok=True)
+            with open(pdf_path, 'rb') as file:
+                pdf_reader = pypdf.PdfReader(file)
+                for i, page in enumerate(pdf_reader.pages):
+                    resources = page.get('/Resources')
+                    if resources is None or '/XObject' not in resources:
+                        continue
+                    x_object = resources['/XObject'].get_object()
+                    for name in x_object:
+                        image = x_object[name].get_object()
+                        if image.get('/Subtype') != '/Image':
+                            continue
+                        try:
+                            image_path, is_new = self._store_image(image, name, page, pdf_path.stem, pics_dir)
+                        except Exception as img_e:
+                            self.logger.error(f"Failed to extract image: {img_e}")
+                            continue
+                        if image_path is None:
+                            continue
+                        index.setdefault(str(i + 1), []).append(str(image_path))
+                        if is_new:
+                            saved_images.append(image_path)
+            (pics_dir / "image_index.json").write_text(json.dumps(index, indent=2))
+        except Exception as e:
+            self.logger.error(f"Image extraction failed for {pdf_path.name}: {e}")
+        return saved_images
 
     def extract_content(self, pdf_path: Path, output_dir: Path) -> Tuple[Optional[str], int, List[Path]]:
         """
         Extracts text and images from a PDF file
-        
+
         Args:
             pdf_path: Path to the PDF file
             output_dir: Directory where extracted content should be saved
-            
+
         Returns:
             Tuple containing (extracted_text, page_count, saved_image_paths)
             Returns (None, 0, []) if extraction fails
@@ -25,59 +264,20 @@ class PDFProcessor:
             with open(pdf_path, 'rb') as file:
                 pdf_reader = pypdf.PdfReader(file)
                 page_count = len(pdf_reader.pages)
-                text_parts = []
-                
-                # Create extracted_pics directory if it doesn't exist
-                pics_dir = output_dir / "extracted_pics"
-                pics_dir.mkdir(exist_ok=True)
-                
-                for i, page in enumerate(pdf_reader.pages):
-                    # Extract text
-                    page_text = page.extract_text() or f"<Page {i+1} contains no extractable text>"
-                    text_parts.append(page_text)
-                    
-                    # Extract images
-                    if '/XObject' in page['/Resources']:
-                        x_object = page['/Resources']['/XObject'].get_object()
-                        
-                        for obj in x_object:
-                            if x_object[obj]['/Subtype'] == '/Image':
-                                image = x_object[obj]
-                                try:
-                                    image_data = image.get_data()
-                                    
-                                    # Determine image extension
-                                    if '/Filter' in image:
-                                        if image['/Filter'] == '/FlateDecode':
-                                            ext = '.png'
-                                        elif image['/Filter'] == '/DCTDecode':
-                                            ext = '.jpg'
-                                        elif image['/Filter'] == '/JPXDecode':
-                                            ext = '.jp2'
-                                        else:
-                                            ext = '.img'
-                                    else:
-                                        ext = '.img'
-                                    
-                                    # Save image directly to extracted_pics folder
-                                    image_name = f"{pdf_path.stem}_page{i+1}_{obj[1:]}{ext}"
-                                    image_path = pics_dir / image_name
-                                    
-                                    with open(image_path, 'wb') as img_file:
-                                        img_file.write(image_data)
-                                    
-                                    saved_images.append(image_path)
-                                    self.logger.info(f"Saved image: {image_path}")
-                                except Exception as img_e:
-                                    self.logger.error(f"Failed to extract image: {img_e}")
-                
-                text = "\n".join(text_parts)
-                self.logger.info(f"Successfully processed {pdf_path.name}, pages: {page_count}, images saved: {len(saved_images)}")
-                return text, page_count, saved_images
-                
+
+                if self.parallel and page_count >= self.min_parallel_pages:
+                    text_parts = self._extract_parallel(pdf_path, page_count)
+                else:
+                    text_parts = [_page_text(page, i) for i, page in enumerate(pdf_reader.pages)]
+
+            saved_images = self.extract_images(pdf_path, output_dir)
+            text = "\n".join(text_parts)
+            self.logger.info(f"Successfully processed {pdf_path.name}, pages: {page_count}, images saved: {len(saved_images)}")
+            return text, page_count, saved_images
+
         except pypdf.PdfException as e:
             self.logger.error(f"PDF processing error for {pdf_path.name}: {e}")
         except Exception as e:
             self.logger.error(f"Unexpected error processing {pdf_path.name}: {e}")
-            
+
         return None, page_count, saved_images
@@ -0,0 +1,146 @@
+import csv
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# Row layout of the results table, in insert order
+RESULT_COLUMNS = (
+    "figure", "output", "platform", "model", "status", "prompt_tokens", "completion_tokens",
+    "api_calls", "duration_s", "finished", "output_path", "content", "error",
+)
+STATUSES = ("success", "failed", "ineligible")
+
+
+class ResultStore:
+    """
+    Indexed SQLite copy of every generated output, one row per (figure, output).
+
+    Rows are buffered and written in one transaction per `batch_size` rows
+    (or every `flush_seconds`), so recording a result costs a list append
+    on the generation threads. A regenerated output replaces its row.
+    Downstream jobs can query the database instead of walking the tree.
+    """
+
+    def __init__(self, path: Path, batch_size: int = 100, flush_seconds: float = 5.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self._pending: List[tuple] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=60, check_same_thread=False)
+        # WAL lets readers query while a run (or several queue workers) write
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS results (
+                figure TEXT NOT NULL,
+                output TEXT NOT NULL,
+                platform TEXT NOT NULL,
+                model TEXT,
+                status TEXT NOT NULL,
+                prompt_tokens INTEGER NOT NULL DEFAULT 0,
+                completion_tokens INTEGER NOT NULL DEFAULT 0,
+                api_calls INTEGER NOT NULL DEFAULT 0,
+                duration_s REAL,
+                finished REAL NOT NULL,
+                output_path TEXT,
+                content TEXT,
+                error TEXT,
+                PRIMARY KEY (figure, output)
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_platform_status ON results(platform, status)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_status ON results(status)")
+        self._conn.commit()
+
+    def record(self, figure: str, output: str, platform: str, status: str,
+               model: Optional[str] = None, prompt_tokens: int = 0, completion_tokens: int = 0,
+               api_calls: int = 0, duration_s: Optional[float] = None, output_path: Optional[Path] = None,
+               content: Optional[str] = None, error: Optional[str] = None):
+        row = (figure, output, platform, model, status, prompt_tokens, completion_tokens, api_calls,
+               duration_s, time.time(), str(output_path) if output_path else None, content, error)
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_seconds:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        placeholders = ", ".join("?" for _ in RESULT_COLUMNS)
+        with self._conn:  # One transaction per batch
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO results ({', '.join(RESULT_COLUMNS)}) VALUES ({placeholders})", rows
+            )
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._conn.close()
+
+    def query(self, figure: Optional[str] = None, platform: Optional[str] = None,
+              status: Optional[str] = None, include_content: bool = False,
+              limit: Optional[int] = None) -> Iterator[Dict]:
+        """Stream matching rows (pending ones included) ordered by figure and output"""
+        self.flush()
+        columns = [c for c in RESULT_COLUMNS if include_content or c != "content"]
+        where, params = [], []
+        for column, value in (("figure", figure), ("status", status)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if platform is not None:
+            # Matches a platform ("YouTube") or one output label ("YouTube Story")
+            where.append("(platform = ? COLLATE NOCASE OR output = ? COLLATE NOCASE)")
+            params.extend([platform, platform])
+        sql = f"SELECT {', '.join(columns)} FROM results"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY figure, output"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        for row in rows:
+            yield dict(zip(columns, row))
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """platform -> status -> output count"""
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT platform, status, COUNT(*) FROM results GROUP BY platform, status ORDER BY platform"
+            ).fetchall()
+        summary: Dict[str, Dict[str, int]] = {}
+        for platform, status, count in rows:
+            summary.setdefault(platform, {})[status] = count
+        return summary
+
+    def export(self, path: Path, rows: Iterator[Dict]) -> int:
+        """Write rows as JSON Lines, or CSV for a .csv path; returns the row count"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        count = 0
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = None
+            for row in rows:
+                if path.suffix.lower() == ".csv":
+                    if writer is None:
+                        writer = csv.DictWriter(f, fieldnames=list(row))
+                        writer.writeheader()
+                    writer.writerow(row)
+                else:
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+                count += 1
+        return count
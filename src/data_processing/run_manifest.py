@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+MANIFEST_NAME = "manifest.json"
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Hash a file without loading it into memory"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class RunManifest:
+    """
+    Per-figure record of what was generated and from which inputs.
+
+    Stored as `manifest.json` in the figure directory and rewritten
+    atomically after every update, so an interrupted run leaves an
+    accurate record of the outputs that completed.
+    """
+
+    def __init__(self, figure_dir: Path):
+        self.path = figure_dir / MANIFEST_NAME
+        self._lock = threading.Lock()
+        self.data: Dict = {"source": {}, "outputs": {}}
+        if self.path.exists():
+            try:
+                self.data = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                print(f"⚠️ Ignoring unreadable manifest: {self.path}")
+        self.data.setdefault("source", {})
+        self.data.setdefault("outputs", {})
+        self.source_hash: Optional[str] = None
+
+    def set_source_pdf(self, pdf_path: Path):
+        """Hash the input PDF; outputs recorded against an older hash become stale"""
+        self.source_hash = file_sha256(pdf_path)
+
+    @property
+    def source_unchanged(self) -> bool:
+        return self.source_hash is not None and self.data["source"].get("pdf_sha256") == self.source_hash
+
+    @property
+    def word_count(self) -> Optional[int]:
+        return self.data["source"].get("word_count") if self.source_unchanged else None
+
+    def record_source(self, word_count: int):
+        with self._lock:
+            self.data["source"] = {"pdf_sha256": self.source_hash, "word_count": word_count}
+            self._save()
+
+    def fingerprint(self, params: Dict) -> str:
+        """Hash the input PDF together with template/model/parameters of one output"""
+        payload = json.dumps({"pdf_sha256": self.source_hash, **params}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def is_fresh(self, label: str, fingerprint: str, output_path: Path) -> bool:
+        """True if `label` already succeeded from identical inputs and its file still exists"""
+        entry = self.data["outputs"].get(label)
+        return (
+            entry is not None
+            and entry.get("status") == "success"
+            and entry.get("fingerprint") == fingerprint
+            and output_path.exists()
+        )
+
+    def record(self, label: str, fingerprint: str, params: Dict, success: bool,
+               started: float, finished: float):
+        with self._lock:
+            self.data["outputs"][label] = {
+                "fingerprint": fingerprint,
+                "pdf_sha256": self.source_hash,
+                **params,
+                "status": "success" if success else "failed",
+                "started_at": started,
+                "duration_s": round(finished - started, 3),
+            }
+            self._save()
+
+    def _save(self):
+        """Write to a temp file and rename so a crash never leaves half a manifest"""
+        tmp_path = self.path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(self.data, indent=2, sort_keys=True))
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,168 @@
+import html
+import os
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
+from .pdf_downloader import WIKIPEDIA_PDF_URL, download_wikipedia_pdf, get_session
+
+WIKIPEDIA_API_URL = "https://en.wikipedia.org/w/api.php"
+TEXT_SUFFIXES = (".txt", ".md")
+HTML_SUFFIXES = (".html", ".htm")
+# Order in which the local backend looks for a figure's file
+LOCAL_SUFFIXES = TEXT_SUFFIXES + HTML_SUFFIXES + (".pdf",)
+
+
+class SourceBackend(ABC):
+    """
+    Fetches a figure's source document into its output folder.
+
+    fetch() returns the path of the saved document; FigureProcessor reads
+    PDFs with PDFProcessor and everything else with read_source_text(),
+    so generators always receive plain text whichever backend is used.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def fetch(self, figure_name: str, figure_dir: Path) -> Path:
+        """Save the figure's document under figure_dir and return its path"""
+
+
+class PdfSource(SourceBackend):
+    """Wikipedia's rendered PDF (the original behaviour; also yields images)"""
+
+    name = "pdf"
+
+    def __init__(self, timeout: int = 30, base_url: str = WIKIPEDIA_PDF_URL):
+        self.timeout = timeout
+        self.base_url = base_url
+
+    def fetch(self, figure_name: str, figure_dir: Path) -> Path:
+        return download_wikipedia_pdf(
+            figure_name=figure_name,
+            save_path=figure_dir,
+            timeout=self.timeout,
+            base_url=self.base_url
+        )
+
+
+class WikipediaTextSource(SourceBackend):
+    """
+    Plaintext article extract from the MediaWiki action API
+    (prop=extracts&explaintext), already free of markup, so there is no
+    PDF to render, download or parse. No images are extracted.
+    """
+
+    name = "wikipedia_text"
+
+    def __init__(self, timeout: int = 30, api_url: str = WIKIPEDIA_API_URL):
+        self.timeout = timeout
+        self.api_url = api_url
+
+    def fetch(self, figure_name: str, figure_dir: Path) -> Path:
+        params = {
+            "action": "query",
+            "prop": "extracts",
+            "explaintext": 1,
+            "exsectionformat": "plain",
+            "redirects": 1,
+            "titles": figure_name,
+            "format": "json",
+            "formatversion": 2,
+        }
+        try:
+            response = get_session().get(self.api_url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            pages = response.json().get("query", {}).get("pages", [])
+            extract = pages[0].get("extract", "") if pages and not pages[0].get("missing") else ""
+            if not extract.strip():
+                raise ValueError(f"No Wikipedia article text for '{figure_name}'")
+        except Exception as e:
+            print(f"⚠️ Failed to fetch article text for {figure_name}: {str(e)}")
+            raise
+
+        output_path = figure_dir / f"{figure_name.replace(' ', '_')}.txt"
+        if output_path.exists() and output_path.read_text(encoding="utf-8") == extract:
+            print(f"♻️ Article text unchanged, reusing {output_path.name}")
+            return output_path
+        fd, tmp_name = tempfile.mkstemp(dir=figure_dir, prefix=f".{output_path.name}.", suffix=".part")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(extract)
+            os.replace(tmp_name, output_path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return output_path
+
+
+class LocalDirectorySource(SourceBackend):
+    """
+    Pre-fetched documents in a local directory, for offline runs and fixtures
+    Looks for "<Name>" or "<Name_with_underscores>" with a .txt, .md, .html
+    or .pdf suffix and uses the file in place.
+    """
+
+    name = "local"
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def fetch(self, figure_name: str, figure_dir: Path) -> Path:
+        for stem in dict.fromkeys((figure_name, figure_name.replace(" ", "_"))):
+            for suffix in LOCAL_SUFFIXES:
+                candidate = self.directory / f"{stem}{suffix}"
+                if candidate.is_file():
+                    return candidate
+        raise FileNotFoundError(f"No source file for '{figure_name}' in {self.directory}")
+
+
+def is_pdf(path: Path) -> bool:
+    return path.suffix.lower() == ".pdf"
+
+
+def html_to_text(markup: str) -> str:
+    """Drop scripts, styles and tags from an HTML page, keeping block breaks"""
+    markup = re.sub(r'(?is)<(script|style|noscript)\b.*?</\1>', ' ', markup)
+    markup = re.sub(r'(?i)<(br|/p|/div|/h[1-6]|/li|/tr)\b[^>]*>', '\n', markup)
+    text = html.unescape(re.sub(r'<[^>]+>', ' ', markup))
+    text = re.sub(r' *\n *', '\n', re.sub(r'[ \t\r\f\v]+', ' ', text))
+    return re.sub(r'\n\s*\n+', '\n\n', text).strip()
+
+
+def read_source_text(path: Path, max_chars: Optional[int] = None, max_words: Optional[int] = None) -> str:
+    """
+    Plain text of a .txt/.md/.html source
+    Like PDFProcessor.extract_text, plain text is read line by line and
+    reading stops once both max_chars and max_words are met.
+    """
+    if path.suffix.lower() in HTML_SUFFIXES:
+        return html_to_text(path.read_text(encoding="utf-8", errors="replace"))
+    if max_chars is None and max_words is None:
+        return path.read_text(encoding="utf-8", errors="replace")
+    lines = []
+    char_count = word_count = 0
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            lines.append(line)
+            char_count += len(line)
+            word_count += len(line.split())
+            if char_count >= (max_chars or 0) and word_count >= (max_words or 0):
+                break
+    return "".join(lines)
+
+
+def create_source_backend(config_manager) -> SourceBackend:
+    """The backend selected by source.backend in the config"""
+    settings = config_manager.get_source_settings()
+    backend = settings["backend"]
+    if backend == PdfSource.name:
+        return PdfSource(config_manager.get_timeout(), config_manager.get_wikipedia_pdf_url())
+    if backend == WikipediaTextSource.name:
+        return WikipediaTextSource(config_manager.get_timeout(), settings["wikipedia_api_url"])
+    if backend == LocalDirectorySource.name:
+        return LocalDirectorySource(Path(settings["local_dir"]))
+    raise ValueError(f"Unknown source backend '{backend}' (expected pdf, wikipedia_text or local)")
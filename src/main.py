@@ -3,6 +3,7 @@
 Social Media Content Generator - Modular Version
 """
 
+import argparse
 import sys
 import os
 from pathlib import Path
@@ -13,43 +14,151 @@ sys.path.append(str(project_root))
 
 from src.config.config_manager import ConfigManager
 from src.processing.figure_processor import FigureProcessor
-from src.data_processing.excel_reader import get_names_from_excel
-from src.content_generation.openai_client import OpenAIClient
+from src.processing.pipeline import PipelineExecutor
+from src.processing.batch_runner import BatchRunner
+from src.data_processing.input_reader import read_figures
+from src.content_generation.openai_client import create_client
+from src.processing.queue_worker import QueueWorker, open_job_queue, run_worker_processes
+from src.utils.metrics import RunMetrics
 
-def main():
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Social Media Content Generator")
+    parser.add_argument("--config", help="JSON file of settings overriding the defaults")
+    parser.add_argument("--force", action="store_true",
+                        help="Regenerate every output even if the run manifest says it is up to date")
+    parser.add_argument("--parallel-extract", action="store_true",
+                        help="Extract PDF pages in parallel across a process pool")
+    parser.add_argument("--batch", action="store_true",
+                        help="Submit all prompts through the OpenAI Batch API (resumes an unfinished batch)")
+    parser.add_argument("--estimate-only", action="store_true",
+                        help="Print the estimated token spend for the run and exit")
+    parser.add_argument("--max-spend", type=float,
+                        help="Abort before starting if the estimated cost in USD is higher")
+    parser.add_argument("--enqueue", action="store_true",
+                        help="Add the input names to the SQLite job queue (see job_queue in the config)")
+    parser.add_argument("--worker", action="store_true",
+                        help="Process queued jobs in this process until the queue is drained")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Start N worker processes on the job queue and wait for them")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="Give failed queue jobs another set of attempts")
+    return parser.parse_args(argv)
+
+def run_queue_mode(args: argparse.Namespace, config_manager: ConfigManager, client, metrics: RunMetrics) -> int:
+    """Enqueue names and/or work the job queue; returns the process exit code"""
+    queue = open_job_queue(config_manager)
+    if args.retry_failed:
+        print(f"🔁 Reset {queue.retry_failed()} failed jobs")
+    if args.enqueue:
+        entries = read_figures(config_manager.get_input_file(), limit=config_manager.get_max_figures())
+        added = queue.enqueue([{"name": entry.name, "platforms": entry.platforms} for entry in entries])
+        print(f"📥 Enqueued {added} figures ({len(entries) - added} already queued) in {queue.path}")
+
+    if args.workers:
+        print(f"👷 Starting {args.workers} worker processes")
+        run_worker_processes(config_manager.config, args.workers)
+    elif args.worker:
+        figure_processor = FigureProcessor(config_manager, metrics=metrics)
+        QueueWorker(figure_processor, config_manager, queue, client).run()
+        figure_processor.close()
+
+    outcomes = queue.figure_outcomes()
+    print("\n" + "="*50)
+    for stage, statuses in queue.counts().items():
+        print(f"📋 {stage}: " + ", ".join(f"{count} {status}" for status, count in sorted(statuses.items())))
+    print(f"✅ Successful: {sum(outcomes.values())}/{len(outcomes)} figures")
+    queue.close()
+    if not (args.worker or args.workers):
+        return 0
+    return 0 if all(outcomes.values()) else 1
+
+def main(argv=None):
     """Main execution function"""
+    args = parse_args(argv)
     try:
-        config_manager = ConfigManager()
+        config_manager = ConfigManager.from_file(args.config) if args.config else ConfigManager()
+        if args.force:
+            config_manager.config = {**config_manager.config, "force": True}
+        if args.parallel_extract:
+            config_manager.config = {
+                **config_manager.config,
+                "pdf_extraction": {**config_manager.get_pdf_extraction_settings(), "parallel": True}
+            }
         
         print("🚀 Social Media Content Generator")
         print(f"📌 Target Platforms: {', '.join(config_manager.get_platforms())}")
         print(f"   - YouTube: Generates both post.txt and story.txt")
         
         # Rest of your main() function remains the same...
-        # 1. Initialize OpenAI client
-        client = OpenAIClient(api_key=config_manager.get_openai_key())
+        # 1. Initialize OpenAI client (with optional response cache and shared rate limiter)
+        metrics = RunMetrics()
+        client = create_client(config_manager, metrics)
+        cache = client.cache
+
+        # Distributed mode: names go through the SQLite job queue instead
+        if args.enqueue or args.worker or args.workers or args.retry_failed:
+            return run_queue_mode(args, config_manager, client, metrics)
         
         # 2. Get names from input file
-        names = get_names_from_excel(config_manager.get_input_file())
-        if not names:
+        # Streamed: reading stops once max_figures unique names are found
+        entries = read_figures(config_manager.get_input_file(), limit=config_manager.get_max_figures())
+        if not entries:
             raise ValueError("No names found in input file")
-        names = names[:config_manager.get_max_figures()]
+        names = [entry.name for entry in entries]
         print(f"\n🧑‍🤝‍🧑 Found {len(names)} figures to process")
         print(f"🔍 First figure: {names[0]}")
 
         # 3. Process each figure
-        figure_processor = FigureProcessor(config_manager)
+        figure_processor = FigureProcessor(config_manager, metrics=metrics)
+        figure_processor.set_platform_overrides(
+            {entry.name: entry.platforms for entry in entries if entry.platforms}
+        )
+        # Estimated spend is an upper bound: full excerpts and max_tokens completions
+        budget = config_manager.get_token_budget_settings()
+        estimate = figure_processor.estimate_spend(len(names), client)["total"]
+        print(f"💰 Estimated spend: up to {estimate['calls']} calls, "
+              f"{estimate['prompt_tokens']:,} prompt + {estimate['completion_tokens']:,} completion tokens, "
+              f"~${estimate['cost_usd']:.2f}")
+        max_cost = args.max_spend if args.max_spend is not None else budget["max_run_cost_usd"]
+        if max_cost is not None and estimate["cost_usd"] > max_cost:
+            raise ValueError(f"Estimated cost ${estimate['cost_usd']:.2f} exceeds the budget of ${max_cost:.2f}")
+        max_tokens = budget["max_run_tokens"]
+        if max_tokens is not None and estimate["prompt_tokens"] + estimate["completion_tokens"] > max_tokens:
+            raise ValueError(f"Estimated {estimate['prompt_tokens'] + estimate['completion_tokens']:,} tokens "
+                             f"exceeds the budget of {max_tokens:,}")
+        if args.estimate_only:
+            figure_processor.close()
+            return 0
+
         success_count = 0
-        for i, name in enumerate(names, 1):
-            print(f"\n📌 Processing figure {i}/{len(names)}")
-            if figure_processor.process_figure(name, client):
-                success_count += 1
+        if args.batch:
+            print("📦 Batch mode: submitting prompts through the OpenAI Batch API")
+            success_count = BatchRunner(figure_processor, config_manager).run(names, client)
+        elif config_manager.is_pipeline_enabled():
+            print("🏭 Pipeline mode: overlapping download, extraction and generation across figures")
+            success_count = PipelineExecutor(figure_processor, config_manager).run(names, client)
+        else:
+            for i, name in enumerate(names, 1):
+                print(f"\n📌 Processing figure {i}/{len(names)}")
+                if figure_processor.process_figure(name, client):
+                    success_count += 1
+        figure_processor.close()
 
         # 4. Final report
         print("\n" + "="*50)
         print(f"🏁 Processing Complete")
         print(f"✅ Successful: {success_count}/{len(names)} figures")
         print(f"📂 Output Directory: {config_manager.get_output_dir().resolve()}")
+        results = config_manager.get_result_store_settings()
+        if results["enabled"]:
+            print(f"🗄️ Results database: {results['path']} (query with src/query_results.py)")
+        if cache is not None:
+            stats = cache.stats()
+            print(f"🗃️ Response cache: {stats['hits']} hits, {stats['misses']} misses, "
+                  f"{stats['entries']} entries ({stats['bytes'] / 1024:.0f} KiB)")
+        if config_manager.is_metrics_report_enabled():
+            json_path, prom_path = metrics.write_report(config_manager.get_output_dir())
+            print(f"📈 Run metrics: {json_path} (Prometheus: {prom_path.name})")
         
         return 0 if success_count == len(names) else 1
         
@@ -0,0 +1,237 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config.config_manager import ConfigManager
+from content_generation.token_budget import fit_max_tokens
+from data_processing.run_manifest import RunManifest
+from processing.figure_processor import FigureProcessor
+
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchRunner:
+    """
+    Offline bulk generation through the OpenAI Batch API.
+
+    Renders every (figure, platform) prompt with the normal generator
+    classes into a JSONL request file, submits it as one batch job, polls
+    until it finishes and writes the results into the usual output tree.
+    Progress is kept in `<work_dir>/state.json`, so an interrupted run
+    resumes polling the already-submitted batch instead of resubmitting.
+    """
+
+    def __init__(self, figure_processor: FigureProcessor, config_manager: ConfigManager):
+        self.figure_processor = figure_processor
+        self.config_manager = config_manager
+        settings = config_manager.get_batch_settings()
+        self.work_dir = Path(settings["work_dir"])
+        self.poll_interval = settings["poll_interval"]
+        self.completion_window = settings["completion_window"]
+        self.state_path = self.work_dir / "state.json"
+
+    def _load_state(self) -> Optional[Dict]:
+        if not self.state_path.exists():
+            return None
+        return json.loads(self.state_path.read_text())
+
+    def _save_state(self, state: Dict):
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(state, indent=2))
+        os.replace(tmp_path, self.state_path)
+
+    def run(self, names: List[str], client) -> int:
+        """Submit (or resume) the batch and return the number of fully successful figures"""
+        state = self._load_state()
+        if state is not None and state.get("status") != "collected" and set(state["figures"]) != set(names):
+            # The saved batch is finished first; the new list needs another run afterwards
+            print(f"⚠️ {self.state_path} holds an unfinished batch for {len(state['figures'])} other figure(s); "
+                  f"resuming it instead of the {len(names)} given. Run again once it is collected, "
+                  f"or delete the state file to start over.")
+        if state is not None and state.get("status") == "rendered":
+            print(f"♻️ Submitting previously rendered requests from {self.state_path}")
+            self.submit(state, client)
+        elif state is not None and state.get("status") != "collected":
+            print(f"♻️ Resuming batch {state.get('batch_id')} from {self.state_path}")
+        else:
+            state = self.render_requests(names, client)
+            if not state["requests"]:
+                print("⏭️ Nothing to submit, all outputs are up to date")
+                return len(names)
+            self.submit(state, client)
+
+        state = self.wait_for_completion(state, client)
+        return self.collect_results(state, client)
+
+    def render_requests(self, names: List[str], client) -> Dict:
+        """Prepare every figure and write one chat-completion request per output"""
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        requests_path = self.work_dir / "requests.jsonl"
+        state = {"status": "rendered", "figures": names, "requests": {}, "failed_figures": []}
+
+        with open(requests_path, "w") as f:
+            for name in names:
+                try:
+                    figure_dir, source_path = self.figure_processor.prepare_figure(name)
+                    manifest = self.figure_processor.open_manifest(figure_dir, source_path)
+                    extracted = self.figure_processor.extract_figure(source_path, figure_dir, manifest.source_hash)
+                    if extracted is None:
+                        state["failed_figures"].append(name)
+                        continue
+                    source_text, word_count = extracted
+                    manifest.record_source(word_count)
+                except Exception as e:
+                    print(f"⚠️ Error processing {name}: {str(e)}")
+                    state["failed_figures"].append(name)
+                    continue
+
+                force = self.config_manager.get_force_regenerate()
+                figure_failed = False
+                specs = self.figure_processor.figure_specs(figure_dir, client)
+                # Fingerprint like the synchronous run with this config, so switching modes regenerates nothing
+                batched = self.figure_processor.batched_labels(specs)
+                for label, platform, generator, _, output_path in specs:
+                    if platform != "YouTube" and not self.figure_processor.validator.check_platform_requirements(
+                            platform, word_count, self.config_manager):
+                        figure_failed = True
+                        continue
+                    fingerprint = manifest.fingerprint(
+                        self.figure_processor.generation_params(generator, label in batched))
+                    if not force and manifest.is_fresh(label, fingerprint, output_path):
+                        continue
+
+                    messages = [{"role": "user", "content": generator.build_prompt(name, source_text)}]
+                    try:
+                        # Same context-window clamp as synchronous requests
+                        max_tokens = fit_max_tokens(generator.MODEL, messages, generator.MAX_TOKENS)
+                    except ValueError as e:
+                        print(f"❌ {name} / {label}: {str(e)}")
+                        figure_failed = True
+                        continue
+                    custom_id = f"request-{len(state['requests'])}"
+                    body = {"model": generator.MODEL, "messages": messages, "max_tokens": max_tokens}
+                    if getattr(generator, "TEMPERATURE", None) is not None:
+                        body["temperature"] = generator.TEMPERATURE
+                    f.write(json.dumps({
+                        "custom_id": custom_id,
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": body,
+                    }) + "\n")
+                    state["requests"][custom_id] = {
+                        "figure": name,
+                        "label": label,
+                        "figure_dir": str(figure_dir),
+                        "source_path": str(source_path),
+                    }
+                if figure_failed:
+                    state["failed_figures"].append(name)
+
+        state["requests_file"] = str(requests_path)
+        self._save_state(state)
+        print(f"📝 Rendered {len(state['requests'])} requests to {requests_path}")
+        return state
+
+    def submit(self, state: Dict, client):
+        with open(state["requests_file"], "rb") as f:
+            input_file = client.client.files.create(file=f, purpose="batch")
+        batch = client.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window=self.completion_window
+        )
+        state.update({"status": "submitted", "input_file_id": input_file.id, "batch_id": batch.id})
+        self._save_state(state)
+        print(f"📤 Submitted batch {batch.id} ({len(state['requests'])} requests)")
+
+    def wait_for_completion(self, state: Dict, client) -> Dict:
+        while True:
+            batch = client.client.batches.retrieve(state["batch_id"])
+            counts = getattr(batch, "request_counts", None)
+            if counts is not None:
+                print(f"⏳ Batch {batch.id}: {batch.status} "
+                      f"({counts.completed}/{counts.total} done, {counts.failed} failed)")
+            if batch.status in TERMINAL_STATUSES:
+                state.update({
+                    "status": batch.status,
+                    "output_file_id": batch.output_file_id,
+                    "error_file_id": batch.error_file_id,
+                })
+                self._save_state(state)
+                return state
+            time.sleep(self.poll_interval)
+
+    def collect_results(self, state: Dict, client) -> int:
+        """Write completed responses to the output tree and record them in the manifests"""
+        results: Dict[str, Dict[str, bool]] = {name: {} for name in state["figures"]}
+        responses = {}
+        # Requests that got an error status are in the error file, not the output file
+        for file_id in (state.get("output_file_id"), state.get("error_file_id")):
+            if not file_id:
+                continue
+            for line in client.client.files.content(file_id).text.splitlines():
+                if line.strip():
+                    item = json.loads(line)
+                    responses[item["custom_id"]] = item
+
+        specs_cache = {}
+        batched_cache = {}
+        manifests = {}
+        for custom_id, request in state["requests"].items():
+            figure_dir = Path(request["figure_dir"])
+            if request["figure_dir"] not in specs_cache:
+                specs = self.figure_processor.generation_specs(figure_dir, client)
+                specs_cache[request["figure_dir"]] = {
+                    label: (platform, generator, output_path)
+                    for label, platform, generator, _, output_path in specs
+                }
+                batched_cache[request["figure_dir"]] = self.figure_processor.batched_labels(
+                    self.figure_processor.figure_specs(figure_dir, client))
+                manifest = RunManifest(figure_dir)
+                manifest.set_source_pdf(Path(request["source_path"]))
+                manifests[request["figure_dir"]] = manifest
+            platform, generator, output_path = specs_cache[request["figure_dir"]][request["label"]]
+            manifest = manifests[request["figure_dir"]]
+
+            started = time.time()
+            success = False
+            error = None
+            item = responses.get(custom_id)
+            response = (item or {}).get("response") or {}
+            if response.get("status_code") == 200:
+                content = response["body"]["choices"][0]["message"]["content"]
+                if content:
+                    success = (client.save_to_file(generator.format_content(request["figure"], content), output_path)
+                               and self.figure_processor.validate_output(
+                                   request["figure"], request["label"], generator, output_path))
+            else:
+                error = (item or {}).get("error") or response.get("body", {}).get("error") or "no response"
+                print(f"❌ {request['figure']} / {request['label']}: {error}")
+
+            params = self.figure_processor.generation_params(
+                generator, request["label"] in batched_cache[request["figure_dir"]])
+            manifest.record(request["label"], manifest.fingerprint(params), params, success, started, time.time())
+            usage = response.get("body", {}).get("usage") or {}
+            self.figure_processor.record_result(
+                request["figure"], request["label"], platform, generator, output_path,
+                "success" if success else "failed", error=str(error) if error else None,
+                usage={"api_calls": 1 if item else 0,
+                       "prompt_tokens": usage.get("prompt_tokens", 0),
+                       "completion_tokens": usage.get("completion_tokens", 0)}
+            )
+            results[request["figure"]][request["label"]] = success
+
+        state["status"] = "collected"
+        self._save_state(state)
+
+        failed = set(state["failed_figures"])
+        success_count = 0
+        for name, figure_results in results.items():
+            print(f"\n🔹 {name}")
+            self.figure_processor.report_results(list(figure_results.items()))
+            if name not in failed and all(figure_results.values()):
+                success_count += 1
+        return success_count
@@ -1,155 +1,513 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Tuple
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 from data_processing.file_manager import create_folder_structure
-from data_processing.pdf_downloader import download_wikipedia_pdf
-from data_processing.pdf_processor import PDFProcessor
-from content_generation.youtube_generator import YouTubePostGenerator
-from content_generation.story_generator import LegacyStoryGenerator
-from content_generation.x_generator import XPostGenerator
-from content_generation.linkedin_generator import LinkedInPostGenerator
-from content_generation.patreon_generator import PatreonPostGenerator
-from content_generation.medium_generator import MediumPostGenerator
-from content_generation.kofi_generator import KofiPostGenerator
-from content_generation.post_generator import LegacyPostGenerator
-from content_generation.blog_generator import LegacyBlogGenerator
+from data_processing.extraction_cache import load_extraction, save_extraction
+from data_processing.pdf_processor import PDFProcessor, extractor_version
+from data_processing.result_store import ResultStore
+from data_processing.run_manifest import RunManifest, file_sha256
+from data_processing.source_backends import create_source_backend, is_pdf, read_source_text
+from content_generation.registry import GeneratorRegistry
+from content_generation.token_budget import estimate_spend
+from content_generation.short_form_generator import ShortFormBatch, ShortFormBatchGenerator
 
 from config.config_manager import ConfigManager
 from utils.content_validator import ContentValidator
+from utils.metrics import RunMetrics, generation_context
+from utils.output_validator import OutputValidator
+from utils.source_digest import build_digest, normalize_text
 
 class FigureProcessor:
-    def __init__(self, config_manager: ConfigManager):
+    def __init__(self, config_manager: ConfigManager, metrics: Optional[RunMetrics] = None):
         self.config_manager = config_manager
         self.validator = ContentValidator()
+        self.output_validator = OutputValidator(x_char_limit=config_manager.get_x_char_limit())
+        self.source_backend = create_source_backend(config_manager)
+        self.metrics = metrics or RunMetrics()
+        extraction = config_manager.get_pdf_extraction_settings()
+        self.pdf_processor = PDFProcessor(
+            parallel=extraction["parallel"],
+            max_workers=extraction["workers"],
+            min_parallel_pages=extraction["min_parallel_pages"],
+            min_image_bytes=extraction["min_image_bytes"]
+        )
+        self.platform_overrides: Dict[str, List[str]] = {}
+        self._registry: Optional[GeneratorRegistry] = None
+        self._registry_lock = threading.Lock()
+        self._result_store: Optional[ResultStore] = None
+        self._result_store_lock = threading.Lock()
 
-    def generate_youtube_content(self, figure_name: str, extracted_text: str, youtube_dir: Path, 
-                               post_generator, story_generator) -> List[Tuple[str, bool]]:
-        """Generate both post and story for YouTube"""
-        results = []
-        
-        # Generate YouTube post (description)
-        post_file = youtube_dir / "post.txt"
-        try:
-            success = post_generator.generate_post(
-                figure_name=figure_name,
-                source_text=extracted_text,
-                output_path=post_file
-            )
-            results.append(("YouTube Post", success))
-        except Exception as e:
-            print(f"❌ YouTube Post failed: {str(e)}")
-            results.append(("YouTube Post", False))
-        
-        # Generate YouTube story (script)
-        story_file = youtube_dir / "story.txt"
+    def set_platform_overrides(self, overrides: Dict[str, List[str]]):
+        """Per-figure platform lists from the input sheet (figure name -> platforms)"""
+        self.platform_overrides = {name.replace(" ", "_"): platforms for name, platforms in overrides.items()}
+
+    def set_figure_platforms(self, figure_name: str, platforms: Optional[List[str]]):
+        """Set (or with None, clear) one figure's platform override"""
+        key = figure_name.replace(" ", "_")
+        if platforms:
+            self.platform_overrides[key] = platforms
+        else:
+            self.platform_overrides.pop(key, None)
+
+    def close(self):
+        """Release the extraction process pool and flush the result store"""
+        self.pdf_processor.close()
+        if self._result_store is not None:
+            self._result_store.close()
+            self._result_store = None
+
+    @property
+    def result_store(self) -> Optional[ResultStore]:
+        """The run's result database, opened on first use (None when disabled)"""
+        settings = self.config_manager.get_result_store_settings()
+        if not settings["enabled"]:
+            return None
+        with self._result_store_lock:
+            if self._result_store is None:
+                self._result_store = ResultStore(
+                    Path(settings["path"]),
+                    batch_size=settings["batch_size"],
+                    flush_seconds=settings["flush_seconds"]
+                )
+            return self._result_store
+
+    def record_result(self, figure_name: str, label: str, platform: str, generator, output_path: Path,
+                      status: str, duration: Optional[float] = None, error: Optional[str] = None,
+                      usage: Optional[Dict[str, int]] = None):
+        """Add one output's outcome, token usage and text to the result store"""
+        store = self.result_store
+        if store is None:
+            return
+        content = None
+        if status == "success" and self.config_manager.get_result_store_settings()["store_content"]:
+            try:
+                content = output_path.read_text(encoding="utf-8")
+            except OSError:
+                pass
+        if usage is None:
+            usage = self.metrics.usage_for(figure_name, label)
+        store.record(
+            figure_name, label, platform, status,
+            model=generator.MODEL,
+            duration_s=round(duration, 3) if duration is not None else None,
+            output_path=output_path,
+            content=content,
+            error=error,
+            **usage
+        )
+
+    def run_job(self, label: str, job: Callable[[], bool]) -> Tuple[str, bool]:
+        """Run one generation job, turning exceptions into a failed result"""
         try:
-            success = story_generator.generate_story(
-                figure_name=figure_name,
-                source_text=extracted_text,
-                output_path=story_file
-            )
-            results.append(("YouTube Story", success))
+            return (label, job())
         except Exception as e:
-            print(f"❌ YouTube Story failed: {str(e)}")
-            results.append(("YouTube Story", False))
-        
-        return results
+            print(f"❌ {label} generation failed: {str(e)}")
+            return (label, False)
 
-    def process_figure(self, figure_name: str, client) -> bool:
-        """Process a single figure across all platforms"""
-        try:
-            print(f"\n{'='*50}")
-            print(f"🔄 Processing: {figure_name}")
-            print(f"{'='*50}")
+    def run_generation_jobs(self, jobs: List[Tuple[str, Callable[[], bool]]]) -> List[Tuple[str, bool]]:
+        """
+        Run generation jobs with at most `max_concurrent_requests` in flight.
+        Results are returned in job order regardless of completion order.
+        """
+        max_workers = min(self.config_manager.get_max_concurrent_requests(), len(jobs))
+        if max_workers <= 1:
+            return [self.run_job(label, job) for label, job in jobs]
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="generate") as executor:
+            futures = [executor.submit(self.run_job, label, job) for label, job in jobs]
+            return [future.result() for future in futures]
 
-            # 1. Create folder structure
+    def prepare_figure(self, figure_name: str) -> Tuple[Path, Path]:
+        """Create the output folders and fetch the source document (PDF or text, per source.backend)"""
+        with self.metrics.time_stage("folder_creation", figure_name):
             figure_dir = create_folder_structure(
                 base_dir=self.config_manager.get_output_dir(),
                 figure_name=figure_name,
                 platforms=self.config_manager.get_platforms()
             )
+        with self.metrics.time_stage("download", figure_name):
+            source_path = self.source_backend.fetch(figure_name, figure_dir)
+        return figure_dir, source_path
+
+    def extract_figure(self, source_path: Path, figure_dir: Path,
+                       source_hash: Optional[str] = None) -> Optional[Tuple[str, int]]:
+        """
+        Extract and validate source text
+        Returns (extracted_text, word_count) or None if the content is unusable
+        PDF extractions are reused from the sidecar cache while the PDF hash
+        (source_hash, computed if not given), extractor version and text
+        budget are unchanged, so reruns never parse the PDF again.
+        """
+        figure_name = figure_dir.name.replace("_", " ")
+        cache_key = None
+        cached = None
+        if is_pdf(source_path) and self.config_manager.get_pdf_extraction_settings()["cache"]:
+            cache_key = self.extraction_cache_key(source_path, source_hash)
+            cached = load_extraction(figure_dir, source_path, cache_key)
+
+        if cached is not None:
+            extracted_text, word_count = cached["text"], cached["word_count"]
+            print(f"♻️ Reusing cached extraction of {source_path.name} ({word_count} words)")
+        else:
+            with self.metrics.time_stage("extraction", figure_name):
+                extracted_text, page_count, extracted_images = self._extract_source(source_path, figure_dir)
 
-            # 2. Download and process PDF
-            pdf_path = download_wikipedia_pdf(
-                figure_name=figure_name,
-                save_path=figure_dir,
-                timeout=self.config_manager.get_timeout()
-            )
-            
-            # 3. Extract content (single validation)
-            processor = PDFProcessor()
-            extracted_text, _, extracted_images = processor.extract_content(pdf_path, figure_dir)
-            
             if extracted_images:
                 print(f"📸 Saved {len(extracted_images)} images to {figure_dir/'extracted_pics'}")
-            
+
             # Validate content once and get word count
-            is_valid, word_count = self.validator.validate_content(extracted_text)
+            with self.metrics.time_stage("validation", figure_name):
+                is_valid, word_count = self.validator.validate_content(extracted_text)
             if not is_valid:
-                return False
+                return None
+            if cache_key is not None:
+                save_extraction(figure_dir, source_path, cache_key, extracted_text, page_count,
+                                extracted_images, word_count)
+        with self.metrics.time_stage("source_digest", figure_name):
+            source_text = self.prepare_source_text(extracted_text)
+        return source_text, word_count
+
+    def extraction_cache_key(self, pdf_path: Path, source_hash: Optional[str] = None) -> Dict:
+        """Everything an extraction's output depends on: PDF content, extractor and budget"""
+        extraction = self.config_manager.get_pdf_extraction_settings()
+        digest = self.config_manager.get_source_digest_settings()
+        return {
+            "pdf_sha256": source_hash or file_sha256(pdf_path),
+            "extractor": extractor_version(),
+            "lazy_text": extraction["lazy_text"],
+            "max_chars": max(extraction["max_chars"], digest["input_chars"] if digest["enabled"] else 0),
+            "max_words": self.config_manager.get_max_platform_requirement(),
+            "extract_images": extraction["extract_images"],
+            "min_image_bytes": extraction["min_image_bytes"],
+        }
+
+    def _extract_source(self, source_path: Path, figure_dir: Path) -> Tuple[Optional[str], int, List[Path]]:
+        """(text, pages read, saved images) from the fetched source document"""
+        extraction = self.config_manager.get_pdf_extraction_settings()
+        digest = self.config_manager.get_source_digest_settings()
+        max_chars = max_words = None
+        if extraction["lazy_text"]:
+            # Only read as much text as the generators and platform checks consume
+            max_chars = extraction["max_chars"]
+            if digest["enabled"]:
+                max_chars = max(max_chars, digest["input_chars"])
+            max_words = self.config_manager.get_max_platform_requirement()
+        if not is_pdf(source_path):
+            # Text backends: no rendering or parsing, and no images to extract
+            return read_source_text(source_path, max_chars, max_words), 0, []
+        if extraction["lazy_text"]:
+            extracted_text, page_count = self.pdf_processor.extract_text(
+                source_path,
+                max_chars=max_chars,
+                max_words=max_words
+            )
+            extracted_images = []
+            if extraction["extract_images"]:
+                extracted_images = self.pdf_processor.extract_images(source_path, figure_dir)
+        else:
+            extracted_text, page_count, extracted_images = self.pdf_processor.extract_content(source_path, figure_dir)
+        return extracted_text, page_count, extracted_images
+
+    def prepare_source_text(self, extracted_text: str) -> str:
+        """Normalize the text once and build the digest every generator receives"""
+        digest = self.config_manager.get_source_digest_settings()
+        if not digest["enabled"]:
+            return extracted_text
+        normalized = normalize_text(extracted_text[:digest["input_chars"]])
+        return build_digest(normalized, digest["tiers"]) or extracted_text
+
+    def generator_registry(self, client) -> GeneratorRegistry:
+        """The run's generators for the configured platforms, built once per client"""
+        with self._registry_lock:
+            if self._registry is None or self._registry.client is not client:
+                self._registry = GeneratorRegistry(
+                    client,
+                    self.config_manager.get_platforms(),
+                    self.config_manager.get_generator_overrides()
+                )
+            return self._registry
+
+    def generation_specs(self, figure_dir: Path, client) -> List[Tuple[str, str, object, str, Path]]:
+        """
+        Describe every enabled platform output of a figure in run order
+        Returns (label, platform, generator, method_name, output_path) tuples
+        """
+        return self.generator_registry(client).specs(figure_dir)
 
-            # 4. Initialize all generators
-            generators = {
-                "YouTube": {
-                    "post": YouTubePostGenerator(client),
-                    "story": LegacyStoryGenerator(client)
-                },
-                "X": XPostGenerator(client),
-                "Facebook": LegacyPostGenerator(client),
-                "LinkedIn": LinkedInPostGenerator(client),
-                "Patreon": PatreonPostGenerator(client),
-                "Medium": MediumPostGenerator(client),
-                "Ko-fi": KofiPostGenerator(client),
-                "Blog": LegacyBlogGenerator(client)
+    def figure_specs(self, figure_dir: Path, client) -> List[Tuple[str, str, object, str, Path]]:
+        """generation_specs() limited to the figure's platform override, if it has one"""
+        specs = self.generation_specs(figure_dir, client)
+        platforms = self.platform_overrides.get(figure_dir.name)
+        if platforms is None:
+            return specs
+        wanted = {p.casefold() for p in platforms}
+        return [spec for spec in specs if spec[1].casefold() in wanted]
+
+    def generation_params(self, generator, batched: bool = False) -> Dict:
+        """
+        Template version, model, sampling and source parameters recorded in the manifest
+        batched outputs are written by the short-form batch prompt (which embeds
+        the platform's instructions), so toggling batch_short_form changes them.
+        """
+        template = f"{type(generator).__name__}:v{generator.TEMPLATE_VERSION}"
+        if batched:
+            return {
+                "template": f"ShortFormBatchGenerator:v{ShortFormBatchGenerator.TEMPLATE_VERSION}/{template}",
+                "model": generator.MODEL,
+                "max_tokens": ShortFormBatchGenerator.MAX_TOKENS,
+                "temperature": None,
+                "source_tokens": ShortFormBatchGenerator.SOURCE_TOKENS,
+                "source_digest": self.config_manager.get_source_digest_settings(),
             }
+        return {
+            "template": template,
+            "model": generator.MODEL,
+            "max_tokens": generator.MAX_TOKENS,
+            "temperature": getattr(generator, "TEMPERATURE", None),
+            "source_tokens": getattr(generator, "SOURCE_TOKENS", None),
+            "source_digest": self.config_manager.get_source_digest_settings(),
+        }
 
-            # 5. Generate content
-            results = []
-            youtube_dir = figure_dir / "YouTube"
-            
-            # Generate YouTube content (both post and story)
-            results.extend(self.generate_youtube_content(
-                figure_name=figure_name,
-                extracted_text=extracted_text,
-                youtube_dir=youtube_dir,
-                post_generator=generators["YouTube"]["post"],
-                story_generator=generators["YouTube"]["story"]
-            ))
-
-            # Generate other platform content
-            for platform in ["X", "Facebook", "LinkedIn", "Patreon", "Medium", "Ko-fi", "Blog"]:
-                output_file = figure_dir / platform / "content.txt"
-                
-                try:
-                    # Check platform requirements using pre-calculated word count
-                    if not self.validator.check_platform_requirements(platform, word_count, self.config_manager):
-                        results.append((platform, False))
-                        continue
-                    
-                    # Handle Blog separately since it uses generate_article
-                    if platform == "Blog":
-                        success = generators[platform].generate_article(
-                            figure_name=figure_name,
-                            source_text=extracted_text,
-                            output_path=output_file
-                        )
-                    else:
-                        success = generators[platform].generate_post(
-                            figure_name=figure_name,
-                            source_text=extracted_text,
-                            output_path=output_file
-                        )
-                    
-                    results.append((platform, success))
-                except Exception as e:
-                    print(f"❌ {platform} generation failed: {str(e)}")
-                    results.append((platform, False))
-
-            print("\n📊 Generation Results:")
-            for platform, success in results:
-                print(f"   {platform.ljust(12)}: {'✅' if success else '❌'}")
+    def batched_labels(self, specs: List[Tuple]) -> Set[str]:
+        """Outputs generated through the short-form batch prompt under the current config"""
+        if not self.config_manager.is_short_form_batching_enabled():
+            return set()
+        return ShortFormBatchGenerator.batchable_labels({spec[0]: spec[2] for spec in specs})
+
+    def estimate_spend(self, figure_count: int, client) -> Dict:
+        """Upper-bound token spend for processing `figure_count` figures (no API calls)"""
+        generators = [generator for _, _, generator, _, _ in self.generation_specs(Path("."), client)]
+        prices = self.config_manager.get_token_budget_settings()["prices_per_million"]
+        validation = self.config_manager.get_output_validation_settings()
+        repair_prompt = None
+        if validation["enabled"] and validation["repair_prompt"]:
+            # Any output may need one fix-up prompt carrying its whole draft
+            repair_prompt = self.output_validator.repair_prompt(
+                "Platform", "Figure Name", "", ["Fix the issues found by the platform checks"])
+        return estimate_spend(generators, figure_count, prices, repair_prompt)
+
+    def open_manifest(self, figure_dir: Path, source_path: Path) -> RunManifest:
+        manifest = RunManifest(figure_dir)
+        manifest.set_source_pdf(source_path)
+        return manifest
+
+    def is_eligible(self, platform: str, word_count: int) -> bool:
+        """Silent form of the platform word-count check (YouTube has no minimum)"""
+        return platform == "YouTube" or word_count >= self.config_manager.get_platform_requirement(platform)
+
+    def outputs_up_to_date(self, figure_dir: Path, manifest: RunManifest, client) -> bool:
+        """
+        True if every output already succeeded from the same PDF, template and parameters
+        Platforms the stored word count makes ineligible are left out; they never get an output.
+        """
+        word_count = manifest.word_count
+        if self.config_manager.get_force_regenerate() or word_count is None:
+            return False
+        specs = self.figure_specs(figure_dir, client)
+        batched = self.batched_labels(specs)
+        return all(
+            manifest.is_fresh(label, manifest.fingerprint(self.generation_params(generator, label in batched)),
+                              output_path)
+            for label, platform, generator, _, output_path in specs
+            if self.is_eligible(platform, word_count)
+        )
+
+    def _tracked_job(self, manifest: RunManifest, label: str, generator, output_path: Path,
+                     job: Callable[[], bool], batched: bool = False) -> Callable[[], bool]:
+        """Wrap a job so fresh outputs are skipped and every attempt is recorded"""
+        params = self.generation_params(generator, batched)
+        fingerprint = manifest.fingerprint(params)
+
+        def run() -> bool:
+            if not self.config_manager.get_force_regenerate() and manifest.is_fresh(label, fingerprint, output_path):
+                print(f"⏭️ {label} up to date, skipping")
+                return True
+            started = time.time()
+            success = False
+            try:
+                success = job()
+                return success
+            finally:
+                manifest.record(label, fingerprint, params, success, started, time.time())
+        return run
+
+    def build_generation_jobs(self, figure_name: str, figure_dir: Path, extracted_text: str,
+                              word_count: int, client,
+                              manifest: Optional[RunManifest] = None) -> List[Tuple[str, Callable[[], bool]]]:
+        """Build the ordered (label, job) list for every platform output of a figure"""
+        specs = []
+        for label, platform, generator, method_name, output_path in self.figure_specs(figure_dir, client):
+            # Check platform requirements using pre-calculated word count
+            eligible = platform == "YouTube" or self.validator.check_platform_requirements(
+                platform, word_count, self.config_manager)
+            specs.append((label, platform, generator, method_name, output_path, eligible))
+
+        batched = self.batched_labels(specs)
+        batches = self._short_form_batches(figure_name, extracted_text, specs, batched, client, manifest)
+
+        jobs = []
+        for label, platform, generator, method_name, output_path, eligible in specs:
+            if not eligible:
+                self.record_result(figure_name, label, platform, generator, output_path, "ineligible",
+                                   error=f"source has {word_count} words")
+                jobs.append((label, lambda: False))
+                continue
+
+            job = partial(getattr(generator, method_name),
+                          figure_name=figure_name,
+                          source_text=extracted_text,
+                          output_path=output_path)
+            if label in batches:
+                job = partial(batches[label].result, label, job)
+            job = self._validated_job(figure_name, label, generator, output_path, job)
+            # Inside the manifest check, so outputs skipped as up to date keep their stored row
+            job = self._stored_job(figure_name, label, platform, generator, output_path, job)
+            if manifest is not None:
+                job = self._tracked_job(manifest, label, generator, output_path, job, label in batched)
+            jobs.append((label, self._instrumented_job(figure_name, label, job)))
+        return jobs
+
+    def _validated_job(self, figure_name: str, label: str, generator,
+                       output_path: Path, job: Callable[[], bool]) -> Callable[[], bool]:
+        """Check (and repair) the output once the job has written it"""
+        def run() -> bool:
+            return job() and self.validate_output(figure_name, label, generator, output_path)
+        return run
+
+    def validate_output(self, figure_name: str, label: str, generator, output_path: Path) -> bool:
+        """
+        Check a saved output against its platform rules and repair it in place:
+        deterministic local fixes first, then one short targeted prompt for
+        whatever is left. Returns False only if issues remain and
+        fail_unrepaired is set.
+        """
+        settings = self.config_manager.get_output_validation_settings()
+        if not settings["enabled"]:
+            return True
+        text = output_path.read_text(encoding="utf-8")
+        header, body, footer = self.output_validator.split_output(
+            text, lambda response: generator.format_content(figure_name, response))
+        issues = self.output_validator.check(label, figure_name, body)
+        if not issues:
+            return True
+
+        with self.metrics.time_stage(f"repair:{label}", figure_name):
+            repaired = self.output_validator.repair_locally(label, figure_name, body)
+            remaining = self.output_validator.check(label, figure_name, repaired)
+            how = "locally"
+            if remaining and settings["repair_prompt"]:
+                response = generator.client.generate_content(
+                    prompt=self.output_validator.repair_prompt(label, figure_name, repaired, remaining),
+                    model=generator.MODEL,
+                    max_tokens=generator.MAX_TOKENS
+                )
+                if response:
+                    candidate = self.output_validator.repair_locally(label, figure_name, response)
+                    candidate_issues = self.output_validator.check(label, figure_name, candidate)
+                    if len(candidate_issues) <= len(remaining):
+                        repaired, remaining, how = candidate, candidate_issues, "with a fix-up prompt"
+            if repaired != body.strip() and not generator.client.save_to_file(header + repaired + footer, output_path):
+                return False
+
+        if remaining:
+            print(f"⚠️ {label} still has issues: {'; '.join(remaining)}")
+            return not settings["fail_unrepaired"]
+        print(f"🩹 {label} repaired {how} ({'; '.join(issues)})")
+        return True
+
+    def _stored_job(self, figure_name: str, label: str, platform: str, generator,
+                    output_path: Path, job: Callable[[], bool]) -> Callable[[], bool]:
+        """Record the job's outcome in the result store once it finishes"""
+        def run() -> bool:
+            started = time.perf_counter()
+            success, error = False, None
+            try:
+                success = job()
+                return success
+            except Exception as e:
+                error = str(e)
+                raise
+            finally:
+                self.record_result(figure_name, label, platform, generator, output_path,
+                                   "success" if success else "failed", time.perf_counter() - started, error)
+        return run
+
+    def _instrumented_job(self, figure_name: str, label: str, job: Callable[[], bool]) -> Callable[[], bool]:
+        """Time the job and attribute its API calls to (figure, platform)"""
+        def run() -> bool:
+            with generation_context(figure_name, label), \
+                    self.metrics.time_stage(f"generate:{label}", figure_name):
+                return job()
+        return run
+
+    def _short_form_batches(self, figure_name: str, extracted_text: str, specs: List[Tuple], batched: Set[str],
+                            client, manifest: Optional[RunManifest]) -> Dict[str, ShortFormBatch]:
+        """
+        Group the batched outputs that actually need generating into one
+        request per model; returns output label -> its batch
+        """
+        force = self.config_manager.get_force_regenerate()
+        groups: Dict[str, Tuple[Dict, Dict]] = {}
+        for label, _, generator, _, output_path, eligible in specs:
+            if label not in batched or not eligible:
+                continue
+            if manifest is not None and not force and manifest.is_fresh(
+                    label, manifest.fingerprint(self.generation_params(generator, batched=True)), output_path):
+                continue
+            generators, output_paths = groups.setdefault(generator.MODEL, ({}, {}))
+            generators[label] = generator
+            output_paths[label] = output_path
+        batches = {}
+        for generators, output_paths in groups.values():
+            # A lone stale output still uses the batch prompt its fingerprint records
+            batch = ShortFormBatch(ShortFormBatchGenerator(client, generators), figure_name, extracted_text, output_paths)
+            batches.update({label: batch for label in generators})
+        return batches
+
+    @staticmethod
+    def report_results(results: List[Tuple[str, bool]]) -> bool:
+        """Print the per-platform summary and return overall success"""
+        print("\n📊 Generation Results:")
+        for platform, success in results:
+            print(f"   {platform.ljust(12)}: {'✅' if success else '❌'}")
+        
+        return all(success for _, success in results)
+
+    def process_figure(self, figure_name: str, client) -> bool:
+        """Process a single figure across all platforms"""
+        with self.metrics.time_stage("figure_total", figure_name):
+            return self._process_figure(figure_name, client)
+
+    def _process_figure(self, figure_name: str, client) -> bool:
+        try:
+            print(f"\n{'='*50}")
+            print(f"🔄 Processing: {figure_name}")
+            print(f"{'='*50}")
+
+            # 1-2. Create folder structure, download PDF
+            figure_dir, source_path = self.prepare_figure(figure_name)
+            manifest = self.open_manifest(figure_dir, source_path)
+            if self.outputs_up_to_date(figure_dir, manifest, client):
+                print(f"⏭️ All outputs for {figure_name} are up to date")
+                return True
             
-            return all(success for _, success in results)
+            # 3. Extract content (single validation)
+            extracted = self.extract_figure(source_path, figure_dir, manifest.source_hash)
+            if extracted is None:
+                return False
+            extracted_text, word_count = extracted
+            manifest.record_source(word_count)
+
+            # 4. Build generation jobs
+            jobs = self.build_generation_jobs(figure_name, figure_dir, extracted_text, word_count, client, manifest)
+
+            # 5. Generate content concurrently
+            results = self.run_generation_jobs(jobs)
+            return self.report_results(results)
 
         except Exception as e:
             print(f"⚠️ Error processing {figure_name}: {str(e)}")
@@ -0,0 +1,210 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+# Stages run in this order for every figure; later stages are leased first
+# so figures already in flight finish before new ones start
+STAGES = ("prepare", "generate")
+
+
+class Job(NamedTuple):
+    id: int
+    figure: str
+    stage: str
+    payload: Dict
+    attempts: int
+    owner: str
+
+
+def make_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{threading.get_ident() % 10000}"
+
+
+class JobQueue:
+    """
+    Durable (figure, stage) job table in SQLite, shared by worker processes.
+
+    Workers lease one job at a time; a lease expires unless the worker
+    heartbeats, after which any worker may reclaim the job. Completion only
+    succeeds for the current lease holder, and the next stage is enqueued in
+    the same transaction, so each stage is recorded done exactly once even
+    if a slow worker finishes after its lease was reclaimed.
+
+    WAL mode needs every process on the same host. For workers on several
+    hosts sharing a filesystem, set journal_mode to "DELETE" (SQLite's
+    file locking then has to be reliable on that filesystem).
+    """
+
+    def __init__(self, path: Path, lease_seconds: float = 120, max_attempts: int = 3,
+                 journal_mode: str = "WAL"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        # Autocommit mode; multi-statement changes use explicit BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(str(self.path), timeout=60, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                figure TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                payload TEXT NOT NULL DEFAULT '{}',
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires REAL,
+                error TEXT,
+                created REAL NOT NULL,
+                updated REAL NOT NULL,
+                UNIQUE (figure, stage)
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, lease_expires)")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """BEGIN IMMEDIATE takes the write lock up front so two workers never lease the same job"""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def enqueue(self, figures: List[Dict]) -> int:
+        """
+        Add a first-stage job per figure ({"name": ..., "platforms": ...})
+        Figures already in the queue are left alone; returns the number added.
+        """
+        now = time.time()
+        with self._lock, self._transaction():
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO jobs (figure, stage, payload, created, updated) VALUES (?, ?, ?, ?, ?)",
+                [(f["name"], STAGES[0], json.dumps({"platforms": f.get("platforms")}), now, now) for f in figures]
+            )
+            return self._conn.total_changes - before
+
+    def lease(self, owner: str) -> Optional[Job]:
+        """Lease the next runnable job, reclaiming expired leases first"""
+        now = time.time()
+        with self._lock, self._transaction():
+            # Expired leases go back to pending, or fail once out of attempts
+            self._conn.execute(
+                """UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                       error = CASE WHEN attempts >= ? THEN 'lease expired' ELSE error END,
+                       lease_owner = NULL, lease_expires = NULL, updated = ?
+                   WHERE status = 'leased' AND lease_expires < ?""",
+                (self.max_attempts, self.max_attempts, now, now)
+            )
+            order = " ".join(f"WHEN '{stage}' THEN {i}" for i, stage in enumerate(reversed(STAGES)))
+            row = self._conn.execute(
+                f"""SELECT id, figure, stage, payload, attempts FROM jobs
+                    WHERE status = 'pending' ORDER BY CASE stage {order} END, id LIMIT 1"""
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                """UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?,
+                       attempts = attempts + 1, updated = ? WHERE id = ?""",
+                (owner, now + self.lease_seconds, now, row[0])
+            )
+        return Job(row[0], row[1], row[2], json.loads(row[3]), row[4] + 1, owner)
+
+    def heartbeat(self, job: Job) -> bool:
+        """Extend the lease; False if it was lost to another worker"""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                """UPDATE jobs SET lease_expires = ?, updated = ?
+                   WHERE id = ? AND status = 'leased' AND lease_owner = ?""",
+                (now + self.lease_seconds, now, job.id, job.owner)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job: Job, next_payload: Optional[Dict] = None) -> bool:
+        """
+        Mark the job done and enqueue the figure's next stage with next_payload
+        Returns False (and changes nothing) if the lease is no longer held.
+        """
+        now = time.time()
+        with self._lock, self._transaction():
+            cursor = self._conn.execute(
+                """UPDATE jobs SET status = 'done', lease_owner = NULL, lease_expires = NULL,
+                       error = NULL, updated = ?
+                   WHERE id = ? AND status = 'leased' AND lease_owner = ?""",
+                (now, job.id, job.owner)
+            )
+            if cursor.rowcount != 1:
+                return False
+            stage_index = STAGES.index(job.stage)
+            if next_payload is not None and stage_index + 1 < len(STAGES):
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO jobs (figure, stage, payload, created, updated) VALUES (?, ?, ?, ?, ?)",
+                    (job.figure, STAGES[stage_index + 1], json.dumps(next_payload), now, now)
+                )
+            return True
+
+    def fail(self, job: Job, error: str, retry: bool = True) -> bool:
+        """Release a failed job for another attempt, or fail it for good"""
+        now = time.time()
+        status = "pending" if retry and job.attempts < self.max_attempts else "failed"
+        with self._lock:
+            cursor = self._conn.execute(
+                """UPDATE jobs SET status = ?, error = ?, lease_owner = NULL, lease_expires = NULL, updated = ?
+                   WHERE id = ? AND status = 'leased' AND lease_owner = ?""",
+                (status, error[:2000], now, job.id, job.owner)
+            )
+            return cursor.rowcount == 1
+
+    def retry_failed(self) -> int:
+        """Give every failed job a fresh set of attempts; returns how many were reset"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'pending', attempts = 0, error = NULL, updated = ? WHERE status = 'failed'",
+                (time.time(),)
+            )
+            return cursor.rowcount
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """stage -> status -> job count"""
+        with self._lock:
+            rows = self._conn.execute("SELECT stage, status, COUNT(*) FROM jobs GROUP BY stage, status").fetchall()
+        counts: Dict[str, Dict[str, int]] = {}
+        for stage, status, count in rows:
+            counts.setdefault(stage, {})[status] = count
+        return counts
+
+    def has_unfinished(self) -> bool:
+        """True while any job is pending or leased (more work may still appear)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM jobs WHERE status IN ('pending', 'leased') LIMIT 1"
+            ).fetchone()
+        return row is not None
+
+    def figure_outcomes(self) -> Dict[str, bool]:
+        """figure -> True once its last stage is done, or its first stage finished with nothing left to do"""
+        with self._lock:
+            rows = self._conn.execute(
+                """SELECT f.figure, f.status, l.status FROM jobs f
+                   LEFT JOIN jobs l ON l.figure = f.figure AND l.stage = ?
+                   WHERE f.stage = ?""",
+                (STAGES[-1], STAGES[0])
+            ).fetchall()
+        return {figure: (last or first) == "done" for figure, first, last in rows}
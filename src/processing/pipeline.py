@@ -0,0 +1,176 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+from config.config_manager import ConfigManager
+from processing.figure_processor import FigureProcessor
+
+_STOP = object()
+
+
+class _FigureRun:
+    """Tracks the outstanding generation jobs of one figure"""
+
+    def __init__(self, figure_name: str, labels: List[str]):
+        self.figure_name = figure_name
+        self.labels = labels
+        self.results: Dict[str, bool] = {}
+        self.lock = threading.Lock()
+
+    def record(self, label: str, success: bool) -> bool:
+        """Store a job result; returns True once every job has finished"""
+        with self.lock:
+            self.results[label] = success
+            return len(self.results) == len(self.labels)
+
+    def ordered_results(self) -> List[Tuple[str, bool]]:
+        return [(label, self.results[label]) for label in self.labels]
+
+
+class PipelineExecutor:
+    """
+    Staged executor that overlaps work across figures:
+    download -> extract/validate -> generation.
+
+    Download and extract stages each have their own worker threads fed by
+    bounded queues, so a slow stage applies back-pressure instead of
+    buffering the whole name list. Every (figure, platform) job is
+    flattened into one shared generation pool.
+    """
+
+    def __init__(self, figure_processor: FigureProcessor, config_manager: ConfigManager):
+        self.figure_processor = figure_processor
+        settings = config_manager.get_pipeline_settings()
+        self.download_workers = max(1, settings["download_workers"])
+        self.extract_workers = max(1, settings["extract_workers"])
+        self.generation_workers = max(1, settings["generation_workers"])
+        self.queue_size = max(1, settings["queue_size"])
+
+        self._download_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        self._extract_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        # Bounds generation jobs that are running or waiting for a worker
+        self._generation_slots = threading.BoundedSemaphore(self.generation_workers + self.queue_size)
+        self._lock = threading.Lock()
+        self._success_count = 0
+        self._job_count = 0
+
+    def run(self, names: List[str], client) -> int:
+        """Process all names through the pipeline and return the success count"""
+        started = time.perf_counter()
+        self._generation_pool = ThreadPoolExecutor(
+            max_workers=self.generation_workers, thread_name_prefix="generate"
+        )
+        self._figures_left = len(names)
+        self._all_done = threading.Event()
+        if not names:
+            self._all_done.set()
+
+        download_threads = [
+            threading.Thread(target=self._download_worker, name=f"download-{i}", daemon=True)
+            for i in range(self.download_workers)
+        ]
+        extract_threads = [
+            threading.Thread(target=self._extract_worker, args=(client,), name=f"extract-{i}", daemon=True)
+            for i in range(self.extract_workers)
+        ]
+        for thread in download_threads + extract_threads:
+            thread.start()
+
+        for i, name in enumerate(names, 1):
+            self._download_queue.put((i, name))
+        for _ in download_threads:
+            self._download_queue.put(_STOP)
+        for thread in download_threads:
+            thread.join()
+
+        for _ in extract_threads:
+            self._extract_queue.put(_STOP)
+        for thread in extract_threads:
+            thread.join()
+
+        self._all_done.wait()
+        self._generation_pool.shutdown(wait=True)
+
+        elapsed = time.perf_counter() - started
+        self._print_throughput(len(names), elapsed)
+        return self._success_count
+
+    def _download_worker(self):
+        while True:
+            item = self._download_queue.get()
+            if item is _STOP:
+                return
+            index, name = item
+            try:
+                print(f"\n📥 [{index}] Downloading: {name}")
+                figure_dir, source_path = self.figure_processor.prepare_figure(name)
+            except Exception as e:
+                print(f"⚠️ Error processing {name}: {str(e)}")
+                self._finish_figure(False)
+                continue
+            self._extract_queue.put((name, figure_dir, source_path))
+
+    def _extract_worker(self, client):
+        while True:
+            item = self._extract_queue.get()
+            if item is _STOP:
+                return
+            name, figure_dir, source_path = item
+            try:
+                manifest = self.figure_processor.open_manifest(figure_dir, source_path)
+                if self.figure_processor.outputs_up_to_date(figure_dir, manifest, client):
+                    print(f"⏭️ All outputs for {name} are up to date")
+                    self._finish_figure(True)
+                    continue
+                extracted = self.figure_processor.extract_figure(source_path, figure_dir, manifest.source_hash)
+                if extracted is None:
+                    self._finish_figure(False)
+                    continue
+                extracted_text, word_count = extracted
+                manifest.record_source(word_count)
+                jobs = self.figure_processor.build_generation_jobs(
+                    name, figure_dir, extracted_text, word_count, client, manifest
+                )
+            except Exception as e:
+                print(f"⚠️ Error processing {name}: {str(e)}")
+                self._finish_figure(False)
+                continue
+            self._submit_jobs(name, jobs)
+
+    def _submit_jobs(self, name: str, jobs: List[Tuple[str, Callable[[], bool]]]):
+        if not jobs:
+            self._finish_figure(True)
+            return
+        figure_run = _FigureRun(name, [label for label, _ in jobs])
+        for label, job in jobs:
+            self._generation_slots.acquire()
+            self._generation_pool.submit(self._run_generation_job, figure_run, label, job)
+
+    def _run_generation_job(self, figure_run: _FigureRun, label: str, job: Callable[[], bool]):
+        try:
+            _, success = self.figure_processor.run_job(label, job)
+        finally:
+            self._generation_slots.release()
+        with self._lock:
+            self._job_count += 1
+        if figure_run.record(label, success):
+            print(f"\n✔️ Finished: {figure_run.figure_name}")
+            self._finish_figure(self.figure_processor.report_results(figure_run.ordered_results()))
+
+    def _finish_figure(self, success: bool):
+        with self._lock:
+            if success:
+                self._success_count += 1
+            self._figures_left -= 1
+            if self._figures_left == 0:
+                self._all_done.set()
+
+    def _print_throughput(self, figure_count: int, elapsed: float):
+        elapsed = max(elapsed, 1e-9)
+        print(f"\n⏱️ Pipeline: {figure_count} figures, {self._job_count} generation jobs in {elapsed:.1f}s")
+        print(f"   Throughput: {figure_count / elapsed * 60:.2f} figures/min, "
+              f"{self._job_count / elapsed:.2f} jobs/s "
+              f"(workers: download={self.download_workers}, extract={self.extract_workers}, "
+              f"generation={self.generation_workers})")
@@ -0,0 +1,163 @@
+import multiprocessing
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config.config_manager import ConfigManager
+from content_generation.openai_client import create_client
+from processing.figure_processor import FigureProcessor
+from processing.job_queue import Job, JobQueue, make_worker_id
+from utils.metrics import RunMetrics
+
+
+def open_job_queue(config_manager: ConfigManager) -> JobQueue:
+    settings = config_manager.get_job_queue_settings()
+    return JobQueue(
+        Path(settings["path"]),
+        lease_seconds=settings["lease_seconds"],
+        max_attempts=settings["max_attempts"],
+        journal_mode=settings["journal_mode"]
+    )
+
+
+class QueueWorker:
+    """
+    Leases (figure, stage) jobs from the shared queue until it is drained.
+
+    "prepare" downloads, extracts and digests the source and hands the
+    digest to the "generate" job through the queue payload, so the two
+    stages of one figure may run in different processes or hosts (the
+    output directory must then be shared). Outputs are written through the
+    run manifest, so a job re-run after a lost lease skips finished outputs.
+    """
+
+    def __init__(self, figure_processor: FigureProcessor, config_manager: ConfigManager,
+                 queue: JobQueue, client, worker_id: Optional[str] = None):
+        self.figure_processor = figure_processor
+        self.queue = queue
+        self.client = client
+        self.worker_id = worker_id or make_worker_id()
+        settings = config_manager.get_job_queue_settings()
+        self.heartbeat_seconds = settings["heartbeat_seconds"]
+        self.poll_interval = settings["poll_interval"]
+
+    def run(self) -> Dict[str, int]:
+        """Work until no job is pending or leased; returns done/failed job counts"""
+        counts = {"done": 0, "failed": 0}
+        while True:
+            job = self.queue.lease(self.worker_id)
+            if job is None:
+                # Leased jobs elsewhere may still fail back to pending or add a next stage
+                if not self.queue.has_unfinished():
+                    break
+                time.sleep(self.poll_interval)
+                continue
+            print(f"\n🧾 [{self.worker_id}] {job.stage}: {job.figure} (attempt {job.attempts})")
+            ok = self._run_with_heartbeat(job)
+            counts["done" if ok else "failed"] += 1
+        print(f"\n👋 [{self.worker_id}] Queue drained: {counts['done']} jobs done, {counts['failed']} failed")
+        return counts
+
+    def _run_with_heartbeat(self, job: Job) -> bool:
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(self.heartbeat_seconds):
+                if not self.queue.heartbeat(job):
+                    print(f"⚠️ [{self.worker_id}] Lost the lease on {job.figure} ({job.stage})")
+                    return
+
+        heartbeat = threading.Thread(target=beat, name=f"heartbeat-{job.id}", daemon=True)
+        heartbeat.start()
+        try:
+            if job.stage == "prepare":
+                return self._prepare(job)
+            return self._generate(job)
+        except Exception as e:
+            print(f"⚠️ Error processing {job.figure}: {str(e)}")
+            self.queue.fail(job, str(e))
+            return False
+        finally:
+            stop.set()
+            heartbeat.join()
+
+    def _prepare(self, job: Job) -> bool:
+        name = job.figure
+        platforms = job.payload.get("platforms")
+        self.figure_processor.set_figure_platforms(name, platforms)
+        figure_dir, source_path = self.figure_processor.prepare_figure(name)
+        manifest = self.figure_processor.open_manifest(figure_dir, source_path)
+        if self.figure_processor.outputs_up_to_date(figure_dir, manifest, self.client):
+            print(f"⏭️ All outputs for {name} are up to date")
+            return self.queue.complete(job)
+        extracted = self.figure_processor.extract_figure(source_path, figure_dir, manifest.source_hash)
+        if extracted is None:
+            # Unusable source text fails the same way on every attempt
+            self.queue.fail(job, "source text failed validation", retry=False)
+            return False
+        source_text, word_count = extracted
+        manifest.record_source(word_count)
+        return self.queue.complete(job, {
+            "figure_dir": str(figure_dir),
+            "source_path": str(source_path),
+            "source_text": source_text,
+            "word_count": word_count,
+            "platforms": platforms,
+        })
+
+    def _generate(self, job: Job) -> bool:
+        payload = job.payload
+        figure_dir, source_path = Path(payload["figure_dir"]), Path(payload["source_path"])
+        self.figure_processor.set_figure_platforms(job.figure, payload.get("platforms"))
+        with self.figure_processor.metrics.time_stage("figure_total", job.figure):
+            manifest = self.figure_processor.open_manifest(figure_dir, source_path)
+            jobs = self.figure_processor.build_generation_jobs(
+                job.figure, figure_dir, payload["source_text"], payload["word_count"], self.client, manifest
+            )
+            results = self.figure_processor.run_generation_jobs(jobs)
+        if self.figure_processor.report_results(results):
+            return self.queue.complete(job)
+        failed = ", ".join(label for label, success in results if not success)
+        self.queue.fail(job, f"failed outputs: {failed}")
+        return False
+
+
+def worker_main(config: Dict, index: int, rate_limit_share: float) -> int:
+    """Entry point of one worker process; returns its failed job count"""
+    config_manager = ConfigManager(config)
+    metrics = RunMetrics()
+    client = create_client(config_manager, metrics, rate_limit_share=rate_limit_share)
+    figure_processor = FigureProcessor(config_manager, metrics=metrics)
+    queue = open_job_queue(config_manager)
+    worker_id = f"{make_worker_id()}-w{index}"
+    try:
+        counts = QueueWorker(figure_processor, config_manager, queue, client, worker_id).run()
+    finally:
+        figure_processor.close()
+        queue.close()
+    if config_manager.is_metrics_report_enabled():
+        metrics.write_report(config_manager.get_output_dir() / "worker_metrics" / worker_id)
+    return counts["failed"]
+
+
+def run_worker_processes(config: Dict, count: int) -> List[int]:
+    """
+    Run `count` worker processes on this host and wait for them
+    Each gets 1/count of the configured rate limits so together they stay
+    within the account's quota. Returns the exit codes.
+    """
+    context = multiprocessing.get_context("spawn")  # No forked SQLite connections or threads
+    processes = [
+        context.Process(target=_worker_process, args=(config, index, 1.0 / count), name=f"queue-worker-{index}")
+        for index in range(count)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return [process.exitcode for process in processes]
+
+
+def _worker_process(config: Dict, index: int, rate_limit_share: float):
+    raise SystemExit(1 if worker_main(config, index, rate_limit_share) else 0)
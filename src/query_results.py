@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Query or export the result database written during runs.
+
+    python src/query_results.py --summary
+    python src/query_results.py --platform LinkedIn --status failed
+    python src/query_results.py --status success --content --export posts.jsonl
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.config.config_manager import ConfigManager
+from src.data_processing.result_store import STATUSES, ResultStore
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Query the generated-content result database")
+    parser.add_argument("--config", help="JSON config file (locates the database through result_store/output_dir)")
+    parser.add_argument("--db", type=Path, help="Database path (overrides the config)")
+    parser.add_argument("--figure", help="Only this figure")
+    parser.add_argument("--platform", help="Platform (e.g. LinkedIn) or output label (e.g. 'YouTube Story')")
+    parser.add_argument("--status", choices=STATUSES, help="Only outputs with this status")
+    parser.add_argument("--content", action="store_true", help="Include the generated text")
+    parser.add_argument("--limit", type=int, help="At most this many rows")
+    parser.add_argument("--summary", action="store_true", help="Print output counts per platform and status")
+    parser.add_argument("--export", type=Path, help="Write matching rows to a .jsonl or .csv file")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    config_manager = ConfigManager.from_file(args.config) if args.config else ConfigManager()
+    db_path = args.db or Path(config_manager.get_result_store_settings()["path"])
+    if not db_path.exists():
+        print(f"🔥 No result database at {db_path}", file=sys.stderr)
+        return 1
+
+    store = ResultStore(db_path)
+    try:
+        if args.summary:
+            for platform, statuses in store.summary().items():
+                print(f"{platform.ljust(12)}: " + ", ".join(f"{count} {status}" for status, count in sorted(statuses.items())))
+            return 0
+
+        rows = store.query(args.figure, args.platform, args.status, include_content=args.content, limit=args.limit)
+        if args.export:
+            count = store.export(args.export, rows)
+            print(f"📤 Exported {count} rows to {args.export}")
+            return 0
+        for row in rows:
+            print(json.dumps(row, ensure_ascii=False))
+        return 0
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+import contextvars
+import json
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Set around each generation job so the client can attribute API calls
+current_figure = contextvars.ContextVar("current_figure", default=None)
+current_platform = contextvars.ContextVar("current_platform", default=None)
+
+PERCENTILES = (50, 90, 95, 99)
+LATENCY_WINDOW = 500  # Recent first-attempt latencies kept per (model, platform) for hedging
+
+
+@contextmanager
+def generation_context(figure_name: str, platform: str):
+    """Attribute API calls made inside the block to (figure, platform)"""
+    figure_token = current_figure.set(figure_name)
+    platform_token = current_platform.set(platform)
+    try:
+        yield
+    finally:
+        current_platform.reset(platform_token)
+        current_figure.reset(figure_token)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for no samples)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct * len(ordered) / 100) - 1))
+    return ordered[rank]
+
+
+class RunMetrics:
+    """
+    Thread-safe collector for stage timings and API call statistics.
+
+    Recording is a lock plus a list append, so it is cheap enough to call
+    from every stage and every generation thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.stages: Dict[str, List[float]] = defaultdict(list)
+        self.figure_stages: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.calls: List[Dict] = []
+        self.cache_hits = 0
+        # (figure, platform) -> running token/call totals, for per-output results
+        self.usage: Dict[Tuple[Optional[str], str], Dict[str, int]] = {}
+        self.latencies: Dict[Tuple[str, str], deque] = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.deadline_exceeded = 0
+
+    @contextmanager
+    def time_stage(self, stage: str, figure: Optional[str] = None):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, time.perf_counter() - started, figure)
+
+    def record_stage(self, stage: str, duration: float, figure: Optional[str] = None):
+        with self._lock:
+            self.stages[stage].append(duration)
+            if figure is not None:
+                figure_stage = self.figure_stages[figure]
+                figure_stage[stage] = figure_stage.get(stage, 0.0) + duration
+
+    def record_call(self, model: str, latency: float, retries: int, success: bool,
+                    prompt_tokens: int = 0, completion_tokens: int = 0, streamed: bool = False,
+                    figure: Optional[str] = None, platform: Optional[str] = None):
+        call = {
+            "model": model,
+            "figure": figure,
+            "platform": platform or "unknown",
+            "latency_s": latency,
+            "retries": retries,
+            "success": success,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "streamed": streamed,
+        }
+        with self._lock:
+            self.calls.append(call)
+            usage = self.usage.setdefault((figure, call["platform"]),
+                                          {"api_calls": 0, "prompt_tokens": 0, "completion_tokens": 0})
+            usage["api_calls"] += 1
+            usage["prompt_tokens"] += prompt_tokens
+            usage["completion_tokens"] += completion_tokens
+            if success and retries == 0:
+                self.latencies[(model, call["platform"])].append(latency)
+
+    def usage_for(self, figure: str, platform: str) -> Dict[str, int]:
+        """API calls and tokens attributed to (figure, platform) so far in this run"""
+        with self._lock:
+            return dict(self.usage.get((figure, platform), {"api_calls": 0, "prompt_tokens": 0, "completion_tokens": 0}))
+
+    def recent_latency(self, model: str, platform: Optional[str], pct: float, min_samples: int) -> Optional[float]:
+        """pct-th percentile of recent successful first attempts, or None with too few samples"""
+        with self._lock:
+            samples = list(self.latencies.get((model, platform or "unknown"), ()))
+        if len(samples) < min_samples:
+            return None
+        return percentile(samples, pct)
+
+    def record_hedge_sent(self):
+        with self._lock:
+            self.hedges_sent += 1
+
+    def record_hedge_win(self):
+        with self._lock:
+            self.hedges_won += 1
+
+    def record_deadline_exceeded(self):
+        with self._lock:
+            self.deadline_exceeded += 1
+
+    def record_cache_hit(self):
+        with self._lock:
+            self.cache_hits += 1
+
+    def _group_calls(self, key: str) -> Dict[str, Dict]:
+        groups: Dict[str, List[Dict]] = defaultdict(list)
+        for call in self.calls:
+            groups[call[key]].append(call)
+        return {name: self._call_stats(calls) for name, calls in sorted(groups.items())}
+
+    @staticmethod
+    def _call_stats(calls: List[Dict]) -> Dict:
+        latencies = [c["latency_s"] for c in calls]
+        stats = {
+            "calls": len(calls),
+            "failures": sum(1 for c in calls if not c["success"]),
+            "retries": sum(c["retries"] for c in calls),
+            "prompt_tokens": sum(c["prompt_tokens"] for c in calls),
+            "completion_tokens": sum(c["completion_tokens"] for c in calls),
+        }
+        for pct in PERCENTILES:
+            stats[f"latency_p{pct}_s"] = round(percentile(latencies, pct), 3)
+        return stats
+
+    @staticmethod
+    def _duration_stats(durations: List[float]) -> Dict:
+        stats = {"count": len(durations), "total_s": round(sum(durations), 3)}
+        for pct in PERCENTILES:
+            stats[f"p{pct}_s"] = round(percentile(durations, pct), 3)
+        return stats
+
+    def summary(self) -> Dict:
+        with self._lock:
+            return {
+                "wall_time_s": round(time.time() - self.started, 3),
+                "stages": {stage: self._duration_stats(d) for stage, d in sorted(self.stages.items())},
+                "figures": {figure: {k: round(v, 3) for k, v in stages.items()}
+                            for figure, stages in self.figure_stages.items()},
+                "calls": {
+                    "total": self._call_stats(self.calls) if self.calls else {"calls": 0},
+                    "cache_hits": self.cache_hits,
+                    "hedges_sent": self.hedges_sent,
+                    "hedges_won": self.hedges_won,
+                    "deadline_exceeded": self.deadline_exceeded,
+                    "by_model": self._group_calls("model"),
+                    "by_platform": self._group_calls("platform"),
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        """Render the summary in the Prometheus text exposition format"""
+        summary = self.summary()
+        lines = [
+            "# TYPE smg_run_wall_time_seconds gauge",
+            f"smg_run_wall_time_seconds {summary['wall_time_s']}",
+            "# TYPE smg_stage_duration_seconds summary",
+        ]
+        for stage, stats in summary["stages"].items():
+            for pct in PERCENTILES:
+                lines.append(f'smg_stage_duration_seconds{{stage="{stage}",quantile="{pct / 100}"}} {stats[f"p{pct}_s"]}')
+            lines.append(f'smg_stage_duration_seconds_sum{{stage="{stage}"}} {stats["total_s"]}')
+            lines.append(f'smg_stage_duration_seconds_count{{stage="{stage}"}} {stats["count"]}')
+
+        with self._lock:
+            groups: Dict[Tuple[str, str], List[Dict]] = defaultdict(list)
+            for call in self.calls:
+                groups[(call["model"], call["platform"])].append(call)
+
+        # Each metric family must be emitted as one contiguous group
+        families = {
+            "smg_api_latency_seconds": ("summary", []),
+            "smg_api_failures_total": ("counter", []),
+            "smg_api_retries_total": ("counter", []),
+            "smg_api_tokens_total": ("counter", []),
+        }
+        for (model, platform), calls in sorted(groups.items()):
+            labels = f'model="{model}",platform="{platform}"'
+            stats = self._call_stats(calls)
+            latency = families["smg_api_latency_seconds"][1]
+            for pct in PERCENTILES:
+                latency.append(f'smg_api_latency_seconds{{{labels},quantile="{pct / 100}"}} {stats[f"latency_p{pct}_s"]}')
+            latency.append(f'smg_api_latency_seconds_sum{{{labels}}} {round(sum(c["latency_s"] for c in calls), 3)}')
+            latency.append(f'smg_api_latency_seconds_count{{{labels}}} {stats["calls"]}')
+            families["smg_api_failures_total"][1].append(f'smg_api_failures_total{{{labels}}} {stats["failures"]}')
+            families["smg_api_retries_total"][1].append(f'smg_api_retries_total{{{labels}}} {stats["retries"]}')
+            tokens = families["smg_api_tokens_total"][1]
+            tokens.append(f'smg_api_tokens_total{{{labels},kind="prompt"}} {stats["prompt_tokens"]}')
+            tokens.append(f'smg_api_tokens_total{{{labels},kind="completion"}} {stats["completion_tokens"]}')
+        for name, (metric_type, samples) in families.items():
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(samples)
+
+        lines.append("# TYPE smg_cache_hits_total counter")
+        lines.append(f"smg_cache_hits_total {summary['calls']['cache_hits']}")
+        for name, key in (("smg_hedges_sent_total", "hedges_sent"), ("smg_hedges_won_total", "hedges_won"),
+                          ("smg_deadline_exceeded_total", "deadline_exceeded")):
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {summary['calls'][key]}")
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, output_dir: Path) -> Tuple[Path, Path]:
+        """Write run_metrics.json and run_metrics.prom into output_dir"""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        json_path = output_dir / "run_metrics.json"
+        prom_path = output_dir / "run_metrics.prom"
+        json_path.write_text(json.dumps(self.summary(), indent=2))
+        prom_path.write_text(self.to_prometheus())
+        return json_path, prom_path
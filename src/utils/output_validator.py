@@ -0,0 +1,212 @@
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+TRAILING_HASHTAG = re.compile(r'(?:^|(?<=\s))#[ \t]?([^\W_]\w*)\Z', re.UNICODE)
+HEADING = re.compile(r'^#{1,6}\s+\S', re.MULTILINE)
+SENTENCE_END = re.compile(r'[.!?…]["”’)\]]?(?=\s|$)')
+BODY_MARKER = "\x00BODY\x00"
+
+
+class OutputRules(NamedTuple):
+    max_chars: Optional[int] = None   # Limit on the post body (header excluded)
+    min_words: Optional[int] = None
+    max_words: Optional[int] = None
+    hashtags: Tuple[str, ...] = ()    # Required tags; "{figure}" is the name without spaces
+    cta: Optional[str] = None         # Regex the call-to-action must match (case-insensitive)
+    cta_text: Optional[str] = None    # Appended by local repair when the CTA is missing
+    markdown: bool = False            # Needs a title and section headings
+
+
+# Derived from the instructions in each generator's prompt, keyed by output label
+OUTPUT_RULES: Dict[str, OutputRules] = {
+    "YouTube Post": OutputRules(max_chars=5000, hashtags=("#{figure}", "#History", "#Biography"),
+                                cta=r"subscribe", cta_text="Like 👍 | Subscribe 🔔 | Comment below 💬"),
+    "YouTube Story": OutputRules(min_words=300),
+    "X": OutputRules(max_chars=280, hashtags=("#{figure}", "#History", "#Facts")),
+    "Facebook": OutputRules(max_words=250, hashtags=("#{figure}", "#History", "#Legacy")),
+    "LinkedIn": OutputRules(max_chars=3000,
+                            hashtags=("#{figure}", "#Leadership", "#CareerGrowth", "#IndustryTrends"),
+                            cta=r"\?"),
+    "Patreon": OutputRules(min_words=250, cta=r"support|feedback|let me know|comment",
+                           cta_text="💬 Let me know what you think in the comments, and thank you for your support!"),
+    "Medium": OutputRules(min_words=400, markdown=True),
+    "Ko-fi": OutputRules(cta=r"coffee|ko-?fi|support",
+                         cta_text="☕ If you enjoyed this, consider buying me a coffee to support more stories!"),
+    "Blog": OutputRules(min_words=500, markdown=True),
+}
+
+
+class OutputValidator:
+    """
+    Post-generation checks on each output against its platform's rules.
+
+    repair_locally() fixes what can be fixed deterministically (hashtag
+    spelling and presence, a missing CTA, headings, over-length text);
+    repair_prompt() builds a short prompt for what is left, so an output
+    is only sent back to the model for the specific issues remaining.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, OutputRules]] = None, x_char_limit: Optional[int] = None):
+        self.rules = dict(rules or OUTPUT_RULES)
+        if x_char_limit is not None and "X" in self.rules:
+            self.rules["X"] = self.rules["X"]._replace(max_chars=x_char_limit)
+
+    @staticmethod
+    def split_output(text: str, format_content) -> Tuple[str, str, str]:
+        """
+        Split a saved output into (header, body, footer) using the generator's
+        format_content; the whole text is the body if it does not match
+        """
+        header, footer = format_content(BODY_MARKER).split(BODY_MARKER, 1)
+        if text.startswith(header) and text.endswith(footer) and len(text) >= len(header) + len(footer):
+            return header, text[len(header):len(text) - len(footer)], footer
+        return "", text, ""
+
+    @staticmethod
+    def required_hashtags(rules: OutputRules, figure_name: str) -> List[str]:
+        figure_tag = re.sub(r'\W', '', figure_name.replace(' ', ''))
+        return [tag.replace("{figure}", figure_tag) for tag in rules.hashtags]
+
+    def check(self, label: str, figure_name: str, text: str) -> List[str]:
+        """Issues found in `text`, as short instructions usable in a repair prompt"""
+        rules = self.rules.get(label)
+        if rules is None:
+            return []
+        issues = []
+        words = len(text.split())
+        if rules.max_chars is not None and len(text) > rules.max_chars:
+            issues.append(f"Shorten to at most {rules.max_chars} characters (currently {len(text)})")
+        if rules.min_words is not None and words < rules.min_words:
+            issues.append(f"Expand to at least {rules.min_words} words (currently {words})")
+        if rules.max_words is not None and words > rules.max_words:
+            issues.append(f"Shorten to at most {rules.max_words} words (currently {words})")
+        present = {tag.casefold() for tag in re.findall(r'#[^\W_]\w*', text)}
+        missing = [tag for tag in self.required_hashtags(rules, figure_name) if tag.casefold() not in present]
+        if missing:
+            issues.append(f"Include the hashtags {' '.join(missing)}")
+        if rules.cta is not None and not re.search(rules.cta, text, re.IGNORECASE):
+            issues.append("End with a clear call-to-action")
+        if rules.markdown and len(HEADING.findall(text)) < 3:
+            issues.append("Use Markdown: a '# ' title and '## ' headings for each section")
+        return issues
+
+    def repair_locally(self, label: str, figure_name: str, text: str) -> str:
+        """Apply the deterministic repairs; the result may still have issues"""
+        rules = self.rules.get(label)
+        if rules is None:
+            return text
+        text = text.strip()
+        if rules.markdown:
+            text = self._promote_headings(text)
+        if rules.cta is not None and rules.cta_text and not re.search(rules.cta, text, re.IGNORECASE):
+            text = f"{text}\n\n{rules.cta_text}"
+
+        tags = self.required_hashtags(rules, figure_name)
+        if tags:
+            body, found = self._split_hashtags(text)
+            inline = {tag.casefold() for tag in re.findall(r'#[^\W_]\w*', body)}
+            tags = [tag for tag in tags if tag.casefold() not in inline]  # Inline tags count as present
+            tags += [tag for tag in found if tag.casefold() not in {t.casefold() for t in tags}]
+            tag_line = " ".join(tags)
+            if rules.max_chars is not None:
+                # Required tags always fit; optional extras are dropped first
+                tag_line = " ".join(self._fit_words(tags, rules.max_chars // 2))
+            text = f"{body}\n\n{tag_line}" if body and tag_line else body or tag_line
+            if rules.max_chars is not None and len(text) > rules.max_chars:
+                body = self.truncate(body, rules.max_chars - len(tag_line) - 2 if tag_line else rules.max_chars)
+                text = f"{body}\n\n{tag_line}" if body and tag_line else body or tag_line
+        elif rules.max_chars is not None and len(text) > rules.max_chars:
+            text = self.truncate(text, rules.max_chars)
+
+        if rules.max_words is not None and len(text.split()) > rules.max_words:
+            body, found = self._split_hashtags(text)
+            budget = rules.max_words - len(found)
+            if budget > 0 and len(body.split()) > budget:
+                body = self.truncate(body, self._word_offset(body, budget))
+                text = f"{body}\n\n{' '.join(found)}" if found else body
+        return text
+
+    def repair_prompt(self, label: str, figure_name: str, text: str, issues: List[str]) -> str:
+        """A short targeted revision prompt (no source material, only the draft and its issues)"""
+        fixes = "\n".join(f"- {issue}" for issue in issues)
+        return f"""Revise this {label} post about {figure_name}.
+Fix only these problems and keep everything else as it is:
+{fixes}
+
+Reply with the revised post only.
+
+POST:
+{text}"""
+
+    @staticmethod
+    def truncate(text: str, max_chars: int) -> str:
+        """Cut to `max_chars`, preferring the last sentence end, else a word boundary with an ellipsis"""
+        if len(text) <= max_chars:
+            return text
+        if max_chars <= 0:
+            return ""
+        cut = text[:max_chars]
+        sentence_ends = [m.end() for m in SENTENCE_END.finditer(cut)]
+        if sentence_ends and sentence_ends[-1] > max_chars // 2:
+            return cut[:sentence_ends[-1]].rstrip()
+        space = cut[:max_chars - 1].rfind(" ")
+        return (cut[:space] if space > 0 else cut[:max_chars - 1]).rstrip(" ,;:-") + "…"
+
+    @staticmethod
+    def _split_hashtags(text: str) -> Tuple[str, List[str]]:
+        """
+        Split off the trailing block of hashtags (fixing "# Tag" spacing),
+        deduplicated in order; tags inside the prose stay where they are
+        """
+        found: List[str] = []
+        seen = set()
+        tag_line_start = None
+        body = text.rstrip()
+        while True:
+            match = TRAILING_HASHTAG.search(body)
+            if match is None:
+                break
+            line_start = body.rfind("\n", 0, match.start()) + 1
+            if match.start() == line_start != tag_line_start and HEADING.match(body, line_start):
+                break  # A lone "# Title" line is a Markdown heading, not a tag
+            tag = f"#{match.group(1)}"
+            if tag.casefold() in seen:
+                found.remove(next(t for t in found if t.casefold() == tag.casefold()))
+            seen.add(tag.casefold())
+            found.insert(0, tag)
+            tag_line_start = line_start
+            body = body[:match.start()].rstrip()
+        return body, found
+
+    @staticmethod
+    def _fit_words(words: List[str], max_chars: int) -> List[str]:
+        kept, length = [], -1
+        for index, word in enumerate(words):
+            if length + 1 + len(word) > max_chars and index > 0:
+                break
+            kept.append(word)
+            length += 1 + len(word)
+        return kept
+
+    @staticmethod
+    def _word_offset(text: str, count: int) -> int:
+        """Character offset just past the first `count` words"""
+        matches = list(re.finditer(r'\S+', text))
+        return matches[count - 1].end() if len(matches) >= count else len(text)
+
+    @staticmethod
+    def _promote_headings(text: str) -> str:
+        """Turn bold or "TITLE:" section lines into Markdown headings when none are present"""
+        if len(HEADING.findall(text)) >= 3:
+            return text
+        lines = text.split("\n")
+        promoted = 0
+        for i, line in enumerate(lines):
+            stripped = line.strip()
+            match = (re.fullmatch(r'\*\*(.+?)\*\*:?', stripped)
+                     or re.fullmatch(r'(?:[A-Z][A-Z \-]+):\s*(.{3,100})', stripped)
+                     or re.fullmatch(r'(?:Title|Headline|Subheading|Section \d+):\s*(.{3,100})', stripped, re.IGNORECASE))
+            if match and len(match.group(1)) <= 100:
+                lines[i] = f"{'#' if promoted == 0 else '##'} {match.group(1).strip()}"
+                promoted += 1
+        return "\n".join(lines) if promoted else text
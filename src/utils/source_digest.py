@@ -0,0 +1,113 @@
+import math
+import re
+from collections import Counter
+from typing import List, Sequence
+
+# Wikipedia back-matter: everything from the first of these headings on is dropped
+BACK_MATTER = re.compile(
+    r'^\s*(References|See also|Notes|Citations|External links|Further reading|Bibliography|Sources)\s*$',
+    re.IGNORECASE | re.MULTILINE
+)
+PAGE_PLACEHOLDER = re.compile(r'<Page \d+ contains no extractable text>')
+PAGE_NUMBER_LINE = re.compile(r'^\s*(Page\s+)?\d+(\s*(of|/)\s*\d+)?\s*$', re.IGNORECASE)
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+(?=["“(\[]?[A-Z0-9])')
+WORD = re.compile(r"[A-Za-z][A-Za-z'’-]+|\d{3,4}")
+
+STOPWORDS = set("""
+a about after all also an and any are as at be because been before being between both but by
+can could did do does during each for from had has have he her him his how i if in into is it
+its many may more most much no not of on one only or other our out over she so some such than
+that the their them then there these they this those through to under up was we were what when
+where which while who whom why will with would you your
+""".split())
+
+
+def normalize_text(text: str, repeated_line_threshold: int = 3) -> str:
+    """
+    Clean PDF-extracted text: drop page placeholders, running headers/footers
+    and page numbers, undo end-of-line hyphenation, cut References/See also
+    back-matter and join wrapped lines into paragraphs.
+    """
+    text = PAGE_PLACEHOLDER.sub("", text)
+    text = re.sub(r'(\w)-\n(\w)', r'\1\2', text)
+
+    lines = text.splitlines()
+    counts = Counter(line.strip() for line in lines if 0 < len(line.strip()) < 80)
+    kept = []
+    for line in lines:
+        stripped = line.strip()
+        if PAGE_NUMBER_LINE.match(stripped):
+            continue
+        if stripped and counts.get(stripped, 0) >= repeated_line_threshold:
+            continue  # Running header/footer repeated on many pages
+        kept.append(stripped)
+    text = "\n".join(kept)
+
+    match = BACK_MATTER.search(text)
+    if match:
+        text = text[:match.start()]
+
+    paragraphs = re.split(r'\n\s*\n', text)
+    return "\n\n".join(re.sub(r'\s+', ' ', p).strip() for p in paragraphs if p.strip())
+
+
+def _split_sentences(text: str) -> List[str]:
+    sentences = []
+    for paragraph in text.split("\n\n"):
+        sentences.extend(s.strip() for s in SENTENCE_SPLIT.split(paragraph) if s.strip())
+    return sentences
+
+
+def _score_sentences(sentences: List[str]) -> List[float]:
+    """Information density: rare content words, names and dates per sqrt(length)"""
+    tokenized = [[w.lower() for w in WORD.findall(s)] for s in sentences]
+    document_frequency = Counter(w for words in tokenized for w in set(words) if w not in STOPWORDS)
+    total = len(sentences) or 1
+
+    scores = []
+    for position, (sentence, words) in enumerate(zip(sentences, tokenized)):
+        content = [w for w in words if w not in STOPWORDS]
+        if len(words) < 4:
+            scores.append(0.0)
+            continue
+        weight = sum(math.log(1 + total / document_frequency[w]) for w in set(content))
+        weight += 0.5 * len(re.findall(r'\b(1[0-9]{3}|20[0-9]{2})\b', sentence))  # Years
+        weight += 0.3 * len(re.findall(r'\b[A-Z][a-z]+', sentence[1:]))         # Names, places
+        score = weight / math.sqrt(len(words))
+        if position < 3:
+            score *= 1.5  # The lead usually defines the subject
+        scores.append(score)
+    return scores
+
+
+def build_digest(text: str, tiers: Sequence[int] = (1200, 1800)) -> str:
+    """
+    Extractive digest of `text` built in cumulative character tiers.
+
+    Each tier adds the highest-scoring remaining sentences that fit and
+    keeps them in document order, so any prefix of length tiers[i] is
+    itself a complete digest (generators cut source_text to their
+    SOURCE_TOKENS budget, which the whole digest stays under).
+    """
+    sentences = _split_sentences(text)
+    if not sentences:
+        return text
+    scores = _score_sentences(sentences)
+    ranked = sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True)
+
+    chosen = set()
+    parts = []
+    used = 0
+    for limit in sorted(tiers):
+        tier = []
+        for i in ranked:
+            if i in chosen or scores[i] <= 0:
+                continue
+            cost = len(sentences[i]) + 1
+            if used + cost > limit:
+                continue
+            tier.append(i)
+            chosen.add(i)
+            used += cost
+        parts.extend(sentences[i] for i in sorted(tier))
+    return " ".join(parts)
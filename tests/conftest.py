@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+# src modules import each other as top-level packages; the fakes live with the benchmarks
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from config.config_manager import DEFAULT_CONFIG, ConfigManager
+from processing.figure_processor import FigureProcessor
+from utils.metrics import RunMetrics
+
+from fake_client import FakeOpenAIClient
+
+FIGURE = "Ada Lovelace"
+SOURCE_SENTENCE = "Ada wrote the first published algorithm. "  # Six words
+
+
+@pytest.fixture
+def make_config(tmp_path):
+    """
+    Build a ConfigManager for FIGURE with a local-source text of `words` words
+    Keyword overrides replace top-level config entries (e.g. output_validation={...}).
+    """
+    def make(platforms, words: int = 1800, **overrides) -> ConfigManager:
+        sources = tmp_path / "sources"
+        sources.mkdir(exist_ok=True)
+        (sources / "Ada_Lovelace.txt").write_text(SOURCE_SENTENCE * (words // 6))
+        return ConfigManager({
+            **DEFAULT_CONFIG,
+            "output_dir": str(tmp_path / "outputs"),
+            "platforms": platforms,
+            "max_concurrent_requests": 1,
+            "source": {"backend": "local", "local_dir": str(sources)},
+            "response_cache": {"enabled": False},
+            "batch": {"work_dir": str(tmp_path / "batch"), "poll_interval": 0},
+            **overrides,
+        })
+    return make
+
+
+@pytest.fixture
+def run_figure():
+    """Process FIGURE once with a FakeOpenAIClient; returns the run's metrics"""
+    def run(config_manager: ConfigManager) -> RunMetrics:
+        metrics = RunMetrics()
+        processor = FigureProcessor(config_manager, metrics=metrics)
+        try:
+            assert processor.process_figure(FIGURE, FakeOpenAIClient(metrics=metrics))
+        finally:
+            processor.close()
+        return metrics
+    return run
+
+
+@pytest.fixture
+def stored_rows():
+    """FIGURE's result-store rows by output label"""
+    def rows(config_manager: ConfigManager, include_content: bool = False) -> dict:
+        processor = FigureProcessor(config_manager)
+        try:
+            return {row["output"]: row
+                    for row in processor.result_store.query(figure=FIGURE, include_content=include_content)}
+        finally:
+            processor.close()
+    return rows
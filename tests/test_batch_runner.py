@@ -0,0 +1,116 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from config.config_manager import ConfigManager
+from content_generation.openai_client import create_client
+from processing import batch_runner
+from processing.batch_runner import BatchRunner
+from processing.figure_processor import FigureProcessor
+from utils.metrics import RunMetrics
+
+from conftest import FIGURE
+from fake_server import FakeServer, FaultProfile
+
+
+@pytest.fixture
+def server():
+    fake = FakeServer(openai=FaultProfile("fixed:0"), wikipedia=FaultProfile("fixed:0"), batch_polls=2)
+    fake.start()
+    yield fake
+    fake.stop()
+
+
+def server_config(make_config, server_url: str, platforms, words: int = 1800, **overrides) -> ConfigManager:
+    """Config whose OpenAI calls go to the fake server"""
+    return make_config(platforms, words, openai_key="sk-test", openai_base_url=f"{server_url}/v1",
+                       output_validation={"repair_prompt": False}, **overrides)
+
+
+def run_batch(config_manager: ConfigManager) -> int:
+    metrics = RunMetrics()
+    processor = FigureProcessor(config_manager, metrics=metrics)
+    try:
+        return BatchRunner(processor, config_manager).run([FIGURE], create_client(config_manager, metrics))
+    finally:
+        processor.close()
+
+
+def interrupt(seconds):
+    raise KeyboardInterrupt
+
+
+def test_submit_interrupt_resume_collect(tmp_path, server, monkeypatch, make_config, stored_rows):
+    config_manager = server_config(make_config, server.url, ["X", "Facebook"])
+    state_path = tmp_path / "batch" / "state.json"
+    monkeypatch.setattr(batch_runner.time, "sleep", interrupt)
+
+    # The first poll finds the batch in progress; the run is interrupted while waiting
+    with pytest.raises(KeyboardInterrupt):
+        run_batch(config_manager)
+    state = json.loads(state_path.read_text())
+    assert state["status"] == "submitted"
+    assert len(state["requests"]) == 2
+    assert server.snapshot()["batch"]["batches"] == 1
+
+    # A new run resumes polling the same batch instead of resubmitting
+    assert run_batch(config_manager) == 1
+    assert server.snapshot()["batch"]["batches"] == 1
+    assert json.loads(state_path.read_text())["status"] == "collected"
+
+    rows = stored_rows(config_manager)
+    assert set(rows) == {"X", "Facebook"}
+    for row in rows.values():
+        assert row["status"] == "success"
+        assert row["completion_tokens"] > 0
+        assert Path(row["output_path"]).read_text().strip()
+
+
+def test_failed_requests_are_read_from_the_error_file(make_config, stored_rows):
+    fake = FakeServer(openai=FaultProfile("fixed:0", rate_500=1.0), wikipedia=FaultProfile("fixed:0"), batch_polls=1)
+    fake.start()
+    try:
+        config_manager = server_config(make_config, fake.url, ["X"])
+        assert run_batch(config_manager) == 0
+    finally:
+        fake.stop()
+    row = stored_rows(config_manager)["X"]
+    assert row["status"] == "failed"
+    assert "Injected 500" in row["error"]
+
+
+def test_ineligible_platforms_fail_the_figure_once(server, make_config):
+    config_manager = server_config(make_config, server.url, ["X", "Medium", "Blog"], words=600)
+    processor = FigureProcessor(config_manager)
+    try:
+        state = BatchRunner(processor, config_manager).render_requests([FIGURE], create_client(config_manager))
+    finally:
+        processor.close()
+    assert state["failed_figures"] == [FIGURE]
+    assert [request["label"] for request in state["requests"].values()] == ["X"]
+
+
+def test_batch_mode_keeps_outputs_of_a_batched_sync_run(server, make_config, run_figure, capsys):
+    config_manager = server_config(make_config, server.url, ["YouTube", "X", "Facebook"], batch_short_form=True)
+    run_figure(config_manager)
+
+    assert run_batch(config_manager) == 1
+    assert "Nothing to submit, all outputs are up to date" in capsys.readouterr().out
+
+
+def test_resuming_with_other_figures_warns(server, monkeypatch, make_config, capsys):
+    config_manager = server_config(make_config, server.url, ["X"])
+    monkeypatch.setattr(batch_runner.time, "sleep", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        run_batch(config_manager)
+
+    processor = FigureProcessor(config_manager)
+    try:
+        runner = BatchRunner(processor, config_manager)
+        monkeypatch.undo()
+        assert runner.run(["Grace Hopper"], create_client(config_manager)) == 1
+    finally:
+        processor.close()
+    assert "unfinished batch for 1 other figure(s)" in capsys.readouterr().out
+    assert server.snapshot()["batch"]["batches"] == 1
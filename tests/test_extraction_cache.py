@@ -0,0 +1,91 @@
+import pytest
+
+from data_processing import pdf_processor
+from data_processing.extraction_cache import cache_path
+from processing.figure_processor import FigureProcessor
+
+from fixtures import make_pdf
+
+
+@pytest.fixture
+def figure_dir(tmp_path):
+    path = tmp_path / "outputs" / "Ada_Lovelace"
+    path.mkdir(parents=True)
+    return path
+
+
+@pytest.fixture
+def extract(make_config, figure_dir):
+    """Run extract_figure on a fresh processor; returns (result, whether the source was parsed)"""
+    def run(source_path, **pdf_extraction):
+        processor = FigureProcessor(make_config(["X"], pdf_extraction=pdf_extraction))
+        parsed = []
+        extract_source = processor._extract_source
+
+        def spy(*args):
+            parsed.append(args)
+            return extract_source(*args)
+
+        processor._extract_source = spy
+        try:
+            return processor.extract_figure(source_path, figure_dir), bool(parsed)
+        finally:
+            processor.close()
+    return run
+
+
+def test_unchanged_pdf_reuses_the_cached_extraction(figure_dir, extract):
+    pdf_path = make_pdf(figure_dir / "Ada_Lovelace.pdf", pages=6)
+    first, parsed = extract(pdf_path)
+    assert parsed and first is not None
+    assert cache_path(figure_dir, pdf_path).exists()
+
+    second, parsed = extract(pdf_path)
+    assert not parsed
+    assert second == first
+
+
+def test_changed_pdf_is_extracted_again(figure_dir, extract):
+    pdf_path = make_pdf(figure_dir / "Ada_Lovelace.pdf", pages=6)
+    first, _ = extract(pdf_path)
+    make_pdf(pdf_path, pages=6, seed=1)
+    second, parsed = extract(pdf_path)
+    assert parsed
+    assert second != first
+
+
+def test_new_extractor_version_invalidates_the_cache(figure_dir, extract, monkeypatch):
+    pdf_path = make_pdf(figure_dir / "Ada_Lovelace.pdf", pages=6)
+    extract(pdf_path)
+    monkeypatch.setattr(pdf_processor, "EXTRACTOR_VERSION", pdf_processor.EXTRACTOR_VERSION + 1)
+    assert extract(pdf_path)[1]
+    assert not extract(pdf_path)[1]
+
+
+# max_chars only counts above source_digest.input_chars (20000), the larger of the two budgets
+@pytest.mark.parametrize("budget", [{"max_chars": 30000}, {"lazy_text": False}])
+def test_budget_change_invalidates_the_cache(figure_dir, extract, budget):
+    pdf_path = make_pdf(figure_dir / "Ada_Lovelace.pdf", pages=6)
+    extract(pdf_path)
+    assert extract(pdf_path, **budget)[1]
+    assert not extract(pdf_path, **budget)[1]
+
+
+def test_deleted_image_invalidates_the_cache(figure_dir, extract):
+    pdf_path = make_pdf(figure_dir / "Ada_Lovelace.pdf", pages=6, images_per_page=1)
+    extract(pdf_path)
+    images = list((figure_dir / "extracted_pics").glob("*.png"))
+    assert images
+    images[0].unlink()
+
+    assert extract(pdf_path)[1]
+    assert images[0].exists()
+
+
+def test_text_sources_are_not_cached(figure_dir, extract):
+    text_path = figure_dir / "Ada_Lovelace.txt"
+    text_path.write_text("Ada wrote the first published algorithm. " * 300)
+    first, parsed = extract(text_path)
+    assert parsed and first is not None
+    assert not cache_path(figure_dir, text_path).exists()
+    assert extract(text_path)[1]
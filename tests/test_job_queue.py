@@ -0,0 +1,84 @@
+import sqlite3
+import time
+
+from processing.job_queue import JobQueue
+
+FIGURES = [{"name": "Ada Lovelace", "platforms": ["X"]}]
+
+
+def open_queues(tmp_path, lease_seconds=60.0, max_attempts=3):
+    path = tmp_path / "jobs.sqlite"
+    return (JobQueue(path, lease_seconds=lease_seconds, max_attempts=max_attempts),
+            JobQueue(path, lease_seconds=lease_seconds, max_attempts=max_attempts))
+
+
+def job_error(tmp_path, figure, stage):
+    with sqlite3.connect(str(tmp_path / "jobs.sqlite")) as conn:
+        return conn.execute("SELECT error FROM jobs WHERE figure = ? AND stage = ?", (figure, stage)).fetchone()[0]
+
+
+def test_lease_is_exclusive_and_stages_run_in_order(tmp_path):
+    first, second = open_queues(tmp_path)
+    assert first.enqueue(FIGURES) == 1
+    assert second.enqueue(FIGURES) == 0
+
+    job = first.lease("worker-a")
+    assert (job.figure, job.stage, job.payload, job.attempts) == ("Ada Lovelace", "prepare", {"platforms": ["X"]}, 1)
+    assert second.lease("worker-b") is None
+
+    assert first.complete(job, {"pdf": "ada.pdf"})
+    generate = second.lease("worker-b")
+    assert (generate.stage, generate.payload) == ("generate", {"pdf": "ada.pdf"})
+    assert second.complete(generate, {})
+    assert not first.has_unfinished()
+    assert first.figure_outcomes() == {"Ada Lovelace": True}
+
+
+def test_heartbeat_keeps_the_lease(tmp_path):
+    first, second = open_queues(tmp_path, lease_seconds=0.2)
+    first.enqueue(FIGURES)
+    job = first.lease("worker-a")
+    for _ in range(3):
+        time.sleep(0.1)
+        assert first.heartbeat(job)
+    assert second.lease("worker-b") is None
+    assert first.complete(job)
+
+
+def test_expired_lease_is_reclaimed_and_completes_exactly_once(tmp_path):
+    first, second = open_queues(tmp_path, lease_seconds=0.05)
+    first.enqueue(FIGURES)
+    slow = first.lease("worker-a")
+    time.sleep(0.1)
+
+    reclaimed = second.lease("worker-b")
+    assert (reclaimed.id, reclaimed.attempts) == (slow.id, 2)
+    assert not first.heartbeat(slow)
+    assert not first.complete(slow, {"from": "worker-a"})
+    assert not first.fail(slow, "too late")
+
+    assert second.complete(reclaimed, {"from": "worker-b"})
+    assert not second.complete(reclaimed, {"from": "worker-b"})
+    generate = first.lease("worker-a")
+    assert generate.payload == {"from": "worker-b"}
+    assert first.counts() == {"prepare": {"done": 1}, "generate": {"leased": 1}}
+
+
+def test_jobs_fail_after_max_attempts_and_retry_failed_resets_them(tmp_path):
+    first, second = open_queues(tmp_path, lease_seconds=0.05, max_attempts=2)
+    first.enqueue(FIGURES)
+    assert first.fail(first.lease("worker-a"), "boom")
+    second.lease("worker-b")
+    time.sleep(0.1)  # The second attempt's lease expires
+
+    assert first.lease("worker-a") is None
+    assert first.counts() == {"prepare": {"failed": 1}}
+    assert job_error(tmp_path, "Ada Lovelace", "prepare") == "lease expired"
+    assert first.figure_outcomes() == {"Ada Lovelace": False}
+
+    assert second.retry_failed() == 1
+    assert job_error(tmp_path, "Ada Lovelace", "prepare") is None
+    job = first.lease("worker-a")
+    assert job.attempts == 1
+    assert first.fail(job, "not retryable", retry=False)
+    assert first.counts() == {"prepare": {"failed": 1}}
@@ -0,0 +1,11 @@
+from utils.metrics import percentile
+
+
+def test_percentile_uses_the_nearest_rank():
+    assert percentile([], 50) == 0.0
+    assert percentile([1.0, 2.0], 50) == 1.0
+    assert percentile([float(i) for i in range(10)], 50) == 4.0
+    assert percentile([float(i) for i in range(10)], 90) == 8.0
+    assert percentile([float(i) for i in range(10)], 100) == 9.0
+    assert percentile([3.0, 1.0, 2.0], 0) == 1.0
+    assert percentile([float(i) for i in range(100)], 7) == 6.0
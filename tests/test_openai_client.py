@@ -0,0 +1,53 @@
+import time
+
+from content_generation.rate_limiter import RateLimiter
+from utils.metrics import RunMetrics, generation_context
+
+from fake_client import FakeCompletions, FakeOpenAIClient
+
+MODEL = "gpt-4o-mini-2024-07-18"
+HEDGING = {"enabled": True, "percentile": 95, "min_samples": 5, "min_delay": 0.05, "max_extra_percent": 100}
+
+
+class SlowFirstCall(FakeCompletions):
+    """The first request stalls before its first chunk; later ones answer at once"""
+
+    def _delay(self) -> float:
+        with self._lock:
+            self.calls += 1
+            return 2.0 if self.calls == 1 else 0.0
+
+
+def test_close_removes_temp_files_of_abandoned_hedges(tmp_path):
+    metrics = RunMetrics()
+    for _ in range(5):
+        metrics.record_call(MODEL, 0.01, 0, True, platform="Blog")
+    client = FakeOpenAIClient(metrics=metrics, hedging=HEDGING)
+    client.completions = SlowFirstCall()
+    client.client.chat.completions = client.completions
+    output_path = tmp_path / "blog.md"
+
+    with generation_context("Ada Lovelace", "Blog"):
+        assert client.stream_to_file("Write a post", output_path, lambda text: text, model=MODEL)
+    assert output_path.read_text().strip()
+    assert metrics.hedges_won == 1
+    # The losing primary is still waiting for its first chunk, with its temp file open
+    assert list(tmp_path.glob(".blog.md.*.part"))
+
+    started = time.monotonic()
+    client.close(timeout=0.2)
+    assert time.monotonic() - started < 1.0
+    assert not list(tmp_path.glob(".blog.md.*.part"))
+
+
+def test_deadline_does_not_count_time_queued_in_the_rate_limiter():
+    limiter = RateLimiter({"gpt-4": {"tpm": 600}})
+    limiter.acquire("gpt-4", 600)  # Drain the bucket: each call below queues ~1.5s at 10 tokens/s
+    metrics = RunMetrics()
+    client = FakeOpenAIClient(metrics=metrics, rate_limiter=limiter, deadlines={"default": 0.5})
+
+    with generation_context("Ada Lovelace", "X"):
+        results = [client.generate_content("Hi", model="gpt-4", max_tokens=8) for _ in range(2)]
+    assert all(results)
+    assert client.completions.calls == 2
+    assert metrics.deadline_exceeded == 0
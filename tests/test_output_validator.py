@@ -0,0 +1,91 @@
+from utils.output_validator import OutputRules, OutputValidator
+
+FIGURE = "Ada Lovelace"
+PROSE = "Ada Lovelace wrote the first published algorithm for a machine that did not yet exist."
+
+
+def issues(rules: OutputRules, text: str) -> list:
+    return OutputValidator({"Post": rules}).check("Post", FIGURE, text)
+
+
+def repair(rules: OutputRules, text: str) -> str:
+    return OutputValidator({"Post": rules}).repair_locally("Post", FIGURE, text)
+
+
+def test_check_reports_each_broken_rule():
+    assert issues(OutputRules(max_chars=20), PROSE) == [f"Shorten to at most 20 characters (currently {len(PROSE)})"]
+    assert issues(OutputRules(min_words=20), PROSE) == ["Expand to at least 20 words (currently 15)"]
+    assert issues(OutputRules(max_words=10), PROSE) == ["Shorten to at most 10 words (currently 15)"]
+    assert issues(OutputRules(hashtags=("#{figure}", "#History")), PROSE) == [
+        "Include the hashtags #AdaLovelace #History"]
+    assert issues(OutputRules(cta=r"subscribe"), PROSE) == ["End with a clear call-to-action"]
+    assert issues(OutputRules(markdown=True), PROSE) == [
+        "Use Markdown: a '# ' title and '## ' headings for each section"]
+    assert issues(OutputRules(max_chars=500, min_words=5, max_words=50, cta=r"algorithm"), PROSE) == []
+
+
+def test_inline_hashtags_count_as_present():
+    text = "Meet #AdaLovelace, who saw what the engine could become. #History"
+    assert issues(OutputRules(hashtags=("#{figure}", "#History")), text) == []
+
+
+def test_repair_appends_missing_hashtags_and_keeps_inline_ones_in_place():
+    rules = OutputRules(hashtags=("#{figure}", "#History", "#Facts"))
+    text = "Meet #AdaLovelace, who saw what the engine could become, the #1 pioneer.\n\n# History #Bonus"
+    assert repair(rules, text) == (
+        "Meet #AdaLovelace, who saw what the engine could become, the #1 pioneer.\n\n#History #Facts #Bonus")
+
+
+def test_repair_moves_only_the_trailing_tags():
+    rules = OutputRules(hashtags=("#{figure}", "#History"))
+    text = "A pioneer of computing. #History #adalovelace #History"
+    assert repair(rules, text) == "A pioneer of computing.\n\n#AdaLovelace #History"
+
+
+def test_repair_keeps_a_markdown_heading_at_the_end():
+    rules = OutputRules(hashtags=("#History",))
+    assert repair(rules, "Body text.\n\n# History") == "Body text.\n\n# History\n\n#History"
+
+
+def test_repair_truncates_the_body_so_the_tags_fit():
+    rules = OutputRules(max_chars=80, hashtags=("#{figure}", "#History"))
+    text = PROSE + " " + PROSE
+    repaired = repair(rules, text)
+    assert len(repaired) <= 80
+    assert repaired.endswith("\n\n#AdaLovelace #History")
+    assert issues(rules, repaired) == []
+
+
+def test_repair_shortens_to_max_words_without_counting_tags_as_prose():
+    rules = OutputRules(max_words=8, hashtags=("#History",))
+    repaired = repair(rules, PROSE)
+    assert len(repaired.split()) <= 8
+    assert repaired.endswith("#History")
+
+
+def test_repair_appends_the_cta():
+    rules = OutputRules(cta=r"subscribe", cta_text="Subscribe for more!")
+    assert repair(rules, PROSE) == f"{PROSE}\n\nSubscribe for more!"
+    assert repair(rules, "Please subscribe.") == "Please subscribe."
+
+
+def test_repair_promotes_headings():
+    text = "**The Analyst**\n\nIntro.\n\n**Early Life**\n\nText.\n\nLEGACY: A lasting mark\n\nMore."
+    repaired = repair(OutputRules(markdown=True), text)
+    assert repaired.split("\n\n")[::2] == ["# The Analyst", "## Early Life", "## A lasting mark"]
+    assert issues(OutputRules(markdown=True), repaired) == []
+
+
+def test_truncate_prefers_sentence_ends_then_words():
+    assert OutputValidator.truncate("One two. Three four five.", 12) == "One two."
+    assert OutputValidator.truncate("First sentence ends. Then more words", 30) == "First sentence ends."
+    assert OutputValidator.truncate("alpha beta gamma delta", 15) == "alpha beta…"
+    assert OutputValidator.truncate("short", 10) == "short"
+
+
+def test_split_output_separates_header_and_footer():
+    def format_content(body):
+        return f"🐦 X Post\n\n{body}\n--"
+
+    assert OutputValidator.split_output("🐦 X Post\n\nHello\n--", format_content) == ("🐦 X Post\n\n", "Hello", "\n--")
+    assert OutputValidator.split_output("Unrelated", format_content) == ("", "Unrelated", "")
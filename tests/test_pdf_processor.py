@@ -0,0 +1,40 @@
+import zlib
+
+import pypdf
+
+from data_processing.pdf_processor import PDFProcessor, _raw_stream_bytes
+
+from fixtures import make_pdf
+
+
+def test_budgeted_extraction_uses_the_pool(tmp_path):
+    pdf_path = make_pdf(tmp_path / "long.pdf", pages=24)
+    serial_text, serial_pages = PDFProcessor().extract_text(pdf_path, max_chars=6000, max_words=800)
+
+    processor = PDFProcessor(parallel=True, max_workers=2, min_parallel_pages=8)
+    try:
+        text, pages = processor.extract_text(pdf_path, max_chars=6000, max_words=800)
+        assert processor._pool is not None
+        assert (text, pages) == (serial_text, serial_pages)
+        assert pages < 24  # Still stops once the budget is met
+
+        full_text, full_pages = processor.extract_text(pdf_path)
+        assert full_pages == 24
+        assert full_text == PDFProcessor().extract_text(pdf_path)[0]
+    finally:
+        processor.close()
+
+
+def test_image_bytes_fall_back_to_the_public_api(tmp_path):
+    pdf_path = make_pdf(tmp_path / "images.pdf", pages=1, images_per_page=1)
+    page = pypdf.PdfReader(str(pdf_path)).pages[0]
+    image = next(iter(page["/Resources"]["/XObject"].values())).get_object()
+    decoded = image.get_data()
+    raw = _raw_stream_bytes(image)
+    assert zlib.decompress(raw) == decoded  # Still FlateDecode-encoded, no decode needed
+
+    class PublicOnly:
+        def get_data(self):
+            return decoded
+
+    assert _raw_stream_bytes(PublicOnly()) == decoded
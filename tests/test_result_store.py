@@ -0,0 +1,21 @@
+from pathlib import Path
+
+
+def test_rerun_keeps_rows_of_skipped_outputs(make_config, run_figure, stored_rows):
+    config_manager = make_config(["X", "Blog"], output_validation={"repair_prompt": False},
+                                 result_store={"flush_seconds": 0})
+    run_figure(config_manager)
+    first = stored_rows(config_manager, include_content=True)
+    assert set(first) == {"X", "Blog"}
+    assert all(row["status"] == "success" and row["api_calls"] >= 1 for row in first.values())
+
+    Path(first["Blog"]["output_path"]).unlink()
+    run_figure(config_manager)
+    second = stored_rows(config_manager, include_content=True)
+
+    # X was skipped as up to date: its row, usage and timing are untouched
+    assert second["X"] == first["X"]
+    # Blog was regenerated and recorded again
+    assert second["Blog"]["status"] == "success"
+    assert second["Blog"]["api_calls"] >= 1
+    assert Path(second["Blog"]["output_path"]).exists()
@@ -0,0 +1,26 @@
+from processing.figure_processor import FigureProcessor
+from utils.metrics import RunMetrics
+
+from conftest import FIGURE
+from fake_client import FakeOpenAIClient
+
+
+def process(config_manager) -> tuple:
+    """(figure outcome, API calls made) of one run"""
+    metrics = RunMetrics()
+    processor = FigureProcessor(config_manager, metrics=metrics)
+    try:
+        return processor.process_figure(FIGURE, FakeOpenAIClient(metrics=metrics)), len(metrics.calls)
+    finally:
+        processor.close()
+
+
+def test_ineligible_platforms_do_not_block_the_up_to_date_skip(make_config, capsys):
+    # 600 words: enough for X, too short for Medium (1000)
+    config_manager = make_config(["X", "Medium"], words=600, output_validation={"enabled": False})
+    success, calls = process(config_manager)
+    assert not success and calls == 1
+
+    success, calls = process(config_manager)
+    assert calls == 0
+    assert f"All outputs for {FIGURE} are up to date" in capsys.readouterr().out
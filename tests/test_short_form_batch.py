@@ -0,0 +1,31 @@
+import json
+
+SHORT_FORM = ["YouTube", "X", "Facebook"]
+NO_STORES = {"output_validation": {"enabled": False}, "result_store": {"enabled": False}}
+
+
+def manifest_templates(tmp_path) -> dict:
+    manifest = json.loads((tmp_path / "outputs" / "Ada_Lovelace" / "manifest.json").read_text())
+    return {label: entry["template"] for label, entry in manifest["outputs"].items()}
+
+
+def test_batching_keeps_each_platforms_model(tmp_path, make_config, run_figure):
+    metrics = run_figure(make_config(SHORT_FORM, batch_short_form=True, **NO_STORES))
+    calls = {(call["platform"], call["model"]) for call in metrics.calls}
+    # X uses gpt-4, the only short-form generator on that model, so it keeps its own request
+    assert ("X", "gpt-4") in calls
+    assert all(model == "gpt-4" for platform, model in calls if platform == "X")
+    templates = manifest_templates(tmp_path)
+    assert templates["X"] == "XPostGenerator:v1"
+    assert templates["YouTube Post"].startswith("ShortFormBatchGenerator:v1/")
+    assert templates["Facebook"].startswith("ShortFormBatchGenerator:v1/")
+
+
+def test_toggling_batching_regenerates_batched_outputs(tmp_path, make_config, run_figure):
+    run_figure(make_config(SHORT_FORM, batch_short_form=False, **NO_STORES))
+    metrics = run_figure(make_config(SHORT_FORM, batch_short_form=True, **NO_STORES))
+    # One batch call rewrites both mini-model short-form posts; X and the story stay fresh
+    assert len(metrics.calls) == 1
+    templates = manifest_templates(tmp_path)
+    assert templates["Facebook"].startswith("ShortFormBatchGenerator:v1/")
+    assert templates["X"] == "XPostGenerator:v1"
@@ -0,0 +1,32 @@
+from config.config_manager import DEFAULT_CONFIG, ConfigManager
+from content_generation.post_generator import LegacyPostGenerator
+from content_generation.short_form_generator import ShortFormBatchGenerator
+from content_generation.x_generator import XPostGenerator
+from content_generation.youtube_generator import YouTubePostGenerator
+from processing.figure_processor import FigureProcessor
+
+from fake_client import FakeOpenAIClient
+
+
+def test_short_posts_keep_at_least_their_old_budgets():
+    # Emoji and hashtags cost more tokens than the per-word heuristic assumes
+    assert XPostGenerator.MAX_TOKENS >= 150
+    assert YouTubePostGenerator.MAX_TOKENS >= 300
+    assert LegacyPostGenerator.MAX_TOKENS >= 300
+    assert ShortFormBatchGenerator.MAX_TOKENS >= 900
+
+
+def test_estimate_includes_repair_prompts(tmp_path):
+    def estimate(repair_prompt: bool) -> dict:
+        config_manager = ConfigManager({**DEFAULT_CONFIG, "output_dir": str(tmp_path),
+                                        "output_validation": {"repair_prompt": repair_prompt}})
+        processor = FigureProcessor(config_manager)
+        try:
+            return processor.estimate_spend(3, FakeOpenAIClient())["total"]
+        finally:
+            processor.close()
+
+    without, with_repairs = estimate(False), estimate(True)
+    assert with_repairs["calls"] == 2 * without["calls"]
+    assert with_repairs["completion_tokens"] == 2 * without["completion_tokens"]
+    assert with_repairs["prompt_tokens"] > without["prompt_tokens"] + without["completion_tokens"]